@@ -20,16 +20,19 @@ from .urdf import (
     Box,
     Calibration,
     Collision,
+    CollisionSpheres,
     Color,
     Cylinder,
     Dynamics,
     Geometry,
     Inertial,
     Joint,
+    KinematicTree,
     Link,
     Limit,
     Material,
     Mesh,
+    MeshCache,
     Mimic,
     Robot,
     SafetyController,
@@ -45,6 +48,7 @@ from .urdf import (
     URDFSaveValidationError,
     URDFMalformedError,
     URDFUnsupportedError,
+    MESH_CACHE,
     filename_handler_null,
     filename_handler_ignore_directive,
     filename_handler_ignore_directive_package,
@@ -0,0 +1,152 @@
+"""
+Script for storing the decoded meshes of robot descriptions in a mesh cache directory.
+"""
+
+import os
+import sys
+import logging
+import argparse
+
+from yourdfpy import __version__
+from yourdfpy import URDF
+
+__author__ = "Clemens Eppner"
+__copyright__ = "Clemens Eppner"
+__license__ = "MIT"
+
+_logger = logging.getLogger(__name__)
+
+
+def parse_args(args):
+    """Parse command line parameters
+
+    Args:
+      args (List[str]): command line parameters as list of strings
+          (for example  ``["--help"]``).
+
+    Returns:
+      :obj:`argparse.Namespace`: command line parameters namespace
+    """
+    parser = argparse.ArgumentParser(
+        description="Store the decoded meshes of URDF models in a mesh cache directory (see URDF's mesh_cache_dir)."
+    )
+    parser.add_argument(
+        "--version",
+        action="version",
+        version="yourdfpy {ver}".format(ver=__version__),
+    )
+    parser.add_argument(
+        "input",
+        nargs="+",
+        help="URDF file names or directories that are searched recursively for *.urdf files, e.g., a robot description package.",
+    )
+    parser.add_argument(
+        "-o",
+        "--cache-dir",
+        required=True,
+        help="Mesh cache directory.",
+    )
+    parser.add_argument(
+        "--collision",
+        action="store_true",
+        help="Also store the collision meshes.",
+    )
+    parser.add_argument(
+        "-j",
+        "--num-workers",
+        type=int,
+        default=1,
+        help="Number of processes that decode mesh files concurrently.",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="loglevel",
+        help="set loglevel to INFO",
+        action="store_const",
+        const=logging.INFO,
+    )
+    parser.add_argument(
+        "-vv",
+        "--very-verbose",
+        dest="loglevel",
+        help="set loglevel to DEBUG",
+        action="store_const",
+        const=logging.DEBUG,
+    )
+    return parser.parse_args(args)
+
+
+def setup_logging(loglevel):
+    """Setup basic logging.
+
+    Args:
+      loglevel (int): minimum loglevel for emitting messages
+    """
+    logformat = "[%(asctime)s] %(levelname)s:%(name)s:%(message)s"
+    logging.basicConfig(
+        level=loglevel, stream=sys.stdout, format=logformat, datefmt="%Y-%m-%d %H:%M:%S"
+    )
+
+
+def find_urdf_files(inputs):
+    """Collect URDF files.
+
+    Args:
+        inputs (list[str]): File names or directories that are searched recursively for *.urdf files.
+
+    Returns:
+        list[str]: Sorted list of URDF file names.
+    """
+    fnames = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                fnames.extend(
+                    os.path.join(root, f) for f in files if f.lower().endswith(".urdf")
+                )
+        else:
+            fnames.append(path)
+    return sorted(fnames)
+
+
+def main(args):
+    """Wrapper allowing string arguments in a CLI fashion.
+
+    Args:
+      args (List[str]): command line parameters as list of strings
+          (for example  ``["--verbose", "42"]``).
+    """
+    args = parse_args(args)
+    setup_logging(args.loglevel)
+
+    fnames = find_urdf_files(args.input)
+    for fname in fnames:
+        _logger.info(f"Baking meshes of {fname}")
+        URDF.load(
+            fname,
+            build_collision_scene_graph=args.collision,
+            load_collision_meshes=args.collision,
+            mesh_cache_dir=args.cache_dir,
+            num_workers=args.num_workers,
+            use_processes=args.num_workers > 1,
+        )
+
+    num_entries = (
+        len(os.listdir(args.cache_dir)) if os.path.isdir(args.cache_dir) else 0
+    )
+    _logger.info(
+        f"Baked {len(fnames)} URDF file(s), {args.cache_dir} contains {num_entries} mesh file(s)."
+    )
+
+
+def run():
+    """Calls :func:`main` passing the CLI arguments extracted from :obj:`sys.argv`.
+
+    This function can be used as entry point to create console scripts with setuptools.
+    """
+    main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    run()
@@ -1,11 +1,18 @@
 import os
 import six
 import copy
+import json
+import shutil
+import hashlib
 import logging
+import tempfile
+import threading
 import numpy as np
 from dataclasses import dataclass, field, is_dataclass
 from typing import Dict, List, Optional, Union
+from collections import OrderedDict
 from functools import partial
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 
 import trimesh
 import trimesh.transformations as tra
@@ -347,6 +354,65 @@ class Robot:
         )
 
 
+# joint type codes used in KinematicTree.joint_types
+JOINT_TYPE_FIXED = 0
+JOINT_TYPE_REVOLUTE = 1
+JOINT_TYPE_PRISMATIC = 2
+
+
+@dataclass(eq=False)
+class KinematicTree:
+    """A compact array-based representation of the kinematic structure of a robot.
+
+    Joints with multiple DOFs (floating, planar) are decomposed into chains of elementary
+    prismatic and revolute joints connected via intermediate frames. Frames 0, ..., num_links - 1
+    are the links, all remaining frames are intermediate. All arrays are indexed by elementary joint.
+    Joints are sorted in depth-first order, i.e., the parent frame of each joint is either a
+    root link or the child frame of a preceding joint and all joints of the subtree below joint
+    i are i + 1, ..., subtree_end[i] - 1. Configurations of the actuated joints are mapped to
+    joint values via joint_values = cfg[:, value_source] * value_multiplier + value_offset.
+    """
+
+    link_names: List[str]
+    link_index: Dict[str, int]
+    num_frames: int
+    joint_names: List[str]  # name of the URDF joint each elementary joint belongs to
+    joint_types: np.ndarray  # (num_joints,) JOINT_TYPE_* codes
+    joint_heads: np.ndarray  # (num_joints,) first elementary joint of the URDF joint
+    joint_tails: np.ndarray  # (num_joints,) last elementary joint of the URDF joint
+    parent: np.ndarray  # (num_joints,) frame indices
+    child: np.ndarray  # (num_joints,) frame indices
+    origins: np.ndarray  # (num_joints, 4, 4)
+    axes: np.ndarray  # (num_joints, 3)
+    value_indices: np.ndarray  # (num_joints,) index into joint values, -1 if fixed
+    subtree_end: np.ndarray  # (num_joints,)
+    levels: List[np.ndarray]  # joint indices grouped by depth
+    num_dofs: int
+    value_source: np.ndarray  # (num_values,) index into configuration
+    value_multiplier: np.ndarray  # (num_values,)
+    value_offset: np.ndarray  # (num_values,)
+    masses: np.ndarray  # (num_links,)
+    coms: np.ndarray  # (num_links, 3) centers of mass in link coordinates
+    inertias: np.ndarray  # (num_links, 3, 3) about centers of mass, link coordinates
+    damping: np.ndarray  # (num_joints,) viscous damping coefficients
+    friction: np.ndarray  # (num_joints,) Coulomb friction coefficients
+
+
+@dataclass(eq=False)
+class CollisionSpheres:
+    """An approximation of the collision geometry of a robot by spheres.
+
+    Spheres are defined in the coordinate frames of the links they are attached to.
+    Pairs contains all sphere pairs that are checked for self-collisions, i.e., spheres
+    of links that are neither rigidly attached to each other nor connected by a joint.
+    """
+
+    centers: np.ndarray  # (num_spheres, 3) in link coordinates
+    radii: np.ndarray  # (num_spheres,)
+    links: np.ndarray  # (num_spheres,) link indices
+    pairs: np.ndarray  # (num_pairs, 2) sphere indices
+
+
 class URDFError(Exception):
     """General URDF exception."""
 
@@ -597,604 +663,3494 @@ def validation_handler_strict(errors):
     return len(errors) == 0
 
 
-class URDF:
-    def __init__(
-        self,
-        robot: Robot = None,
-        build_scene_graph: bool = True,
-        build_collision_scene_graph: bool = False,
-        load_meshes: bool = True,
-        load_collision_meshes: bool = False,
-        filename_handler=None,
-        mesh_dir: str = "",
-        force_mesh: bool = False,
-        force_collision_mesh: bool = True,
-    ):
-        """A URDF model.
+def _copy_scene(scene):
+    """Copy a scene including the source file of its geometry, which determines geometry names when added to another scene.
+    Before trimesh 4 geometry has no source and names are based on metadata, which is copied anyway.
 
-        Args:
-            robot (Robot): The robot model. Defaults to None.
-            build_scene_graph (bool, optional): Whether to build a scene graph to enable transformation queries and forward kinematics. Defaults to True.
-            build_collision_scene_graph (bool, optional): Whether to build a scene graph for <collision> elements. Defaults to False.
-            load_meshes (bool, optional): Whether to load the meshes referenced in the <mesh> elements. Defaults to True.
-            load_collision_meshes (bool, optional): Whether to load the collision meshes referenced in the <mesh> elements. Defaults to False.
-            filename_handler ([type], optional): Any function f(in: str) -> str, that maps filenames in the URDF to actual resources. Can be used to customize treatment of `package://` directives or relative/absolute filenames. Defaults to None.
-            mesh_dir (str, optional): A root directory used for loading meshes. Defaults to "".
-            force_mesh (bool, optional): Each loaded geometry will be concatenated into a single one (instead of being turned into a graph; in case the underlying file contains multiple geometries). This might loose texture information but the resulting scene graph will be smaller. Defaults to False.
-            force_collision_mesh (bool, optional): Same as force_mesh, but for collision scene. Defaults to True.
-        """
-        if filename_handler is None:
-            self._filename_handler = partial(filename_handler_magic, dir=mesh_dir)
-        else:
-            self._filename_handler = filename_handler
+    Args:
+        scene (trimesh.Scene): Scene.
 
-        self.robot = robot
-        self._create_maps()
-        self._update_actuated_joints()
+    Returns:
+        trimesh.Scene: Copy of the scene.
+    """
+    new_s = scene.copy()
+    for name, geom in new_s.geometry.items():
+        source = getattr(scene.geometry[name], "source", None)
+        if source is not None:
+            geom.source.file_path = source.file_path
+            geom.source.file_type = source.file_type
+    return new_s
 
-        self._cfg = self.zero_cfg
 
-        if build_scene_graph or build_collision_scene_graph:
-            self._base_link = self._determine_base_link()
-        else:
-            self._base_link = None
+class MeshCache:
+    """A thread-safe least-recently-used cache of loaded mesh files that is shared by all URDF instances of a process.
 
-        self._errors = []
+    Entries are keyed by the resolved file path, its modification time and size, and the loading options.
+    Lookups return copies, hence cached geometry is never modified. Copies keep the source file of each geometry, hence geometry names in the scene are the same as without the cache.
+    """
 
-        if build_scene_graph:
-            self._scene = self._create_scene(
-                use_collision_geometry=False,
-                load_geometry=load_meshes,
-                force_mesh=force_mesh,
-                force_single_geometry_per_link=force_mesh,
-            )
-        else:
-            self._scene = None
+    def __init__(self, max_bytes=256 * 1024**2):
+        """Create a mesh cache.
 
-        if build_collision_scene_graph:
-            self._scene_collision = self._create_scene(
-                use_collision_geometry=True,
-                load_geometry=load_collision_meshes,
-                force_mesh=force_collision_mesh,
-                force_single_geometry_per_link=force_collision_mesh,
-            )
-        else:
-            self._scene_collision = None
+        Args:
+            max_bytes (int, optional): Memory budget for vertex and face arrays. Least recently used entries are evicted when it is exceeded; zero disables caching. Defaults to 256 MiB.
+        """
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._num_bytes = 0
+        self._lock = threading.Lock()
 
     @property
-    def scene(self) -> trimesh.Scene:
-        """A scene object representing the URDF model.
+    def max_bytes(self):
+        """Memory budget in bytes.
 
         Returns:
-            trimesh.Scene: A trimesh scene object.
+            int: Memory budget.
         """
-        return self._scene
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        with self._lock:
+            self._max_bytes = value
+            self._evict()
 
     @property
-    def collision_scene(self) -> trimesh.Scene:
-        """A scene object representing the <collision> elements of the URDF model.
+    def num_bytes(self):
+        """Memory occupied by the cached vertex and face arrays.
 
         Returns:
-            trimesh.Scene: A trimesh scene object.
+            int: Number of bytes.
         """
-        return self._scene_collision
+        return self._num_bytes
 
-    @property
-    def link_map(self) -> dict:
-        """A dictionary mapping link names to link objects.
+    def __len__(self):
+        return len(self._entries)
 
-        Returns:
-            dict: Mapping from link name (str) to Link.
-        """
-        return self._link_map
+    @staticmethod
+    def key(fname, force_mesh, skip_materials):
+        """Create the key of a mesh file.
 
-    @property
-    def joint_map(self) -> dict:
-        """A dictionary mapping joint names to joint objects.
+        Args:
+            fname (str): Name of the mesh file.
+            force_mesh (bool): Whether the file is loaded as a single mesh.
+            skip_materials (bool): Whether materials are skipped.
 
         Returns:
-            dict: Mapping from joint name (str) to Joint.
+            tuple: Key.
         """
-        return self._joint_map
+        stat = os.stat(fname)
+        return (
+            os.path.realpath(fname),
+            stat.st_mtime_ns,
+            stat.st_size,
+            force_mesh,
+            skip_materials,
+        )
 
-    @property
-    def joint_names(self):
-        """List of joint names.
+    def get(self, key):
+        """Look up a scene.
+
+        Args:
+            key (tuple): Key created with MeshCache.key.
 
         Returns:
-            list[str]: List of joint names of the URDF model.
+            trimesh.Scene: A copy of the cached scene (see _copy_scene), None if there is none.
         """
-        return [j.name for j in self.robot.joints]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        return _copy_scene(entry[0])
 
-    @property
-    def actuated_joints(self):
-        """List of actuated joints. This excludes mimic and fixed joints.
+    def put(self, key, scene):
+        """Add a scene.
 
-        Returns:
-            list[Joint]: List of actuated joints of the URDF model.
+        Args:
+            key (tuple): Key created with MeshCache.key.
+            scene (trimesh.Scene): Scene. A copy is stored.
         """
-        return self._actuated_joints
+        num_bytes = sum(
+            g.vertices.nbytes + (g.faces.nbytes if hasattr(g, "faces") else 0)
+            for g in scene.geometry.values()
+        )
+        if num_bytes > self._max_bytes:
+            return
 
-    @property
-    def actuated_dof_indices(self):
-        """List of DOF indices per actuated joint. Can be used to reference configuration.
+        scene = _copy_scene(scene)
+        with self._lock:
+            if key in self._entries:
+                self._num_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (scene, num_bytes)
+            self._num_bytes += num_bytes
+            self._evict()
 
-        Returns:
-            list[list[int]]: List of DOF indices per actuated joint.
-        """
-        return self._actuated_dof_indices
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._num_bytes = 0
 
-    @property
-    def actuated_joint_indices(self):
-        """List of indices of all joints that are actuated, i.e., not of type mimic or fixed.
+    def _evict(self):
+        while self._num_bytes > self._max_bytes and len(self._entries) > 0:
+            _, (_, num_bytes) = self._entries.popitem(last=False)
+            self._num_bytes -= num_bytes
 
-        Returns:
-            list[int]: List of indices of actuated joints.
-        """
-        return self._actuated_joint_indices
 
-    @property
-    def actuated_joint_names(self):
-        """List of names of actuated joints. This excludes mimic and fixed joints.
+# cache of mesh files shared by all URDF instances, see MeshCache
+MESH_CACHE = MeshCache()
 
-        Returns:
-            list[str]: List of names of actuated joints of the URDF model.
-        """
-        return [j.name for j in self._actuated_joints]
 
-    @property
-    def num_actuated_joints(self):
-        """Number of actuated joints.
+# version of the directory layout written by _write_baked_mesh_file
+_BAKED_MESH_VERSION = 1
 
-        Returns:
-            int: Number of actuated joints.
-        """
-        return len(self.actuated_joints)
+# arrays stored by _write_baked_mesh_file, colors are loaded without memory-mapping
+_BAKED_MESH_ARRAYS = ["vertices", "faces", "vertex_normals"]
+_BAKED_MESH_COLORS = {"vertex": "vertex_colors", "face": "face_colors"}
 
-    @property
-    def num_dofs(self):
-        """Number of degrees of freedom of actuated joints. Depending on the type of the joint, the number of DOFs might vary.
 
-        Returns:
-            int: Degrees of freedom.
-        """
-        total_num_dofs = 0
-        for j in self._actuated_joints:
-            if j.type in ["revolute", "prismatic", "continuous"]:
-                total_num_dofs += 1
-            elif j.type == "floating":
-                total_num_dofs += 6
-            elif j.type == "planar":
-                total_num_dofs += 2
-        return total_num_dofs
+def _mesh_file_hash(fname, force_mesh, skip_materials):
+    """Hash the content of a mesh file and the options it is loaded with.
 
-    @property
-    def zero_cfg(self):
-        """Return the zero configuration.
+    Args:
+        fname (str): Name of an existing mesh file.
+        force_mesh (bool): Whether the file is loaded as a single mesh.
+        skip_materials (bool): Whether materials are skipped.
 
-        Returns:
-            np.ndarray: The zero configuration.
-        """
-        return np.zeros(self.num_dofs)
+    Returns:
+        str: Hexadecimal digest.
+    """
+    h = hashlib.sha1(f"{_BAKED_MESH_VERSION}{force_mesh}{skip_materials}".encode())
+    with open(fname, "rb") as f:
+        for chunk in iter(partial(f.read, 1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-    @property
-    def center_cfg(self):
-        """Return center configuration of URDF model by using the average of each joint's limits if present, otherwise zero.
 
-        Returns:
-            (n), float: Default configuration of URDF model.
-        """
-        config = []
-        config_names = []
-        for j in self._actuated_joints:
-            if j.type == "revolute" or j.type == "prismatic":
-                if j.limit is not None:
-                    cfg = [j.limit.lower + 0.5 * (j.limit.upper - j.limit.lower)]
-                else:
-                    cfg = [0.0]
-            elif j.type == "continuous":
-                cfg = [0.0]
-            elif j.type == "floating":
-                cfg = [0.0] * 6
-            elif j.type == "planar":
-                cfg = [0.0] * 2
+def _write_baked_mesh_file(scene, dirname):
+    """Store the arrays and scene graph of a loaded mesh file in a directory.
+    Scenes with textures or geometry other than triangle meshes are not stored.
 
-            config.append(cfg)
-            config_names.append(j.name)
+    Args:
+        scene (trimesh.Scene): Scene loaded by _read_mesh_file.
+        dirname (str): Directory that is created atomically.
 
-        for i, j in enumerate(self.robot.joints):
-            if j.mimic is not None:
-                index = config_names.index(j.mimic.joint)
-                config[i][0] = config[index][0] * j.mimic.multiplier + j.mimic.offset
+    Returns:
+        bool: Whether the scene was stored.
+    """
+    for geom in scene.geometry.values():
+        if not isinstance(geom, trimesh.Trimesh) or geom.visual.kind == "texture":
+            _logger.debug(
+                f"Can't store {dirname}, only untextured meshes are supported"
+            )
+            return False
 
-        if len(config) == 0:
-            return np.array([], dtype=np.float64)
-        return np.concatenate(config)
+    parent_dir = os.path.dirname(dirname)
+    os.makedirs(parent_dir, exist_ok=True)
+    tmp_dirname = tempfile.mkdtemp(dir=parent_dir)
+
+    geometry = []
+    for i, (name, geom) in enumerate(scene.geometry.items()):
+        arrays = list(_BAKED_MESH_ARRAYS)
+        if geom.visual.kind in _BAKED_MESH_COLORS:
+            arrays.append(_BAKED_MESH_COLORS[geom.visual.kind])
+        for a in arrays:
+            data = getattr(geom.visual if a.endswith("colors") else geom, a)
+            np.save(os.path.join(tmp_dirname, f"{i}_{a}.npy"), data)
+        # trimesh<4 keeps the file name in the metadata only
+        source = getattr(geom, "source", None)
+        geometry.append(
+            {
+                "name": name,
+                "arrays": arrays,
+                "has_source": getattr(source, "file_path", None) is not None,
+                "metadata": {
+                    k: v
+                    for k, v in geom.metadata.items()
+                    if isinstance(v, (str, int, float, bool))
+                },
+            }
+        )
 
-    @property
-    def cfg(self):
-        """Current configuration.
+    edges = [
+        [frame_from, frame_to, {k: v for k, v in attr.items() if k != "metadata"}]
+        for frame_from, frame_to, attr in scene.graph.to_edgelist()
+    ]
+    with open(os.path.join(tmp_dirname, "scene.json"), "w") as f:
+        json.dump(
+            {
+                "base_frame": scene.graph.base_frame,
+                "geometry": geometry,
+                "edges": edges,
+            },
+            f,
+        )
 
-        Returns:
-            np.ndarray: Current configuration of URDF model.
-        """
-        return self._cfg
+    try:
+        os.rename(tmp_dirname, dirname)
+    except OSError:
+        # stored concurrently by another process
+        shutil.rmtree(tmp_dirname, ignore_errors=True)
+    return True
 
-    @property
-    def base_link(self):
-        """Name of URDF base/root link.
 
-        Returns:
-            str: Name of base link of URDF model.
-        """
-        return self._base_link
+def _read_baked_mesh_file(dirname, fname):
+    """Load a mesh file stored by _write_baked_mesh_file.
+    Vertices, faces, and vertex normals are read-only arrays memory-mapped from disk.
 
-    @property
-    def errors(self) -> list:
-        """A list with validation errors.
+    Args:
+        dirname (str): Directory written by _write_baked_mesh_file.
+        fname (str): Name of the original mesh file.
 
-        Returns:
-            list: A list of validation errors.
-        """
-        return self._errors
+    Returns:
+        trimesh.Scene: Scene with the geometry of the file.
+    """
+    with open(os.path.join(dirname, "scene.json")) as f:
+        data = json.load(f)
+
+    new_s = trimesh.Scene(base_frame=data["base_frame"])
+    for i, g in enumerate(data["geometry"]):
+        arrays = {
+            a: np.load(
+                os.path.join(dirname, f"{i}_{a}.npy"),
+                mmap_mode="r" if a in _BAKED_MESH_ARRAYS else None,
+            )
+            for a in g["arrays"]
+        }
+        geom = trimesh.Trimesh(process=False, metadata=g["metadata"], **arrays)
 
-    def clear_errors(self):
-        """Clear the validation error log."""
-        self._errors = []
+        # refer to the mesh file instead of the file that was stored
+        if "file_path" in geom.metadata:
+            geom.metadata["file_path"] = os.path.abspath(fname)
+            geom.metadata["file_name"] = os.path.basename(fname)
+        if g["has_source"] and hasattr(geom, "source"):
+            geom.source.file_path = os.path.abspath(fname)
+            geom.source.file_type = os.path.splitext(fname)[1][1:].lower()
 
-    def show(self, collision_geometry=False, callback=None):
-        """Open a simpler viewer displaying the URDF model.
+        new_s.geometry[g["name"]] = geom
+    new_s.graph.from_edgelist(data["edges"])
 
-        Args:
-            collision_geometry (bool, optional): Whether to display the <collision> or <visual> elements. Defaults to False.
-        """
-        if collision_geometry:
-            if self._scene_collision is None:
-                raise ValueError(
-                    "No collision scene available. Use build_collision_scene_graph=True and load_collision_meshes=True during loading."
-                )
-            else:
-                self._scene_collision.show(callback=callback)
-        else:
-            if self._scene is None:
-                raise ValueError(
-                    "No scene available. Use build_scene_graph=True and load_meshes=True during loading."
-                )
-            elif len(self._scene.bounds_corners) < 1:
-                raise ValueError(
-                    "Scene is empty, maybe meshes failed to load? Use build_scene_graph=True and load_meshes=True during loading."
-                )
-            else:
-                self._scene.show(callback=callback)
+    return new_s
 
-    def validate(self, validation_fn=None) -> bool:
-        """Validate URDF model.
 
-        Args:
-            validation_fn (function, optional): A function f(list[yourdfpy.URDFError]) -> bool. None uses the strict handler (any error leads to False). Defaults to None.
+def _read_mesh_file(fname, force_mesh, skip_materials, cache_dir=None):
+    """Load a mesh file as a scene.
 
-        Returns:
-            bool: Whether the model is valid.
-        """
-        self._errors = []
-        self._validate_robot(self.robot)
+    Args:
+        fname (str): Name of an existing mesh file.
+        force_mesh (bool): Whether to load the file as a single mesh.
+        skip_materials (bool): Whether to skip loading materials.
+        cache_dir (str, optional): Directory in which the decoded arrays of mesh files are stored and memory-mapped from, keyed by the file content. Defaults to None.
 
-        if validation_fn is None:
-            validation_fn = validation_handler_strict
+    Returns:
+        trimesh.Scene: Scene with the geometry of the file.
+    """
+    if cache_dir is not None:
+        dirname = os.path.join(
+            cache_dir, _mesh_file_hash(fname, force_mesh, skip_materials)
+        )
+        if os.path.isdir(dirname):
+            return _read_baked_mesh_file(dirname, fname)
+
+    if force_mesh:
+        new_g = trimesh.load(
+            fname,
+            ignore_broken=True,
+            force="mesh",
+            skip_materials=skip_materials,
+        )
 
-        return validation_fn(self._errors)
+        # add original filename
+        if "file_path" not in new_g.metadata:
+            new_g.metadata["file_path"] = os.path.abspath(fname)
+            new_g.metadata["file_name"] = os.path.basename(fname)
 
-    def _create_maps(self):
-        self._material_map = {}
-        for m in self.robot.materials:
-            self._material_map[m.name] = m
+        new_s = trimesh.Scene()
+        new_s.add_geometry(new_g)
+    else:
+        new_s = trimesh.load(
+            fname,
+            ignore_broken=True,
+            force="scene",
+            skip_materials=skip_materials,
+        )
 
-        self._joint_map = {}
-        for j in self.robot.joints:
-            self._joint_map[j.name] = j
+        if "file_path" in new_s.metadata:
+            for i, (_, geom) in enumerate(new_s.geometry.items()):
+                if "file_path" not in geom.metadata:
+                    geom.metadata["file_path"] = new_s.metadata["file_path"]
+                    geom.metadata["file_name"] = new_s.metadata["file_name"]
+                    geom.metadata["file_element"] = i
 
-        self._link_map = {}
-        for l in self.robot.links:
-            self._link_map[l.name] = l
+    if cache_dir is not None:
+        _write_baked_mesh_file(new_s, dirname)
 
-    def _update_actuated_joints(self):
+    return new_s
+
+
+def _load_cached_mesh_file(fname, force_mesh, skip_materials, cache_dir=None):
+    """Load a mesh file as a scene, using the process-wide MESH_CACHE.
+
+    Args:
+        fname (str): Name of an existing mesh file.
+        force_mesh (bool): Whether to load the file as a single mesh.
+        skip_materials (bool): Whether to skip loading materials.
+        cache_dir (str, optional): Directory of decoded mesh files, see _read_mesh_file. If set, MESH_CACHE is not used since arrays are memory-mapped. Defaults to None.
+
+    Returns:
+        trimesh.Scene: Scene with the geometry of the file.
+    """
+    if cache_dir is not None:
+        return _read_mesh_file(fname, force_mesh, skip_materials, cache_dir)
+
+    key = None
+    if MESH_CACHE.max_bytes > 0:
+        key = MeshCache.key(fname, force_mesh, skip_materials)
+        new_s = MESH_CACHE.get(key)
+        if new_s is not None:
+            return new_s
+
+    new_s = _read_mesh_file(fname, force_mesh, skip_materials)
+
+    if key is not None:
+        MESH_CACHE.put(key, new_s)
+    return new_s
+
+
+# iterations without improvement after which a start of inverse_kinematics is abandoned
+_IK_PATIENCE = 10
+
+_POSE_FORMAT_SHAPES = {"matrix": (4, 4), "pos_quat": (7,), "dual_quat": (8,)}
+
+
+def _batch_rotation_matrix(angles, axis):
+    """Batched version of `trimesh.transformations.rotation_matrix` for axes through the origin.
+
+    Args:
+        angles ((...) float): Rotation angles in radians.
+        axis ((..., 3) float): Rotation axes; broadcastable against angles.
+
+    Returns:
+        (..., 4, 4) float: Homogeneous transformation matrices.
+    """
+    angles = np.asarray(angles)
+    axis = np.asarray(axis)
+    axis = axis / np.linalg.norm(axis, axis=-1, keepdims=True)
+    shape = np.broadcast_shapes(angles.shape, axis.shape[:-1])
+
+    sin = np.sin(angles)[..., None, None]
+    cos = np.cos(angles)[..., None, None]
+
+    cross = np.zeros(axis.shape[:-1] + (3, 3), dtype=axis.dtype)
+    cross[..., 0, 1] = -axis[..., 2]
+    cross[..., 0, 2] = axis[..., 1]
+    cross[..., 1, 0] = axis[..., 2]
+    cross[..., 1, 2] = -axis[..., 0]
+    cross[..., 2, 0] = -axis[..., 1]
+    cross[..., 2, 1] = axis[..., 0]
+    outer = axis[..., :, None] * axis[..., None, :]
+
+    matrix = np.zeros(shape + (4, 4), dtype=np.result_type(angles, axis))
+    matrix[..., :3, :3] = (
+        cos * np.eye(3, dtype=axis.dtype) + sin * cross + (1.0 - cos) * outer
+    )
+    matrix[..., 3, 3] = 1.0
+    return matrix
+
+
+def _batch_translation_matrix(offsets, axis):
+    """Batched version of `trimesh.transformations.translation_matrix(offset * axis)`.
+
+    Args:
+        offsets ((...) float): Displacements along the axes.
+        axis ((..., 3) float): Translation axes; broadcastable against offsets.
+
+    Returns:
+        (..., 4, 4) float: Homogeneous transformation matrices.
+    """
+    translation = np.asarray(offsets)[..., None] * np.asarray(axis)
+
+    matrix = np.zeros(translation.shape[:-1] + (4, 4), dtype=translation.dtype)
+    matrix[..., [0, 1, 2, 3], [0, 1, 2, 3]] = 1.0
+    matrix[..., :3, 3] = translation
+    return matrix
+
+
+def _planar_basis(axis):
+    """Two orthonormal directions spanning the plane perpendicular to an axis.
+    For the z-axis these are the x- and y-axis.
+
+    Args:
+        axis ((3) float): Normal of the plane.
+
+    Returns:
+        tuple((3) float, (3) float): Directions of the two DOFs of a planar joint.
+    """
+    axis = np.asarray(axis, dtype=np.float64)
+    axis = axis / np.linalg.norm(axis)
+    z = np.array([0, 0, 1.0])
+    rotation_axis = np.cross(z, axis)
+    if np.linalg.norm(rotation_axis) < EQUALITY_TOLERANCE:
+        rotation_axis = np.array([1.0, 0, 0])
+    rotation = tra.rotation_matrix(
+        np.arccos(np.clip(z @ axis, -1.0, 1.0)), rotation_axis
+    )
+    return rotation[:3, 0], rotation[:3, 1]
+
+
+def _rigid_inverse(matrix):
+    """Invert homogeneous transformations that consist of rotation and translation only.
+
+    Args:
+        matrix ((..., 4, 4) float): Homogeneous transformations.
+
+    Returns:
+        (..., 4, 4) float: Inverse transformations.
+    """
+    inverse = np.zeros_like(matrix)
+    rotation_transposed = np.swapaxes(matrix[..., :3, :3], -1, -2)
+    inverse[..., :3, :3] = rotation_transposed
+    inverse[..., :3, 3] = -(rotation_transposed @ matrix[..., :3, 3:])[..., 0]
+    inverse[..., 3, 3] = 1.0
+    return inverse
+
+
+def _kinematic_tree_joint_values(tree, cfgs):
+    """Map configurations of actuated joints to the values of all non-fixed joints (incl. mimic joints).
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+        cfgs ((N, num_dofs) float): Configurations.
+
+    Returns:
+        (N, num_values) float: Joint values.
+    """
+    if tree.num_dofs == 0:
+        return np.broadcast_to(tree.value_offset, (len(cfgs), len(tree.value_offset)))
+    return cfgs[:, tree.value_source] * tree.value_multiplier + tree.value_offset
+
+
+def _kinematic_tree_joint_transforms(tree, joint_values, joints=None):
+    """Compute the transformations between parent and child link of all joints.
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+        joint_values ((N, num_values) float): Joint values.
+        joints ((M) int, optional): Indices of the joints to compute. None means all joints. Defaults to None.
+
+    Returns:
+        (N, M, 4, 4) float: Homogeneous transformations.
+    """
+    if joints is None:
+        joints = np.arange(len(tree.joint_names))
+    origins = tree.origins[joints]
+    joint_types = tree.joint_types[joints]
+
+    transforms = np.empty((len(joint_values),) + origins.shape, dtype=origins.dtype)
+    transforms[:] = origins
+
+    revolute = np.flatnonzero(joint_types == JOINT_TYPE_REVOLUTE)
+    if len(revolute) > 0:
+        transforms[:, revolute] = origins[revolute] @ _batch_rotation_matrix(
+            joint_values[:, tree.value_indices[joints[revolute]]],
+            tree.axes[joints[revolute]],
+        )
+
+    prismatic = np.flatnonzero(joint_types == JOINT_TYPE_PRISMATIC)
+    if len(prismatic) > 0:
+        transforms[:, prismatic] = origins[prismatic] @ _batch_translation_matrix(
+            joint_values[:, tree.value_indices[joints[prismatic]]],
+            tree.axes[joints[prismatic]],
+        )
+
+    return transforms
+
+
+def _kinematic_tree_link_poses(tree, joint_transforms):
+    """Compose joint transformations along the tree to get the poses of all frames w.r.t. the root links.
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+        joint_transforms ((N, num_joints, 4, 4) float): Transformations of all joints.
+
+    Returns:
+        (N, num_frames, 4, 4) float: Homogeneous transformations of all frames.
+    """
+    poses = np.empty(
+        (len(joint_transforms), tree.num_frames, 4, 4),
+        dtype=joint_transforms.dtype,
+    )
+    poses[:] = np.eye(4)
+
+    # all joints of the same depth are composed at once
+    for level in tree.levels:
+        poses[:, tree.child[level]] = (
+            poses[:, tree.parent[level]] @ joint_transforms[:, level]
+        )
+
+    return poses
+
+
+def _kinematic_tree_forward_kinematics(tree, cfgs):
+    """Compute the poses of all frames for a batch of configurations.
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+        cfgs ((N, num_dofs) float): Configurations.
+
+    Returns:
+        (N, num_frames, 4, 4) float: Homogeneous transformations of all frames w.r.t. the root links.
+    """
+    joint_values = _kinematic_tree_joint_values(tree, cfgs)
+    joint_transforms = _kinematic_tree_joint_transforms(tree, joint_values)
+    return _kinematic_tree_link_poses(tree, joint_transforms)
+
+
+def _batch_quaternion_from_matrix(matrices):
+    """Convert rotation matrices to unit quaternions.
+
+    Args:
+        matrices ((..., 3, 3) float or (..., 4, 4) float): Rotation matrices or homogeneous transformations.
+
+    Returns:
+        (..., 4) float: Quaternions (w, x, y, z) with non-negative w.
+    """
+    r = matrices[..., :3, :3]
+    r00, r01, r02 = r[..., 0, 0], r[..., 0, 1], r[..., 0, 2]
+    r10, r11, r12 = r[..., 1, 0], r[..., 1, 1], r[..., 1, 2]
+    r20, r21, r22 = r[..., 2, 0], r[..., 2, 1], r[..., 2, 2]
+
+    # each candidate is proportional to the quaternion, the one with the largest
+    # diagonal element is numerically the most stable
+    candidates = np.stack(
+        [
+            np.stack([1.0 + r00 + r11 + r22, r21 - r12, r02 - r20, r10 - r01], -1),
+            np.stack([r21 - r12, 1.0 + r00 - r11 - r22, r01 + r10, r02 + r20], -1),
+            np.stack([r02 - r20, r01 + r10, 1.0 - r00 + r11 - r22, r12 + r21], -1),
+            np.stack([r10 - r01, r02 + r20, r12 + r21, 1.0 - r00 - r11 + r22], -1),
+        ],
+        axis=-2,
+    )
+    best = np.argmax(np.diagonal(candidates, axis1=-2, axis2=-1), axis=-1)
+    quaternions = np.take_along_axis(
+        candidates, best[..., np.newaxis, np.newaxis], axis=-2
+    )[..., 0, :]
+    quaternions /= np.linalg.norm(quaternions, axis=-1, keepdims=True)
+    quaternions *= np.where(quaternions[..., :1] < 0, -1.0, 1.0).astype(
+        quaternions.dtype
+    )
+
+    return quaternions
+
+
+def _batch_pose_format(matrices, pose_format):
+    """Convert homogeneous transformations into another pose representation.
+
+    Args:
+        matrices ((..., 4, 4) float): Homogeneous transformations.
+        pose_format (str): One of "matrix" (no conversion), "pos_quat" (position and quaternion (w, x, y, z)), or "dual_quat" (real and dual part of a unit dual quaternion, both (w, x, y, z)).
+
+    Raises:
+        ValueError: Raised if pose_format is unknown.
+
+    Returns:
+        (..., 4, 4), (..., 7), or (..., 8) float: Poses.
+    """
+    if pose_format == "matrix":
+        return matrices
+    if pose_format not in _POSE_FORMAT_SHAPES:
+        raise ValueError(
+            f"Unknown pose format '{pose_format}'. Use one of {list(_POSE_FORMAT_SHAPES)}."
+        )
+
+    quaternions = _batch_quaternion_from_matrix(matrices)
+    positions = matrices[..., :3, 3]
+    if pose_format == "pos_quat":
+        return np.concatenate([positions, quaternions], axis=-1)
+
+    # dual part = 0.5 * (0, t) * q
+    w, v = quaternions[..., :1], quaternions[..., 1:]
+    dual = 0.5 * np.concatenate(
+        [
+            -np.sum(positions * v, axis=-1, keepdims=True),
+            w * positions + np.cross(positions, v),
+        ],
+        axis=-1,
+    )
+    return np.concatenate([quaternions, dual], axis=-1)
+
+
+def _batch_orientation_error(target, current):
+    """Compute the rotation that aligns orientations as rotation vectors.
+
+    Args:
+        target ((..., 4, 4) float): Target rotations or homogeneous transformations.
+        current ((..., 4, 4) float): Current rotations or homogeneous transformations.
+
+    Returns:
+        (..., 3) float: Rotation vectors (axis times angle) of target * current^-1.
+    """
+    rotation = target[..., :3, :3] @ np.swapaxes(current[..., :3, :3], -1, -2)
+    quaternion = _batch_quaternion_from_matrix(rotation)
+    w, v = quaternion[..., :1], quaternion[..., 1:]
+    sin_half = np.linalg.norm(v, axis=-1, keepdims=True)
+    # angle / sin(angle / 2) approaches 2 / w for small angles
+    small = sin_half < 1e-6
+    scale = np.where(
+        small,
+        2.0 / np.where(small, w, 1.0),
+        2.0 * np.arctan2(sin_half, w) / np.where(small, 1.0, sin_half),
+    )
+    return (scale * v).astype(target.dtype)
+
+
+def _iter_chunks(data, chunk_size):
+    """Split an array or an iterable of rows into chunks.
+
+    Args:
+        data (np.ndarray or iterable): An array (possibly memory-mapped) or an iterable of rows.
+        chunk_size (int): Maximum number of rows per chunk.
+
+    Yields:
+        np.ndarray: Chunk of at most chunk_size rows.
+    """
+    if hasattr(data, "shape"):
+        for start in range(0, len(data), chunk_size):
+            yield np.asarray(data[start : start + chunk_size])
+        return
+
+    chunk = []
+    for row in data:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield np.array(chunk)
+            chunk = []
+    if len(chunk) > 0:
+        yield np.array(chunk)
+
+
+def _forward_kinematics_chunk(tree, cfgs, out):
+    """Compute the poses of all links for a batch of configurations and write them into an existing array.
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+        cfgs ((N, num_dofs) float): Configurations.
+        out ((N, num_links, 4, 4) float): Output array.
+    """
+    out[:] = _kinematic_tree_forward_kinematics(tree, cfgs)[:, : len(tree.link_names)]
+
+
+# kinematic tree of a process pool worker, see _forward_kinematics_worker_init
+_worker_kinematic_tree = None
+
+
+def _forward_kinematics_worker_init(tree):
+    global _worker_kinematic_tree
+    _worker_kinematic_tree = tree
+
+
+def _forward_kinematics_shared_memory_worker(
+    cfgs_name, out_name, cfgs_shape, out_shape, dtype, start, stop
+):
+    """Compute a chunk of a batch whose configurations and output live in shared memory.
+
+    Args:
+        cfgs_name (str): Name of the shared memory block holding the configurations.
+        out_name (str): Name of the shared memory block holding the output.
+        cfgs_shape (tuple(int)): Shape of the configurations.
+        out_shape (tuple(int)): Shape of the output.
+        dtype (str): Data type of configurations and output.
+        start (int): First configuration of the chunk.
+        stop (int): End of the chunk (exclusive).
+    """
+    from multiprocessing import shared_memory
+
+    shm_cfgs = shared_memory.SharedMemory(name=cfgs_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    try:
+        cfgs = np.ndarray(cfgs_shape, dtype=dtype, buffer=shm_cfgs.buf)
+        out = np.ndarray(out_shape, dtype=dtype, buffer=shm_out.buf)
+        _forward_kinematics_chunk(
+            _worker_kinematic_tree, cfgs[start:stop], out[start:stop]
+        )
+        # release buffers before closing shared memory
+        del cfgs, out
+    finally:
+        shm_cfgs.close()
+        shm_out.close()
+
+
+def _kinematic_tree_value_matrix(tree):
+    """The matrix mapping configurations to joint values (without offsets).
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+
+    Returns:
+        (num_values, num_dofs) float: Matrix.
+    """
+    matrix = np.zeros(
+        (len(tree.value_source), tree.num_dofs), dtype=tree.value_multiplier.dtype
+    )
+    if tree.num_dofs > 0:
+        matrix[np.arange(len(tree.value_source)), tree.value_source] = (
+            tree.value_multiplier
+        )
+    return matrix
+
+
+def _kinematic_tree_jacobian(tree, link_poses, link, points=None):
+    """Compute the geometric Jacobian of a link for a batch of link poses.
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+        link_poses ((N, num_frames, 4, 4) float): Poses of all frames w.r.t. the root links.
+        link (int): Index of the link.
+        points ((N, 3) float, optional): Points rigidly attached to the link (in root coordinates) whose velocity is described. None means the origin of the link. Defaults to None.
+
+    Returns:
+        (N, 6, num_dofs) float: Jacobians; the first three rows relate to linear, the last three to angular velocity.
+    """
+    jacobian = np.zeros(
+        (len(link_poses), 6, len(tree.value_source)), dtype=link_poses.dtype
+    )
+
+    parent_joints = np.flatnonzero(tree.child == link)
+    if len(parent_joints) > 0:
+        # all joints on the path from the root to the link
+        joint = parent_joints[0]
+        ancestors = np.flatnonzero(tree.subtree_end[: joint + 1] > joint)
+        ancestors = ancestors[tree.joint_types[ancestors] != JOINT_TYPE_FIXED]
+
+        if points is None:
+            points = link_poses[:, link, :3, 3]
+
+        # joint axes are invariant under the joint motion, the child frame can be used
+        frames = link_poses[:, tree.child[ancestors]]
+        axes = tree.axes[ancestors]
+        revolute = tree.joint_types[ancestors] == JOINT_TYPE_REVOLUTE
+        axes[revolute] /= np.linalg.norm(axes[revolute], axis=-1, keepdims=True)
+        axes = np.einsum("naij,aj->nai", frames[..., :3, :3], axes)
+
+        columns = tree.value_indices[ancestors[revolute]]
+        jacobian[:, :3, columns] = np.cross(
+            axes[:, revolute], points[:, np.newaxis] - frames[:, revolute][..., :3, 3]
+        ).transpose(0, 2, 1)
+        jacobian[:, 3:, columns] = axes[:, revolute].transpose(0, 2, 1)
+
+        columns = tree.value_indices[ancestors[~revolute]]
+        jacobian[:, :3, columns] = axes[:, ~revolute].transpose(0, 2, 1)
+
+    # chain rule for joints that mimic others
+    return jacobian @ _kinematic_tree_value_matrix(tree)
+
+
+def _kinematic_tree_mass_properties(tree, link_poses):
+    """Compute the center of mass and composite inertia of all links for a batch of link poses.
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+        link_poses ((N, num_frames, 4, 4) float): Poses of all frames w.r.t. the root links.
+
+    Returns:
+        float: Total mass.
+        (N, 3) float: Centers of mass w.r.t. the root links.
+        (N, 3, 3) float: Composite inertia tensors about the centers of mass in root coordinates.
+    """
+    num_links = len(tree.link_names)
+    rotations = link_poses[:, :num_links, :3, :3]
+    link_coms = (
+        np.einsum("nlij,lj->nli", rotations, tree.coms)
+        + link_poses[:, :num_links, :3, 3]
+    )
+
+    total_mass = tree.masses.sum()
+    if total_mass > 0.0:
+        com = np.einsum("l,nli->ni", tree.masses, link_coms) / total_mass
+    else:
+        com = np.zeros((len(link_poses), 3), dtype=link_poses.dtype)
+
+    # rotate link inertias into root coordinates and shift them to the common
+    # center of mass (parallel axis theorem)
+    inertia = np.einsum(
+        "nlij,ljk,nlmk->nim", rotations, tree.inertias, rotations, optimize=True
+    )
+    d = link_coms - com[:, np.newaxis]
+    inertia += np.einsum(
+        "l,nlij->nij",
+        tree.masses,
+        np.einsum("nlk,nlk->nl", d, d)[..., np.newaxis, np.newaxis] * np.eye(3)
+        - d[..., :, np.newaxis] * d[..., np.newaxis, :],
+    )
+
+    return total_mass, com, inertia.astype(link_poses.dtype)
+
+
+def _kinematic_tree_center_of_mass_jacobian(tree, link_poses):
+    """Compute the Jacobian of the center of mass of all links for a batch of link poses.
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+        link_poses ((N, num_frames, 4, 4) float): Poses of all frames w.r.t. the root links.
+
+    Returns:
+        (N, 3, num_dofs) float: Jacobians relating joint velocities to the velocity of the center of mass.
+    """
+    jacobian = np.zeros((len(link_poses), 3, tree.num_dofs), dtype=link_poses.dtype)
+    total_mass = tree.masses.sum()
+    if total_mass == 0.0:
+        return jacobian
+
+    for link in np.flatnonzero(tree.masses):
+        points = (
+            link_poses[:, link, :3, :3] @ tree.coms[link] + link_poses[:, link, :3, 3]
+        )
+        jacobian += (
+            tree.masses[link]
+            * _kinematic_tree_jacobian(tree, link_poses, link, points=points)[:, :3]
+        )
+
+    return jacobian / total_mass
+
+
+def _kinematic_tree_value_rates(tree, rates):
+    """Map velocities or accelerations of the actuated DOFs to all joint values.
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+        rates ((N, num_dofs) float): Velocities or accelerations.
+
+    Returns:
+        (N, num_values) float: Velocities or accelerations of all joint values (incl. mimic joints).
+    """
+    return rates[:, tree.value_source] * tree.value_multiplier
+
+
+def _kinematic_tree_inverse_dynamics(
+    tree, link_poses, velocities, accelerations, gravity
+):
+    """Compute joint forces with the recursive Newton-Euler algorithm.
+    All quantities are expressed in root coordinates. Velocities and accelerations are
+    propagated from the root to the leaves level by level, forces from the leaves to the root.
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+        link_poses ((N, num_frames, 4, 4) float): Poses of all frames w.r.t. the root links.
+        velocities ((N, num_values) float): Velocities of all joint values.
+        accelerations ((N, num_values) float): Accelerations of all joint values.
+        gravity ((3,) float): Gravitational acceleration in root coordinates.
+
+    Returns:
+        (N, num_values) float: Forces (prismatic) and torques (revolute) of all joint values, incl. damping and friction.
+    """
+    num_cfgs, num_links = len(link_poses), len(tree.link_names)
+    dtype = link_poses.dtype
+    revolute = tree.joint_types == JOINT_TYPE_REVOLUTE
+    prismatic = tree.joint_types == JOINT_TYPE_PRISMATIC
+
+    # an appended zero column makes fixed joints (value index -1) motionless
+    zeros = np.zeros((num_cfgs, 1), dtype=dtype)
+    qd = np.concatenate([velocities, zeros], axis=1)[:, tree.value_indices]
+    qdd = np.concatenate([accelerations, zeros], axis=1)[:, tree.value_indices]
+
+    axes = tree.axes.copy()
+    axes[revolute] /= np.linalg.norm(axes[revolute], axis=-1, keepdims=True)
+    axes = np.einsum("njik,jk->nji", link_poses[:, tree.child, :3, :3], axes)
+    origins = link_poses[..., :3, 3]
+
+    # forward pass: angular velocity, angular and linear acceleration of each frame origin
+    omega = np.zeros((num_cfgs, tree.num_frames, 3), dtype=dtype)
+    alpha = np.zeros_like(omega)
+    acc = np.zeros_like(omega)
+    acc[:] = -np.asarray(gravity, dtype=dtype)
+    for level in tree.levels:
+        p, c = tree.parent[level], tree.child[level]
+        rot = revolute[level, np.newaxis]
+        pri = prismatic[level, np.newaxis]
+        a_qd = axes[:, level] * qd[:, level, np.newaxis]
+        a_qdd = axes[:, level] * qdd[:, level, np.newaxis]
+        w_p, alpha_p = omega[:, p], alpha[:, p]
+        r = origins[:, c] - origins[:, p]
+
+        omega[:, c] = w_p + rot * a_qd
+        alpha[:, c] = alpha_p + rot * (a_qdd + np.cross(w_p, a_qd))
+        acc[:, c] = (
+            acc[:, p]
+            + np.cross(alpha_p, r)
+            + np.cross(w_p, np.cross(w_p, r))
+            + pri * (2.0 * np.cross(w_p, a_qd) + a_qdd)
+        )
+
+    # force and moment (about the frame origin) needed to accelerate each body
+    masses = np.zeros(tree.num_frames, dtype=dtype)
+    masses[:num_links] = tree.masses
+    coms = np.zeros((tree.num_frames, 3), dtype=dtype)
+    coms[:num_links] = tree.coms
+    inertias = np.zeros((tree.num_frames, 3, 3), dtype=dtype)
+    inertias[:num_links] = tree.inertias
+
+    rotations = link_poses[..., :3, :3]
+    r_com = np.einsum("nfij,fj->nfi", rotations, coms)
+    acc_com = acc + np.cross(alpha, r_com) + np.cross(omega, np.cross(omega, r_com))
+    force = masses[:, np.newaxis] * acc_com
+    inertias = rotations @ inertias @ np.swapaxes(rotations, -1, -2)
+    moment = (
+        np.einsum("nfij,nfj->nfi", inertias, alpha)
+        + np.cross(omega, np.einsum("nfij,nfj->nfi", inertias, omega))
+        + np.cross(r_com, force)
+    )
+
+    # backward pass: accumulate forces of subtrees and project them onto the joint axes
+    torques = np.zeros((num_cfgs, len(tree.joint_types)), dtype=dtype)
+    for level in reversed(tree.levels):
+        p, c = tree.parent[level], tree.child[level]
+        f, n = force[:, c], moment[:, c]
+        torques[:, level] = np.where(
+            revolute[level],
+            np.sum(axes[:, level] * n, axis=-1),
+            np.sum(axes[:, level] * f, axis=-1),
+        )
+        np.add.at(force, (slice(None), p), f)
+        np.add.at(
+            moment, (slice(None), p), n + np.cross(origins[:, c] - origins[:, p], f)
+        )
+
+    torques += tree.damping * qd + tree.friction * np.sign(qd)
+
+    moving = tree.joint_types != JOINT_TYPE_FIXED
+    result = np.zeros((num_cfgs, velocities.shape[1]), dtype=dtype)
+    result[:, tree.value_indices[moving]] = torques[:, moving]
+    return result
+
+
+def _kinematic_tree_mass_matrix(tree, link_poses):
+    """Compute the joint space inertia matrix with the composite rigid body algorithm.
+    Spatial inertias are expressed in root coordinates about the origin, which makes them
+    additive along the tree. Fixed joints are skipped and only entries of joint pairs on a
+    common branch are computed, entries of joints in different branches are zero.
+
+    Args:
+        tree (KinematicTree): Kinematic tree.
+        link_poses ((N, num_frames, 4, 4) float): Poses of all frames w.r.t. the root links.
+
+    Returns:
+        (N, num_dofs, num_dofs) float: Inertia matrices w.r.t. the actuated DOFs.
+    """
+    num_cfgs, num_links = len(link_poses), len(tree.link_names)
+    dtype = link_poses.dtype
+    revolute = tree.joint_types == JOINT_TYPE_REVOLUTE
+
+    def skew(v):
+        m = np.zeros(v.shape + (3,), dtype=dtype)
+        m[..., 0, 1], m[..., 0, 2] = -v[..., 2], v[..., 1]
+        m[..., 1, 0], m[..., 1, 2] = v[..., 2], -v[..., 0]
+        m[..., 2, 0], m[..., 2, 1] = -v[..., 1], v[..., 0]
+        return m
+
+    # spatial inertias (angular, linear) of all bodies about the root origin
+    rotations = link_poses[:, :num_links, :3, :3]
+    coms = (
+        np.einsum("nlij,lj->nli", rotations, tree.coms)
+        + link_poses[:, :num_links, :3, 3]
+    )
+    mass = tree.masses[:, np.newaxis, np.newaxis]
+    c = skew(coms)
+    composite = np.zeros((num_cfgs, tree.num_frames, 6, 6), dtype=dtype)
+    composite[:, :num_links, :3, :3] = (
+        rotations @ tree.inertias @ np.swapaxes(rotations, -1, -2) - mass * c @ c
+    )
+    composite[:, :num_links, :3, 3:] = mass * c
+    composite[:, :num_links, 3:, :3] = -mass * c
+    composite[:, :num_links, 3:, 3:] = mass * np.eye(3, dtype=dtype)
+
+    # composite inertias of all subtrees
+    for level in reversed(tree.levels):
+        np.add.at(
+            composite,
+            (slice(None), tree.parent[level]),
+            composite[:, tree.child[level]],
+        )
+
+    # motion subspaces of all non-fixed joints w.r.t. the root origin
+    moving = np.flatnonzero(tree.joint_types != JOINT_TYPE_FIXED)
+    revolute = revolute[moving]
+    children = tree.child[moving]
+    axes = tree.axes[moving].copy()
+    axes[revolute] /= np.linalg.norm(axes[revolute], axis=-1, keepdims=True)
+    axes = np.einsum("njik,jk->nji", link_poses[:, children, :3, :3], axes)
+    subspaces = np.zeros((num_cfgs, len(moving), 6), dtype=dtype)
+    subspaces[:, revolute, :3] = axes[:, revolute]
+    subspaces[:, revolute, 3:] = np.cross(
+        link_poses[:, children[revolute]][..., :3, 3], axes[:, revolute]
+    )
+    subspaces[:, ~revolute, 3:] = axes[:, ~revolute]
+
+    # M[j, k] = S_j^T I_j S_k is only non-zero if joint j is in the subtree of joint k,
+    # i.e., only pairs along branches of the tree are computed
+    forces = np.einsum("njab,njb->nja", composite[:, children], subspaces)
+    descendant, ancestor = np.nonzero(
+        (moving[:, np.newaxis] >= moving[np.newaxis])
+        & (moving[:, np.newaxis] < tree.subtree_end[moving][np.newaxis])
+    )
+    entries = np.einsum("npa,npa->np", forces[:, descendant], subspaces[:, ancestor])
+    mass_matrix = np.zeros((num_cfgs, len(moving), len(moving)), dtype=dtype)
+    mass_matrix[:, descendant, ancestor] = entries
+    mass_matrix[:, ancestor, descendant] = entries
+
+    # sum up elementary joints that share joint values
+    selection = np.zeros((len(tree.value_source), len(moving)), dtype=dtype)
+    selection[tree.value_indices[moving], np.arange(len(moving))] = 1.0
+    value_matrix = selection.T @ _kinematic_tree_value_matrix(tree)
+    return (value_matrix.T @ mass_matrix @ value_matrix).astype(dtype)
+
+
+def _sample_surface(mesh, count, rng):
+    """Sample points uniformly on the surface of a mesh.
+
+    Args:
+        mesh (trimesh.Trimesh): Mesh.
+        count (int): Number of points.
+        rng (np.random.Generator): Random number generator.
+
+    Returns:
+        (count, 3) float: Points.
+        (count, 3) float: Normals of the faces the points lie on.
+    """
+    areas = mesh.area_faces
+    faces = rng.choice(len(areas), size=count, p=areas / areas.sum())
+    triangles = mesh.triangles[faces]
+
+    # uniform barycentric coordinates
+    u, v = rng.random((2, count, 1))
+    flip = u + v > 1.0
+    u, v = np.where(flip, 1.0 - u, u), np.where(flip, 1.0 - v, v)
+    points = (
+        triangles[:, 0]
+        + u * (triangles[:, 1] - triangles[:, 0])
+        + v * (triangles[:, 2] - triangles[:, 0])
+    )
+    return points, mesh.face_normals[faces]
+
+
+def _fit_spheres(points, num_spheres, num_iterations=20):
+    """Cover a set of points by spheres using k-means clustering.
+
+    Args:
+        points ((P, 3) float): Points.
+        num_spheres (int): Maximum number of spheres.
+        num_iterations (int, optional): Number of k-means iterations. Defaults to 20.
+
+    Returns:
+        (K, 3) float: Centers of the spheres.
+        (K,) float: Radii of the spheres such that every point lies in one of them.
+    """
+    # farthest point initialization makes the result deterministic
+    centers = [points[0]]
+    distances = np.linalg.norm(points - points[0], axis=-1)
+    for _ in range(min(num_spheres, len(points)) - 1):
+        centers.append(points[np.argmax(distances)])
+        distances = np.minimum(distances, np.linalg.norm(points - centers[-1], axis=-1))
+    centers = np.array(centers)
+
+    for _ in range(num_iterations):
+        labels = np.argmin(
+            np.linalg.norm(points[:, np.newaxis] - centers, axis=-1), axis=-1
+        )
+        counts = np.bincount(labels, minlength=len(centers))
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, points)
+        centers = np.where(
+            counts[:, np.newaxis] > 0,
+            sums / np.maximum(counts, 1)[:, np.newaxis],
+            centers,
+        )
+
+    labels = np.argmin(
+        np.linalg.norm(points[:, np.newaxis] - centers, axis=-1), axis=-1
+    )
+    radii = np.zeros(len(centers))
+    np.maximum.at(radii, labels, np.linalg.norm(points - centers[labels], axis=-1))
+    used = np.bincount(labels, minlength=len(centers)) > 0
+    return centers[used], radii[used]
+
+
+class URDF:
+    def __init__(
+        self,
+        robot: Robot = None,
+        build_scene_graph: bool = True,
+        build_collision_scene_graph: bool = False,
+        load_meshes: bool = True,
+        load_collision_meshes: bool = False,
+        filename_handler=None,
+        mesh_dir: str = "",
+        force_mesh: bool = False,
+        force_collision_mesh: bool = True,
+        dtype=np.float64,
+        num_workers: int = 1,
+        use_processes: bool = False,
+        lazy_load_meshes: bool = False,
+        mesh_cache_dir: str = None,
+    ):
+        """A URDF model.
+
+        Args:
+            robot (Robot): The robot model. Defaults to None.
+            build_scene_graph (bool, optional): Whether to build a scene graph to enable transformation queries and forward kinematics. Defaults to True.
+            build_collision_scene_graph (bool, optional): Whether to build a scene graph for <collision> elements. Defaults to False.
+            load_meshes (bool, optional): Whether to load the meshes referenced in the <mesh> elements. Defaults to True.
+            load_collision_meshes (bool, optional): Whether to load the collision meshes referenced in the <mesh> elements. Defaults to False.
+            filename_handler ([type], optional): Any function f(in: str) -> str, that maps filenames in the URDF to actual resources. Can be used to customize treatment of `package://` directives or relative/absolute filenames. Defaults to None.
+            mesh_dir (str, optional): A root directory used for loading meshes. Defaults to "".
+            force_mesh (bool, optional): Each loaded geometry will be concatenated into a single one (instead of being turned into a graph; in case the underlying file contains multiple geometries). This might loose texture information but the resulting scene graph will be smaller. Defaults to False.
+            force_collision_mesh (bool, optional): Same as force_mesh, but for collision scene. Defaults to True.
+            dtype (np.dtype, optional): Floating point type of the configuration, the kinematic tree, and all kinematics results. Using np.float32 halves memory and bandwidth of batched computations; results deviate from np.float64 by up to ~1e-5 for meter-scale robots. Meshes loaded by trimesh always use np.float64. Defaults to np.float64.
+            num_workers (int, optional): Number of threads or processes that load mesh files concurrently. If larger than one, the visual and collision scene are also built concurrently. Geometry is always attached in the order of robot.links. Defaults to 1.
+            use_processes (bool, optional): Whether to load mesh files in a process pool instead of a thread pool. Helps if decoding (e.g., COLLADA) is limited by the GIL. Defaults to False.
+            lazy_load_meshes (bool, optional): Whether to defer loading the meshes of a link until its geometry is first accessed via scene, collision_scene, show, or link_geometry. The scene graphs and geometry names are determined immediately; the names match an eager load if every mesh file holds a single geometry. Use preload to load meshes in the background. Only has an effect if load_meshes or load_collision_meshes is set. Defaults to False.
+            mesh_cache_dir (str, optional): Directory in which the decoded vertex, face, normal, and color arrays of each mesh file are stored after the first load, keyed by the file content. Subsequent loads, also in other processes, memory-map the arrays instead of parsing the file. Files with textures are not stored. Defaults to None.
+        """
+        self._dtype = np.dtype(dtype)
+        self._mesh_cache_dir = mesh_cache_dir
+
+        if filename_handler is None:
+            self._filename_handler = partial(filename_handler_magic, dir=mesh_dir)
+        else:
+            self._filename_handler = filename_handler
+
+        self.robot = robot
+        self._create_maps()
+        self._update_actuated_joints()
+
+        self._cfg = self.zero_cfg.astype(self._dtype)
+
+        # compiled lazily on first use
+        self._kinematic_tree = None
+        self._collision_spheres = {}
+        self._link_box_corners = {}
+        self._surface_samples = {}
+
+        # kinematics cache at the current configuration, see _init_kinematics_cache()
+        self._joint_values = None
+        self._joint_values_buffer = None
+        self._changed_values = None
+        self._moving_joints = None
+        self._moving_joint_values = None
+        self._joint_transforms = None
+        self._link_poses = None
+        self._dirty_joints = None
+
+        # incremented whenever the configuration changes, invalidates _transform_cache
+        self._cfg_version = 0
+        self._transform_cache = {}
+        self._transform_cache_version = 0
+
+        if build_scene_graph or build_collision_scene_graph:
+            self._base_link = self._determine_base_link()
+        else:
+            self._base_link = None
+
+        self._errors = []
+
+        # links whose meshes are loaded on first access, see _load_lazy_links()
+        self._lazy_links = {False: [], True: []}
+        self._lazy_scene_kwargs = {}
+        self._lazy_mesh_files = {}
+        # geometry names reserved in link order, see _reserve_geometry_names()
+        self._lazy_geometry_names = {False: {}, True: {}}
+        self._reserved_geometry_names = {False: set(), True: set()}
+
+        scene_kwargs = []
+        if build_scene_graph:
+            scene_kwargs.append(
+                dict(
+                    use_collision_geometry=False,
+                    load_geometry=load_meshes,
+                    force_mesh=force_mesh,
+                    force_single_geometry_per_link=force_mesh,
+                )
+            )
+        if build_collision_scene_graph:
+            scene_kwargs.append(
+                dict(
+                    use_collision_geometry=True,
+                    load_geometry=load_collision_meshes,
+                    force_mesh=force_collision_mesh,
+                    force_single_geometry_per_link=force_collision_mesh,
+                )
+            )
+
+        for kwargs in scene_kwargs:
+            if lazy_load_meshes and kwargs["load_geometry"]:
+                use_collision_geometry = kwargs["use_collision_geometry"]
+                self._lazy_links[use_collision_geometry] = [
+                    l.name
+                    for l in self.robot.links
+                    if any(
+                        g.geometry is not None and g.geometry.mesh is not None
+                        for g in (l.collisions if use_collision_geometry else l.visuals)
+                    )
+                ]
+                self._lazy_scene_kwargs[use_collision_geometry] = kwargs
+                kwargs["lazy_links"] = set(self._lazy_links[use_collision_geometry])
+                kwargs["lazy_geometry_names"] = self._lazy_geometry_names[
+                    use_collision_geometry
+                ]
+                kwargs["reserved_geometry_names"] = self._reserved_geometry_names[
+                    use_collision_geometry
+                ]
+
+        if num_workers > 1:
+            # resolve all mesh files up front and decode them concurrently
+            keys = []
+            for kwargs in scene_kwargs:
+                if kwargs["load_geometry"] and not lazy_load_meshes:
+                    keys.extend(
+                        self._mesh_file_keys(
+                            kwargs["use_collision_geometry"], kwargs["force_mesh"]
+                        )
+                    )
+            mesh_files = self._load_mesh_files(
+                keys, num_workers=num_workers, use_processes=use_processes
+            )
+            with ThreadPoolExecutor(max_workers=len(scene_kwargs) or 1) as executor:
+                scenes = list(
+                    executor.map(
+                        lambda kwargs: self._create_scene(
+                            mesh_files=mesh_files, **kwargs
+                        ),
+                        scene_kwargs,
+                    )
+                )
+        else:
+            scenes = [self._create_scene(**kwargs) for kwargs in scene_kwargs]
+
+        self._scene = scenes.pop(0) if build_scene_graph else None
+        self._scene_collision = scenes.pop(0) if build_collision_scene_graph else None
+
+    @property
+    def scene(self) -> trimesh.Scene:
+        """A scene object representing the URDF model. Meshes that are loaded lazily are loaded on first access.
+
+        Returns:
+            trimesh.Scene: A trimesh scene object.
+        """
+        self._load_lazy_links(collision_geometry=False)
+        return self._scene
+
+    @property
+    def collision_scene(self) -> trimesh.Scene:
+        """A scene object representing the <collision> elements of the URDF model. Meshes that are loaded lazily are loaded on first access.
+
+        Returns:
+            trimesh.Scene: A trimesh scene object.
+        """
+        self._load_lazy_links(collision_geometry=True)
+        return self._scene_collision
+
+    @property
+    def kinematic_tree(self) -> KinematicTree:
+        """A compact array-based representation of the kinematic structure. Enables forward kinematics without a scene graph.
+
+        Returns:
+            KinematicTree: The compiled kinematic tree.
+        """
+        if self._kinematic_tree is None:
+            self._kinematic_tree = self._create_kinematic_tree()
+        return self._kinematic_tree
+
+    @property
+    def link_map(self) -> dict:
+        """A dictionary mapping link names to link objects.
+
+        Returns:
+            dict: Mapping from link name (str) to Link.
+        """
+        return self._link_map
+
+    @property
+    def joint_map(self) -> dict:
+        """A dictionary mapping joint names to joint objects.
+
+        Returns:
+            dict: Mapping from joint name (str) to Joint.
+        """
+        return self._joint_map
+
+    @property
+    def joint_names(self):
+        """List of joint names.
+
+        Returns:
+            list[str]: List of joint names of the URDF model.
+        """
+        return [j.name for j in self.robot.joints]
+
+    @property
+    def actuated_joints(self):
+        """List of actuated joints. This excludes mimic and fixed joints.
+
+        Returns:
+            list[Joint]: List of actuated joints of the URDF model.
+        """
+        return self._actuated_joints
+
+    @property
+    def actuated_dof_indices(self):
+        """List of DOF indices per actuated joint. Can be used to reference configuration.
+
+        Returns:
+            list[list[int]]: List of DOF indices per actuated joint.
+        """
+        return self._actuated_dof_indices
+
+    @property
+    def actuated_joint_indices(self):
+        """List of indices of all joints that are actuated, i.e., not of type mimic or fixed.
+
+        Returns:
+            list[int]: List of indices of actuated joints.
+        """
+        return self._actuated_joint_indices
+
+    @property
+    def actuated_joint_names(self):
+        """List of names of actuated joints. This excludes mimic and fixed joints.
+
+        Returns:
+            list[str]: List of names of actuated joints of the URDF model.
+        """
+        return list(self._actuated_joint_names)
+
+    @property
+    def mimic_joint_names(self):
+        """List of names of joints that mimic other joints.
+
+        Returns:
+            list[str]: List of names of mimic joints of the URDF model.
+        """
+        return [j.name for j in self._mimic_joints]
+
+    @property
+    def mimic_map(self):
+        """Linear map from the configuration of actuated joints to the values of all actuated DOFs followed by all mimic joints (in the order of mimic_joint_names), i.e., values = matrix @ cfg + offset.
+        Chains of mimic joints are resolved. Each row has at most one non-zero entry.
+
+        Returns:
+            (num_dofs + num_mimic_joints, num_dofs) float: Matrix.
+            (num_dofs + num_mimic_joints) float: Offset.
+        """
+        tree = self.kinematic_tree
+        return _kinematic_tree_value_matrix(tree), tree.value_offset.copy()
+
+    @property
+    def num_actuated_joints(self):
+        """Number of actuated joints.
+
+        Returns:
+            int: Number of actuated joints.
+        """
+        return len(self.actuated_joints)
+
+    @property
+    def num_dofs(self):
+        """Number of degrees of freedom of actuated joints. Depending on the type of the joint, the number of DOFs might vary.
+
+        Returns:
+            int: Degrees of freedom.
+        """
+        total_num_dofs = 0
+        for j in self._actuated_joints:
+            if j.type in ["revolute", "prismatic", "continuous"]:
+                total_num_dofs += 1
+            elif j.type == "floating":
+                total_num_dofs += 6
+            elif j.type == "planar":
+                total_num_dofs += 2
+        return total_num_dofs
+
+    @property
+    def zero_cfg(self):
+        """Return the zero configuration.
+
+        Returns:
+            np.ndarray: The zero configuration.
+        """
+        return np.zeros(self.num_dofs)
+
+    @property
+    def center_cfg(self):
+        """Return center configuration of URDF model by using the average of each joint's limits if present, otherwise zero.
+
+        Returns:
+            (n), float: Default configuration of URDF model.
+        """
+        # sampling bounds are symmetric around zero for DOFs without limits
+        return self._sample_lower + 0.5 * (self._sample_upper - self._sample_lower)
+
+    @property
+    def lower_limits(self):
+        """Lower position limits of all actuated DOFs, -inf if there is none.
+
+        Returns:
+            (num_dofs) float: Lower limits.
+        """
+        return self._lower_limits
+
+    @property
+    def upper_limits(self):
+        """Upper position limits of all actuated DOFs, inf if there is none.
+
+        Returns:
+            (num_dofs) float: Upper limits.
+        """
+        return self._upper_limits
+
+    @property
+    def velocity_limits(self):
+        """Velocity limits of all actuated DOFs, inf if there is none.
+
+        Returns:
+            (num_dofs) float: Velocity limits.
+        """
+        return self._velocity_limits
+
+    @property
+    def effort_limits(self):
+        """Effort limits of all actuated DOFs, inf if there is none.
+
+        Returns:
+            (num_dofs) float: Effort limits.
+        """
+        return self._effort_limits
+
+    def sample_cfgs(self, num_samples, seed=None):
+        """Sample random configurations uniformly within the joint limits.
+        DOFs of continuous joints and the rotational DOFs of floating joints are sampled from [-pi, pi), other DOFs without limits are zero.
+
+        Args:
+            num_samples (int): Number of configurations.
+            seed (int or np.random.Generator, optional): Seed or random number generator for reproducible samples. Defaults to None.
+
+        Returns:
+            (num_samples, num_dofs) float: Configurations.
+        """
+        rng = np.random.default_rng(seed)
+        return rng.uniform(
+            self._sample_lower, self._sample_upper, size=(num_samples, self.num_dofs)
+        ).astype(self._dtype)
+
+    def clip_cfgs(self, cfgs):
+        """Clip configurations to the joint limits and wrap DOFs of continuous joints to [-pi, pi).
+
+        Args:
+            cfgs ((..., num_dofs) float): Configurations.
+
+        Returns:
+            (..., num_dofs) float: Valid configurations.
+        """
+        cfgs = np.clip(
+            np.asarray(cfgs, dtype=self._dtype), self._lower_limits, self._upper_limits
+        )
+        cfgs[..., self._continuous_dofs] = (
+            np.mod(cfgs[..., self._continuous_dofs] + np.pi, 2.0 * np.pi) - np.pi
+        )
+        return cfgs
+
+    def limit_violations(self, cfgs, velocities=None, efforts=None, tolerance=0.0):
+        """Check configurations, velocities, and efforts against the joint limits.
+
+        Args:
+            cfgs ((..., num_dofs) float): Configurations.
+            velocities ((..., num_dofs) float, optional): Velocities, checked against the absolute velocity limits. Defaults to None.
+            efforts ((..., num_dofs) float, optional): Efforts, checked against the absolute effort limits. Defaults to None.
+            tolerance (float, optional): Allowed violation of any limit. Defaults to 0.0.
+
+        Returns:
+            (..., num_dofs) bool: True for every DOF that violates a limit.
+        """
+        cfgs = np.asarray(cfgs)
+        violations = (cfgs < self._lower_limits - tolerance) | (
+            cfgs > self._upper_limits + tolerance
+        )
+        if velocities is not None:
+            violations |= np.abs(velocities) > self._velocity_limits + tolerance
+        if efforts is not None:
+            violations |= np.abs(efforts) > self._effort_limits + tolerance
+        return violations
+
+    @property
+    def cfg(self):
+        """Current configuration.
+
+        Returns:
+            np.ndarray: Current configuration of URDF model.
+        """
+        return self._cfg
+
+    @property
+    def dtype(self):
+        """Floating point type used for kinematics.
+
+        Returns:
+            np.dtype: Data type.
+        """
+        return self._dtype
+
+    @property
+    def cfg_version(self):
+        """Version of the current configuration. Incremented whenever the configuration changes.
+
+        Returns:
+            int: Version counter.
+        """
+        return self._cfg_version
+
+    @property
+    def base_link(self):
+        """Name of URDF base/root link.
+
+        Returns:
+            str: Name of base link of URDF model.
+        """
+        return self._base_link
+
+    @property
+    def errors(self) -> list:
+        """A list with validation errors.
+
+        Returns:
+            list: A list of validation errors.
+        """
+        return self._errors
+
+    def clear_errors(self):
+        """Clear the validation error log."""
+        self._errors = []
+
+    def show(self, collision_geometry=False, callback=None):
+        """Open a simpler viewer displaying the URDF model.
+
+        Args:
+            collision_geometry (bool, optional): Whether to display the <collision> or <visual> elements. Defaults to False.
+        """
+        self._load_lazy_links(collision_geometry=collision_geometry)
+
+        if collision_geometry:
+            if self._scene_collision is None:
+                raise ValueError(
+                    "No collision scene available. Use build_collision_scene_graph=True and load_collision_meshes=True during loading."
+                )
+            else:
+                self._scene_collision.show(callback=callback)
+        else:
+            if self._scene is None:
+                raise ValueError(
+                    "No scene available. Use build_scene_graph=True and load_meshes=True during loading."
+                )
+            elif len(self._scene.bounds_corners) < 1:
+                raise ValueError(
+                    "Scene is empty, maybe meshes failed to load? Use build_scene_graph=True and load_meshes=True during loading."
+                )
+            else:
+                self._scene.show(callback=callback)
+
+    def link_geometry(self, link, collision_geometry=False):
+        """Geometry attached to a link in the scene. Meshes of the link that are loaded lazily are loaded on first access.
+
+        Args:
+            link (str): Name of the link.
+            collision_geometry (bool, optional): Whether to use the collision or visual scene. Defaults to False.
+
+        Raises:
+            ValueError: If the scene does not exist or the link is unknown.
+
+        Returns:
+            dict: Mapping from geometry name (str) to trimesh geometry of all scene nodes that are children of the link.
+        """
+        s = self._scene_collision if collision_geometry else self._scene
+        if s is None:
+            raise ValueError(
+                "No collision scene available. Use build_collision_scene_graph=True during loading."
+                if collision_geometry
+                else "No scene available. Use build_scene_graph=True during loading."
+            )
+        if link not in self._link_map:
+            raise ValueError(f"Unknown link '{link}'.")
+
+        self._load_lazy_links(links=[link], collision_geometry=collision_geometry)
+
+        parents = s.graph.transforms.parents
+        geometry = {}
+        for node in s.graph.nodes_geometry:
+            if parents.get(node) == link:
+                geom_name = s.graph[node][1]
+                geometry[geom_name] = s.geometry[geom_name]
+        return geometry
+
+    def preload(self, links=None, collision_geometry=False, num_workers=1):
+        """Load the meshes of links in the background when using lazy_load_meshes.
+        The returned futures complete once the files are decoded; the geometry is added to the scene on first access.
+
+        Args:
+            links (list[str], optional): Names of the links. None means all links. Defaults to None.
+            collision_geometry (bool, optional): Whether to load the collision or visual meshes. Defaults to False.
+            num_workers (int, optional): Number of threads. Defaults to 1.
+
+        Returns:
+            list[concurrent.futures.Future]: One future per mesh file that is not loaded yet.
+        """
+        pending = self._lazy_links[collision_geometry]
+        if links is not None:
+            pending = [name for name in pending if name in links]
+        if len(pending) == 0:
+            return []
+
+        force_mesh = self._lazy_scene_kwargs[collision_geometry]["force_mesh"]
+        keys = self._mesh_file_keys(collision_geometry, force_mesh, links=pending)
+
+        # references of all links that are not loaded yet, shared files are copied
+        num_references = {}
+        for key in self._mesh_file_keys(
+            collision_geometry, force_mesh, links=self._lazy_links[collision_geometry]
+        ):
+            num_references[key] = num_references.get(key, 0) + 1
+
+        futures = []
+        executor = ThreadPoolExecutor(max_workers=num_workers)
+        for key in dict.fromkeys(keys):
+            if key not in self._lazy_mesh_files:
+                f = executor.submit(_load_cached_mesh_file, *key, self._mesh_cache_dir)
+                self._lazy_mesh_files[key] = [f, num_references[key]]
+                futures.append(f)
+        executor.shutdown(wait=False)
+
+        return futures
+
+    def _load_lazy_links(self, links=None, collision_geometry=False):
+        """Add the geometry of links whose meshes are loaded lazily to the scene.
+
+        Args:
+            links (list[str], optional): Names of the links. None means all links. Defaults to None.
+            collision_geometry (bool, optional): Whether to use the collision or visual scene. Defaults to False.
+        """
+        pending = self._lazy_links[collision_geometry]
+        selected = pending if links is None else [n for n in pending if n in links]
+        if len(selected) == 0:
+            return
+
+        loaded = set(selected)
+        self._lazy_links[collision_geometry] = [n for n in pending if n not in loaded]
+
+        s = self._scene_collision if collision_geometry else self._scene
+        kwargs = self._lazy_scene_kwargs[collision_geometry]
+        for name in selected:
+            l = self._link_map[name]
+            self._add_geometries_to_scene(
+                s,
+                geometries=l.collisions if collision_geometry else l.visuals,
+                link_name=name,
+                load_geometry=True,
+                force_mesh=kwargs["force_mesh"],
+                force_single_geometry=kwargs["force_single_geometry_per_link"],
+                skip_materials=collision_geometry,
+                mesh_files=self._lazy_mesh_files,
+                geom_names=self._lazy_geometry_names[collision_geometry].pop(name),
+                reserved_names=self._reserved_geometry_names[collision_geometry],
+            )
+
+        # drop files whose references are all loaded
+        for key in [k for k, entry in self._lazy_mesh_files.items() if entry[1] <= 0]:
+            del self._lazy_mesh_files[key]
+
+    def validate(self, validation_fn=None) -> bool:
+        """Validate URDF model.
+
+        Args:
+            validation_fn (function, optional): A function f(list[yourdfpy.URDFError]) -> bool. None uses the strict handler (any error leads to False). Defaults to None.
+
+        Returns:
+            bool: Whether the model is valid.
+        """
+        self._errors = []
+        self._validate_robot(self.robot)
+
+        if validation_fn is None:
+            validation_fn = validation_handler_strict
+
+        return validation_fn(self._errors)
+
+    def _create_maps(self):
+        self._material_map = {}
+        for m in self.robot.materials:
+            self._material_map[m.name] = m
+
+        self._joint_map = {}
+        for j in self.robot.joints:
+            self._joint_map[j.name] = j
+
+        self._link_map = {}
+        for l in self.robot.links:
+            self._link_map[l.name] = l
+
+    def _update_actuated_joints(self):
         self._actuated_joints = []
         self._actuated_joint_indices = []
         self._actuated_dof_indices = []
 
-        dof_indices_cnt = 0
-        for i, j in enumerate(self.robot.joints):
-            if j.mimic is None and j.type != "fixed":
-                self._actuated_joints.append(j)
-                self._actuated_joint_indices.append(i)
+        dof_indices_cnt = 0
+        for i, j in enumerate(self.robot.joints):
+            if j.mimic is None and j.type != "fixed":
+                self._actuated_joints.append(j)
+                self._actuated_joint_indices.append(i)
+
+                if j.type in ["prismatic", "revolute", "continuous"]:
+                    self._actuated_dof_indices.append([dof_indices_cnt])
+                    dof_indices_cnt += 1
+                elif j.type == "floating":
+                    # translation (x, y, z) and rotation (roll, pitch, yaw)
+                    self._actuated_dof_indices.append(
+                        list(range(dof_indices_cnt, dof_indices_cnt + 6))
+                    )
+                    dof_indices_cnt += 6
+                elif j.type == "planar":
+                    self._actuated_dof_indices.append(
+                        [dof_indices_cnt, dof_indices_cnt + 1]
+                    )
+                    dof_indices_cnt += 2
+
+        # lookup tables to avoid searching lists when setting configurations
+        self._actuated_joint_names = [j.name for j in self._actuated_joints]
+        self._actuated_joint_index = {
+            name: i for i, name in enumerate(self._actuated_joint_names)
+        }
+        self._actuated_dof_slices = [
+            slice(dofs[0], dofs[-1] + 1) for dofs in self._actuated_dof_indices
+        ]
+
+        # mimic joints (incl. mimic chains) resolved to actuated DOFs
+        self._mimic_joints = [j for j in self.robot.joints if j.mimic is not None]
+        self._mimic_sources = {
+            j.name: self._resolve_mimic(j) for j in self._mimic_joints
+        }
+
+        # limits of all DOFs (inf if there is none) to check and sample configurations in bulk
+        self._lower_limits = np.full(dof_indices_cnt, -np.inf, dtype=self._dtype)
+        self._upper_limits = np.full(dof_indices_cnt, np.inf, dtype=self._dtype)
+        self._velocity_limits = np.full(dof_indices_cnt, np.inf, dtype=self._dtype)
+        self._effort_limits = np.full(dof_indices_cnt, np.inf, dtype=self._dtype)
+        self._continuous_dofs = np.zeros(dof_indices_cnt, dtype=bool)
+        rotational_dofs = np.zeros(dof_indices_cnt, dtype=bool)
+        for j, dofs in zip(self._actuated_joints, self._actuated_dof_slices):
+            if j.limit is not None:
+                if j.type in ["revolute", "prismatic"] and j.limit.lower is not None:
+                    self._lower_limits[dofs] = j.limit.lower
+                if j.type in ["revolute", "prismatic"] and j.limit.upper is not None:
+                    self._upper_limits[dofs] = j.limit.upper
+                if j.limit.velocity is not None:
+                    self._velocity_limits[dofs] = j.limit.velocity
+                if j.limit.effort is not None:
+                    self._effort_limits[dofs] = j.limit.effort
+
+            if j.type == "continuous":
+                self._continuous_dofs[dofs] = True
+            if j.type in ["revolute", "continuous"]:
+                rotational_dofs[dofs] = True
+            elif j.type == "floating":
+                rotational_dofs[dofs.start + 3 : dofs.stop] = True
+
+        # unlimited rotational DOFs are sampled from [-pi, pi), unlimited translational DOFs are zero
+        self._bounded_dofs = np.isfinite(self._lower_limits) & np.isfinite(
+            self._upper_limits
+        )
+        self._sample_lower = np.where(
+            self._bounded_dofs,
+            self._lower_limits,
+            np.where(rotational_dofs, -np.pi, 0.0),
+        ).astype(self._dtype)
+        self._sample_upper = np.where(
+            self._bounded_dofs,
+            self._upper_limits,
+            np.where(rotational_dofs, np.pi, 0.0),
+        ).astype(self._dtype)
+
+    def _resolve_mimic(self, joint):
+        """Follow a chain of mimic joints until reaching an actuated joint.
+
+        Args:
+            joint (Joint): A joint with a <mimic> element.
+
+        Returns:
+            tuple(int, float, float): Index of the DOF that drives the joint (None if there is none), multiplier, and offset.
+        """
+        multiplier, offset = 1.0, 0.0
+        visited = set()
+        while joint.mimic is not None:
+            if joint.name in visited:
+                _logger.warning(
+                    f"Joint '{joint.name}' is part of a cyclic mimic chain - will assume (0.0 + offset)."
+                )
+                return None, 0.0, offset
+            visited.add(joint.name)
+
+            multiplier, offset = (
+                multiplier * joint.mimic.multiplier,
+                multiplier * joint.mimic.offset + offset,
+            )
+            if joint.mimic.joint not in self._joint_map:
+                _logger.warning(
+                    f"Joint '{joint.name}' is supposed to mimic '{joint.mimic.joint}'. But this joint does not exist - will assume (0.0 + offset)."
+                )
+                return None, 0.0, offset
+            joint = self._joint_map[joint.mimic.joint]
+
+        if joint.name not in self._actuated_joint_index:
+            _logger.warning(
+                f"A joint is supposed to mimic '{joint.name}'. But this joint is not actuated - will assume (0.0 + offset)."
+            )
+            return None, 0.0, offset
+
+        return (
+            self._actuated_dof_indices[self._actuated_joint_index[joint.name]][0],
+            multiplier,
+            offset,
+        )
+
+    def _create_kinematic_tree(self):
+        link_names = [l.name for l in self.robot.links]
+        link_index = {name: i for i, name in enumerate(link_names)}
+
+        children = {}
+        child_links = set()
+        for j in self.robot.joints:
+            if j.parent not in link_index or j.child not in link_index:
+                _logger.warning(
+                    f"Joint '{j.name}' connects unknown links. Will be ignored for kinematics."
+                )
+                continue
+            if j.child in child_links:
+                _logger.warning(
+                    f"Link '{j.child}' has multiple parent joints. Will ignore joint '{j.name}' for kinematics."
+                )
+                continue
+            child_links.add(j.child)
+            children.setdefault(j.parent, []).append(j)
+
+        # joint values consist of all actuated DOFs followed by the values of mimic joints
+        num_dofs = self.num_dofs
+        value_source = list(range(num_dofs))
+        value_multiplier = [1.0] * num_dofs
+        value_offset = [0.0] * num_dofs
+        mimic_value_index = {}
+        for j in self._mimic_joints:
+            dof, multiplier, offset = self._mimic_sources[j.name]
+            mimic_value_index[j.name] = len(value_source)
+            value_source.append(0 if dof is None else dof)
+            value_multiplier.append(multiplier)
+            value_offset.append(offset)
+
+        def joint_chain(j):
+            # decompose joint into a chain of elementary joints: [(type, axis, value index)]
+            axis = np.array([1.0, 0, 0]) if j.axis is None else j.axis
+            if j.type not in ["revolute", "continuous", "prismatic"]:
+                if j.type in ["floating", "planar"] and j.mimic is not None:
+                    _logger.warning(
+                        f"Joint '{j.name}' of type {j.type} can't mimic other joints - will be treated as fixed."
+                    )
+                elif j.type in ["floating", "planar"]:
+                    dofs = self._actuated_dof_indices[
+                        self._actuated_joint_index[j.name]
+                    ]
+                    if j.type == "planar":
+                        u, v = _planar_basis(axis)
+                        return [
+                            (JOINT_TYPE_PRISMATIC, u, dofs[0]),
+                            (JOINT_TYPE_PRISMATIC, v, dofs[1]),
+                        ]
+                    # translation (x, y, z) followed by rotation (roll, pitch, yaw) as in <origin>
+                    x, y, z = np.eye(3)
+                    return [
+                        (JOINT_TYPE_PRISMATIC, x, dofs[0]),
+                        (JOINT_TYPE_PRISMATIC, y, dofs[1]),
+                        (JOINT_TYPE_PRISMATIC, z, dofs[2]),
+                        (JOINT_TYPE_REVOLUTE, z, dofs[5]),
+                        (JOINT_TYPE_REVOLUTE, y, dofs[4]),
+                        (JOINT_TYPE_REVOLUTE, x, dofs[3]),
+                    ]
+                return [(JOINT_TYPE_FIXED, axis, -1)]
+
+            joint_type = (
+                JOINT_TYPE_PRISMATIC if j.type == "prismatic" else JOINT_TYPE_REVOLUTE
+            )
+            if j.mimic is None:
+                dofs = self._actuated_dof_indices[self._actuated_joint_index[j.name]]
+                return [(joint_type, axis, dofs[0])]
+
+            return [(joint_type, axis, mimic_value_index[j.name])]
+
+        # depth-first traversal starting at all root links
+        num_frames = len(link_names)
+        joint_names = []
+        joint_types = []
+        parent = []
+        child = []
+        origins = []
+        axes = []
+        value_indices = []
+        depths = []
+        subtree_end = []
+        joint_heads = []
+        joint_tails = []
+        damping = []
+        friction = []
+        stack = []
+        for root in reversed([l for l in link_names if l not in child_links]):
+            stack.extend((j, 0) for j in reversed(children.get(root, [])))
+        while len(stack) > 0:
+            item = stack.pop()
+            if isinstance(item, slice):
+                subtree_end[item] = [len(joint_names)] * (item.stop - item.start)
+                continue
+
+            j, depth = item
+            chain = joint_chain(j)
+            head = len(joint_names)
+            frame = link_index[j.parent]
+            for k, (joint_type, axis, value_index) in enumerate(chain):
+                joint_names.append(j.name)
+                joint_types.append(joint_type)
+                parent.append(frame)
+                if k == len(chain) - 1:
+                    frame = link_index[j.child]
+                else:
+                    # intermediate frame of a joint with multiple DOFs
+                    frame = num_frames
+                    num_frames += 1
+                child.append(frame)
+                origins.append(np.eye(4) if j.origin is None or k > 0 else j.origin)
+                axes.append(axis)
+                value_indices.append(value_index)
+                depths.append(depth + k)
+                subtree_end.append(-1)
+                joint_heads.append(head)
+                joint_tails.append(head + len(chain) - 1)
+                damping.append(
+                    0.0
+                    if j.dynamics is None or j.dynamics.damping is None
+                    else j.dynamics.damping
+                )
+                friction.append(
+                    0.0
+                    if j.dynamics is None or j.dynamics.friction is None
+                    else j.dynamics.friction
+                )
+
+            stack.append(slice(head, len(joint_names)))
+            stack.extend(
+                (c, depth + len(chain)) for c in reversed(children.get(j.child, []))
+            )
+
+        # inertial properties expressed in link coordinates
+        masses = np.zeros(len(link_names))
+        coms = np.zeros((len(link_names), 3))
+        inertias = np.zeros((len(link_names), 3, 3))
+        for i, l in enumerate(self.robot.links):
+            if l.inertial is None or l.inertial.mass is None:
+                continue
+            origin = np.eye(4) if l.inertial.origin is None else l.inertial.origin
+            masses[i] = l.inertial.mass
+            coms[i] = origin[:3, 3]
+            if l.inertial.inertia is not None:
+                inertias[i] = origin[:3, :3] @ l.inertial.inertia @ origin[:3, :3].T
+
+        depths = np.array(depths, dtype=np.int64)
+        return KinematicTree(
+            link_names=link_names,
+            link_index=link_index,
+            num_frames=num_frames,
+            joint_names=joint_names,
+            joint_types=np.array(joint_types, dtype=np.int8),
+            joint_heads=np.array(joint_heads, dtype=np.int64),
+            joint_tails=np.array(joint_tails, dtype=np.int64),
+            parent=np.array(parent, dtype=np.int64),
+            child=np.array(child, dtype=np.int64),
+            origins=np.array(origins, dtype=self._dtype).reshape(-1, 4, 4),
+            axes=np.array(axes, dtype=self._dtype).reshape(-1, 3),
+            value_indices=np.array(value_indices, dtype=np.int64),
+            subtree_end=np.array(subtree_end, dtype=np.int64),
+            levels=[np.flatnonzero(depths == d) for d in range(len(set(depths)))],
+            num_dofs=num_dofs,
+            value_source=np.array(value_source, dtype=np.int64),
+            value_multiplier=np.array(value_multiplier, dtype=self._dtype),
+            value_offset=np.array(value_offset, dtype=self._dtype),
+            masses=masses.astype(self._dtype),
+            coms=coms.astype(self._dtype),
+            inertias=inertias.astype(self._dtype),
+            damping=np.array(damping, dtype=self._dtype),
+            friction=np.array(friction, dtype=self._dtype),
+        )
+
+    def _validate_required_attribute(self, attribute, error_msg, allowed_values=None):
+        if attribute is None:
+            self._errors.append(URDFIncompleteError(error_msg))
+        elif isinstance(attribute, str) and len(attribute) == 0:
+            self._errors.append(URDFIncompleteError(error_msg))
+
+        if allowed_values is not None and attribute is not None:
+            if attribute not in allowed_values:
+                self._errors.append(URDFAttributeValueError(error_msg))
+
+    @staticmethod
+    def load(fname_or_file, **kwargs):
+        """Load URDF file from filename or file object.
+
+        Args:
+            fname_or_file (str or file object): A filename or file object, file-like object, stream representing the URDF file.
+            **build_scene_graph (bool, optional): Whether to build a scene graph to enable transformation queries and forward kinematics. Defaults to True.
+            **build_collision_scene_graph (bool, optional): Whether to build a scene graph for <collision> elements. Defaults to False.
+            **load_meshes (bool, optional): Whether to load the meshes referenced in the <mesh> elements. Defaults to True.
+            **load_collision_meshes (bool, optional): Whether to load the collision meshes referenced in the <mesh> elements. Defaults to False.
+            **filename_handler ([type], optional): Any function f(in: str) -> str, that maps filenames in the URDF to actual resources. Can be used to customize treatment of `package://` directives or relative/absolute filenames. Defaults to None.
+            **mesh_dir (str, optional): A root directory used for loading meshes. Defaults to "".
+            **force_mesh (bool, optional): Each loaded geometry will be concatenated into a single one (instead of being turned into a graph; in case the underlying file contains multiple geometries). This might loose texture information but the resulting scene graph will be smaller. Defaults to False.
+            **force_collision_mesh (bool, optional): Same as force_mesh, but for collision scene. Defaults to True.
+            **dtype (np.dtype, optional): Floating point type of the configuration, the kinematic tree, and all kinematics results. Defaults to np.float64.
+            **num_workers (int, optional): Number of threads or processes that load mesh files concurrently. Defaults to 1.
+            **use_processes (bool, optional): Whether to load mesh files in a process pool instead of a thread pool. Defaults to False.
+            **lazy_load_meshes (bool, optional): Whether to defer loading the meshes of a link until its geometry is first accessed. Defaults to False.
+            **mesh_cache_dir (str, optional): Directory in which decoded mesh files are stored and memory-mapped from. Defaults to None.
+
+        Raises:
+            ValueError: If filename does not exist.
+
+        Returns:
+            yourdfpy.URDF: URDF model.
+        """
+        if isinstance(fname_or_file, six.string_types):
+            if not os.path.isfile(fname_or_file):
+                raise ValueError("{} is not a file".format(fname_or_file))
+
+            if not "mesh_dir" in kwargs:
+                kwargs["mesh_dir"] = os.path.dirname(fname_or_file)
+
+        try:
+            parser = etree.XMLParser(remove_blank_text=True)
+            tree = etree.parse(fname_or_file, parser=parser)
+            xml_root = tree.getroot()
+        except Exception as e:
+            _logger.error(e)
+            _logger.error("Using different parsing approach.")
+
+            events = ("start", "end", "start-ns", "end-ns")
+            xml = etree.iterparse(fname_or_file, recover=True, events=events)
+
+            # Iterate through all XML elements
+            for action, elem in xml:
+                # Skip comments and processing instructions,
+                # because they do not have names
+                if not (
+                    isinstance(elem, etree._Comment)
+                    or isinstance(elem, etree._ProcessingInstruction)
+                ):
+                    # Remove a namespace URI in the element's name
+                    # elem.tag = etree.QName(elem).localname
+                    if action == "end" and ":" in elem.tag:
+                        elem.getparent().remove(elem)
+
+            xml_root = xml.root
+
+        # Remove comments
+        etree.strip_tags(xml_root, etree.Comment)
+        etree.cleanup_namespaces(xml_root)
+
+        return URDF(robot=URDF._parse_robot(xml_element=xml_root), **kwargs)
+
+    def contains(self, key, value, element=None) -> bool:
+        """Checks recursively whether the URDF tree contains the provided key-value pair.
+
+        Args:
+            key (str): A key.
+            value (str): A value.
+            element (etree.Element, optional): The XML element from which to start the recursive search. None means URDF root. Defaults to None.
+
+        Returns:
+            bool: Whether the key-value pair was found.
+        """
+        if element is None:
+            element = self.robot
+
+        result = False
+        for field in element.__dataclass_fields__:
+            field_value = getattr(element, field)
+            if is_dataclass(field_value):
+                result = result or self.contains(
+                    key=key, value=value, element=field_value
+                )
+            elif (
+                isinstance(field_value, list)
+                and len(field_value) > 0
+                and is_dataclass(field_value[0])
+            ):
+                for field_value_element in field_value:
+                    result = result or self.contains(
+                        key=key, value=value, element=field_value_element
+                    )
+            else:
+                if key == field and value == field_value:
+                    result = True
+        return result
+
+    def _determine_base_link(self):
+        """Get the base link of the URDF tree by extracting all links without parents.
+        In case multiple links could be root, choose the first.
+
+        Returns:
+            str: Name of the base link.
+        """
+        link_names = [l.name for l in self.robot.links]
+
+        for j in self.robot.joints:
+            link_names.remove(j.child)
+
+        if len(link_names) == 0:
+            # raise Error?
+            return None
+
+        return link_names[0]
+
+    def _forward_kinematics_joint(self, joint, q=None):
+        origin = np.eye(4) if joint.origin is None else joint.origin
+
+        if joint.mimic is not None:
+            dof, multiplier, offset = self._mimic_sources[joint.name]
+            q = (0.0 if dof is None else self._cfg[dof]) * multiplier + offset
+
+        if joint.type in ["revolute", "prismatic", "continuous"]:
+            if q is None:
+                # Use internal cfg vector for forward kinematics
+                q = self._cfg[
+                    self._actuated_dof_slices[self._actuated_joint_index[joint.name]]
+                ]
+
+            if joint.type == "prismatic":
+                matrix = origin @ tra.translation_matrix(q * joint.axis)
+            else:
+                if isinstance(q, float):
+                    matrix = origin @ tra.rotation_matrix(q, joint.axis)
+                else:
+                    matrix = origin @ tra.rotation_matrix(float(q.item()), joint.axis)
+                
+        elif joint.type in ["floating", "planar"] and joint.mimic is None:
+            if q is None:
+                q = self._cfg[
+                    self._actuated_dof_slices[self._actuated_joint_index[joint.name]]
+                ]
+
+            if joint.type == "floating":
+                matrix = origin @ tra.compose_matrix(translate=q[:3], angles=q[3:])
+            else:
+                u, v = _planar_basis(joint.axis)
+                matrix = origin @ tra.translation_matrix(q[0] * u + q[1] * v)
+        else:
+            matrix = origin
 
-                if j.type in ["prismatic", "revolute", "continuous"]:
-                    self._actuated_dof_indices.append([dof_indices_cnt])
-                    dof_indices_cnt += 1
-                elif j.type == "floating":
-                    self._actuated_dof_indices.append(
-                        [dof_indices_cnt, dof_indices_cnt + 1, dof_indices_cnt + 2]
+        return matrix, q
+
+    def update_cfg(self, configuration):
+        """Update joint configuration of URDF; does forward kinematics.
+        Only joints whose values changed are updated in the scene graphs and only the cached poses of their descendants are recomputed.
+
+        Args:
+            configuration (dict, list[float], tuple[float] or np.ndarray): A mapping from joints or joint names to configuration values, or a list containing a value for each actuated joint or DOF. Floating joints have six DOFs (x, y, z, roll, pitch, yaw), planar joints two. A flat list with one value per DOF is always interpreted per DOF.
+
+        Raises:
+            ValueError: Raised if dimensionality of configuration does not match number of actuated joints or DOFs of URDF model.
+            TypeError: Raised if configuration is neither a dict, list, tuple or np.ndarray.
+        """
+        cfg = self._cfg.copy()
+
+        if isinstance(configuration, dict):
+            for joint, value in configuration.items():
+                if isinstance(joint, Joint):
+                    # TODO: Joint is not hashable; so this branch will not succeed
+                    joint = joint.name
+                elif joint not in self._joint_map:
+                    raise KeyError(joint)
+
+                # only consider actuated joints, mimic joints follow the joints they mimic
+                index = self._actuated_joint_index.get(joint)
+                if index is not None:
+                    cfg[self._actuated_dof_slices[index]] = value
+        elif isinstance(configuration, (list, tuple, np.ndarray)):
+            # a flat vector of all DOFs takes precedence, it's ambiguous if multi-DOF joints
+            # lead to as many DOFs as there are joints
+            flat = all(np.ndim(value) == 0 for value in configuration)
+            if flat and len(configuration) == self.num_dofs:
+                cfg[:] = configuration
+            elif len(configuration) == len(self.robot.joints):
+                for joint, value in zip(self.robot.joints, configuration):
+                    index = self._actuated_joint_index.get(joint.name)
+                    if index is not None:
+                        cfg[self._actuated_dof_slices[index]] = value
+            elif len(configuration) == self.num_actuated_joints:
+                for dof_slice, value in zip(self._actuated_dof_slices, configuration):
+                    cfg[dof_slice] = value
+            else:
+                raise ValueError(
+                    f"Dimensionality of configuration ({len(configuration)}) doesn't match number of all ({len(self.robot.joints)}) or actuated joints ({self.num_actuated_joints}) or DOFs ({self.num_dofs})."
+                )
+        else:
+            raise TypeError("Invalid type for configuration")
+
+        self._set_cfg(cfg)
+
+    def update_cfg_array(self, cfg):
+        """Fast path of update_cfg for a configuration vector of all actuated DOFs.
+        Uses precomputed index tables and preallocated buffers.
+
+        Args:
+            cfg ((num_dofs) float): Configuration.
+
+        Raises:
+            ValueError: Raised if the shape of cfg doesn't match (num_dofs,).
+        """
+        cfg = np.asarray(cfg, dtype=self._cfg.dtype)
+        if cfg.shape != self._cfg.shape:
+            raise ValueError(
+                f"Shape of configuration {cfg.shape} doesn't match ({self.num_dofs},)."
+            )
+        self._set_cfg(cfg)
+
+    def _set_cfg(self, cfg):
+        """Set the internal configuration vector and incrementally update joint transforms, scene graphs, and cached link poses.
+
+        Args:
+            cfg ((num_dofs) float): New configuration.
+        """
+        tree = self.kinematic_tree
+        self._init_kinematics_cache()
+
+        # compute joint values into preallocated buffers
+        joint_values = self._joint_values_buffer
+        if tree.num_dofs > 0:
+            np.take(cfg, tree.value_source, out=joint_values)
+            np.multiply(joint_values, tree.value_multiplier, out=joint_values)
+            np.add(joint_values, tree.value_offset, out=joint_values)
+        np.not_equal(joint_values, self._joint_values, out=self._changed_values)
+
+        self._cfg[:] = cfg
+        if not self._changed_values.any():
+            return
+        self._joint_values[:] = joint_values
+        self._cfg_version += 1
+
+        changed = self._moving_joints[self._changed_values[self._moving_joint_values]]
+        self._update_joint_transforms()
+
+        for i in changed:
+            # invalidate all joints of the subtree below
+            self._dirty_joints[i : tree.subtree_end[i]] = True
+
+        if self._scene is None and self._scene_collision is None:
+            return
+
+        for head in np.unique(tree.joint_heads[changed]):
+            tail = tree.joint_tails[head]
+            matrix = self._joint_transforms[head]
+            for i in range(head + 1, tail + 1):
+                matrix = matrix @ self._joint_transforms[i]
+
+            for s in [self._scene, self._scene_collision]:
+                if s is not None:
+                    s.graph.update(
+                        frame_from=tree.link_names[tree.parent[head]],
+                        frame_to=tree.link_names[tree.child[tail]],
+                        matrix=matrix,
                     )
-                    dof_indices_cnt += 3
-                elif j.type == "planar":
-                    self._actuated_dof_indices.append(
-                        [dof_indices_cnt, dof_indices_cnt + 1]
+
+    def _init_kinematics_cache(self):
+        """Compute joint values, joint transforms, and link poses at the current configuration if they are not cached yet."""
+        if self._link_poses is not None:
+            return
+
+        tree = self.kinematic_tree
+        self._joint_values = _kinematic_tree_joint_values(tree, self._cfg[np.newaxis])[
+            0
+        ].copy()
+        self._joint_values_buffer = self._joint_values.copy()
+        self._changed_values = np.zeros(len(self._joint_values), dtype=bool)
+        self._moving_joints = np.flatnonzero(tree.value_indices >= 0)
+        self._moving_joint_values = tree.value_indices[self._moving_joints]
+
+        self._joint_transforms = _kinematic_tree_joint_transforms(
+            tree, self._joint_values[np.newaxis]
+        )[0]
+
+        # constant factors and buffers of _update_joint_transforms(), rotations of revolute joints
+        # are origin @ R with R = cos * I + sin * K + (1 - cos) * a a^T (Rodrigues' formula)
+        revolute = np.flatnonzero(tree.joint_types == JOINT_TYPE_REVOLUTE)
+        axes = tree.axes[revolute] / np.linalg.norm(
+            tree.axes[revolute], axis=-1, keepdims=True
+        )
+        cross = np.zeros((len(revolute), 3, 3), dtype=self._dtype)
+        cross[:, [2, 0, 1], [1, 2, 0]] = axes
+        cross[:, [1, 2, 0], [2, 0, 1]] = -axes
+        origin_rotations = tree.origins[revolute, :3, :3]
+        outer = origin_rotations @ (axes[:, :, None] * axes[:, None, :])
+        self._revolute_joints = revolute
+        self._revolute_values = tree.value_indices[revolute].reshape(-1, 1, 1)
+        self._revolute_factors = (
+            outer,
+            origin_rotations @ cross,
+            origin_rotations - outer,
+        )
+        self._revolute_buffers = (
+            np.empty((len(revolute), 1, 1), dtype=self._dtype),
+            np.empty((len(revolute), 1, 1), dtype=self._dtype),
+            np.empty((len(revolute), 3, 3), dtype=self._dtype),
+            np.empty((len(revolute), 3, 3), dtype=self._dtype),
+            np.empty((len(revolute), 1, 1), dtype=bool),
+        )
+
+        # translations of prismatic joints are origin translation + value * origin rotation @ axis
+        prismatic = np.flatnonzero(tree.joint_types == JOINT_TYPE_PRISMATIC)
+        self._prismatic_joints = prismatic
+        self._prismatic_values = tree.value_indices[prismatic].reshape(-1, 1)
+        self._prismatic_factors = (
+            tree.origins[prismatic, :3, 3],
+            (tree.origins[prismatic, :3, :3] @ tree.axes[prismatic, :, None])[..., 0],
+        )
+        self._prismatic_buffers = (
+            np.empty((len(prismatic), 1), dtype=self._dtype),
+            np.empty((len(prismatic), 3), dtype=self._dtype),
+            np.empty((len(prismatic), 1), dtype=bool),
+        )
+
+        self._link_poses = _kinematic_tree_link_poses(
+            tree, self._joint_transforms[np.newaxis]
+        )[0]
+        self._dirty_joints = np.zeros(len(tree.joint_names), dtype=bool)
+
+    def _update_joint_transforms(self):
+        """Recompute the cached transforms of the revolute and prismatic joints whose values changed.
+        Intermediate results are written into preallocated buffers."""
+        joint_values = self._joint_values
+        changed = self._changed_values
+
+        if len(self._revolute_joints) > 0:
+            angles, sin, rotations, tmp, mask = self._revolute_buffers
+            np.take(changed, self._revolute_values, out=mask)
+            rows = np.flatnonzero(mask)
+            n = len(rows)
+            if n == len(mask):
+                joints, values = self._revolute_joints, self._revolute_values
+                constant, sin_factor, cos_factor = self._revolute_factors
+            elif n > 0:
+                joints, values = (
+                    self._revolute_joints[rows],
+                    self._revolute_values[rows],
+                )
+                constant, sin_factor, cos_factor = [
+                    f[rows] for f in self._revolute_factors
+                ]
+                angles, sin, rotations, tmp = (
+                    angles[:n],
+                    sin[:n],
+                    rotations[:n],
+                    tmp[:n],
+                )
+            if n > 0:
+                np.take(joint_values, values, out=angles)
+                np.sin(angles, out=sin)
+                np.cos(angles, out=angles)
+                np.multiply(cos_factor, angles, out=rotations)
+                np.multiply(sin_factor, sin, out=tmp)
+                np.add(rotations, tmp, out=rotations)
+                np.add(rotations, constant, out=rotations)
+                self._joint_transforms[joints, :3, :3] = rotations
+
+        if len(self._prismatic_joints) > 0:
+            offsets, translations, mask = self._prismatic_buffers
+            np.take(changed, self._prismatic_values, out=mask)
+            rows = np.flatnonzero(mask)
+            n = len(rows)
+            if n == len(mask):
+                joints, values = self._prismatic_joints, self._prismatic_values
+                origin_translations, directions = self._prismatic_factors
+            elif n > 0:
+                joints, values = (
+                    self._prismatic_joints[rows],
+                    self._prismatic_values[rows],
+                )
+                origin_translations, directions = [
+                    f[rows] for f in self._prismatic_factors
+                ]
+                offsets, translations = offsets[:n], translations[:n]
+            if n > 0:
+                np.take(joint_values, values, out=offsets)
+                np.multiply(directions, offsets, out=translations)
+                np.add(translations, origin_translations, out=translations)
+                self._joint_transforms[joints, :3, 3] = translations
+
+    def _current_link_poses(self):
+        """Poses of all links w.r.t. the base link at the current configuration.
+
+        Returns:
+            (num_links, 4, 4) float: Homogeneous transformations in the order of kinematic_tree.link_names.
+        """
+        self._init_kinematics_cache()
+
+        if self._dirty_joints.any():
+            tree = self.kinematic_tree
+            for level in tree.levels:
+                dirty = level[self._dirty_joints[level]]
+                if len(dirty) > 0:
+                    self._link_poses[tree.child[dirty]] = (
+                        self._link_poses[tree.parent[dirty]]
+                        @ self._joint_transforms[dirty]
                     )
-                    dof_indices_cnt += 2
+            self._dirty_joints[:] = False
 
-    def _validate_required_attribute(self, attribute, error_msg, allowed_values=None):
-        if attribute is None:
-            self._errors.append(URDFIncompleteError(error_msg))
-        elif isinstance(attribute, str) and len(attribute) == 0:
-            self._errors.append(URDFIncompleteError(error_msg))
+        return self._link_poses
 
-        if allowed_values is not None and attribute is not None:
-            if attribute not in allowed_values:
-                self._errors.append(URDFAttributeValueError(error_msg))
+    def get_transform(self, frame_to, frame_from=None, collision_geometry=False):
+        """Get the transform from one frame to another.
+        Transforms between links are computed from the kinematic tree and don't require a scene graph.
+        They are cached until the configuration changes (see cfg_version).
 
-    @staticmethod
-    def load(fname_or_file, **kwargs):
-        """Load URDF file from filename or file object.
+        Args:
+            frame_to (str): Node name.
+            frame_from (str, optional): Node name. If None it will be set to self.base_frame. Defaults to None.
+            collision_geometry (bool, optional): Whether to use the collision geometry scene graph (instead of the visual geometry). Only relevant for nodes that are not links. Defaults to False.
+
+        Raises:
+            ValueError: Raised if one of the nodes is not a link and the scene graph wasn't constructed during intialization.
+
+        Returns:
+            (4, 4) float: Homogeneous transformation matrix
+        """
+        link_index = self.kinematic_tree.link_index
+        if frame_to in link_index and (frame_from is None or frame_from in link_index):
+            if self._transform_cache_version != self._cfg_version:
+                self._transform_cache.clear()
+                self._transform_cache_version = self._cfg_version
+
+            transform = self._transform_cache.get((frame_to, frame_from))
+            if transform is None:
+                poses = self._current_link_poses()
+                if frame_from is None:
+                    transform = poses[link_index[frame_to]].copy()
+                else:
+                    transform = (
+                        _rigid_inverse(poses[link_index[frame_from]])
+                        @ poses[link_index[frame_to]]
+                    )
+                self._transform_cache[(frame_to, frame_from)] = transform
+            return transform.copy()
+
+        if collision_geometry:
+            if self._scene_collision is None:
+                raise ValueError(
+                    "No collision scene available. Use build_collision_scene_graph=True during loading."
+                )
+            else:
+                return self._scene_collision.graph.get(
+                    frame_to=frame_to, frame_from=frame_from
+                )[0]
+        else:
+            if self._scene is None:
+                raise ValueError(
+                    "No scene available. Use build_scene_graph=True during loading."
+                )
+            else:
+                return self._scene.graph.get(frame_to=frame_to, frame_from=frame_from)[
+                    0
+                ]
+
+    def link_poses(self, frame_from=None, links=None, pose_format="matrix"):
+        """Get the poses of multiple links at the current configuration in one array.
 
         Args:
-            fname_or_file (str or file object): A filename or file object, file-like object, stream representing the URDF file.
-            **build_scene_graph (bool, optional): Whether to build a scene graph to enable transformation queries and forward kinematics. Defaults to True.
-            **build_collision_scene_graph (bool, optional): Whether to build a scene graph for <collision> elements. Defaults to False.
-            **load_meshes (bool, optional): Whether to load the meshes referenced in the <mesh> elements. Defaults to True.
-            **load_collision_meshes (bool, optional): Whether to load the collision meshes referenced in the <mesh> elements. Defaults to False.
-            **filename_handler ([type], optional): Any function f(in: str) -> str, that maps filenames in the URDF to actual resources. Can be used to customize treatment of `package://` directives or relative/absolute filenames. Defaults to None.
-            **mesh_dir (str, optional): A root directory used for loading meshes. Defaults to "".
-            **force_mesh (bool, optional): Each loaded geometry will be concatenated into a single one (instead of being turned into a graph; in case the underlying file contains multiple geometries). This might loose texture information but the resulting scene graph will be smaller. Defaults to False.
-            **force_collision_mesh (bool, optional): Same as force_mesh, but for collision scene. Defaults to True.
+            frame_from (str, optional): Link w.r.t. which the poses are expressed. If None the base link is used. Defaults to None.
+            links (list[str], optional): Names of the links. If None all links are used (in the order of robot.links). Defaults to None.
+            pose_format (str, optional): Either "matrix" (homogeneous transformations), "pos_quat" (position and quaternion (w, x, y, z)), or "dual_quat" (real and dual part of a unit dual quaternion). Defaults to "matrix".
+
+        Returns:
+            (num_links, 4, 4), (num_links, 7), or (num_links, 8) float: Poses.
+            dict: Mapping from link name (str) to row (int).
+        """
+        tree = self.kinematic_tree
+        poses = self._current_link_poses()
+
+        if links is None:
+            links = tree.link_names
+            result = poses[: len(links)].copy()
+        else:
+            result = poses[[tree.link_index[l] for l in links]]
+
+        if frame_from is not None:
+            result = _rigid_inverse(poses[tree.link_index[frame_from]]) @ result
+
+        return _batch_pose_format(result, pose_format), {
+            name: i for i, name in enumerate(links)
+        }
+
+    def forward_kinematics_batch(
+        self,
+        cfgs,
+        num_workers=1,
+        chunk_size=None,
+        use_processes=False,
+        pose_format="matrix",
+    ):
+        """Compute the poses of all links for a batch of configurations.
+        In contrast to update_cfg this does not change the internal configuration or any scene graph.
+        The batch can be split into chunks that are processed in parallel by multiple threads (NumPy releases the GIL during its computations) or processes (that share input and output via shared memory). The result does not depend on the parallelization.
+
+        Args:
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints.
+            num_workers (int, optional): Number of threads or processes. Defaults to 1.
+            chunk_size (int, optional): Number of configurations processed at once. None means the batch is split evenly among the workers. Defaults to None.
+            use_processes (bool, optional): Whether to use a process pool instead of a thread pool. Defaults to False.
+            pose_format (str, optional): Either "matrix" (homogeneous transformations), "pos_quat" (position and quaternion (w, x, y, z)), or "dual_quat" (real and dual part of a unit dual quaternion). Defaults to "matrix".
+
+        Raises:
+            ValueError: Raised if the shape of cfgs doesn't match (N, num_dofs), chunk_size is smaller than 1, or the pose format is unknown.
+
+        Returns:
+            (N, num_links, 4, 4), (N, num_links, 7), or (N, num_links, 8) float: Poses of all links (in the order of robot.links) w.r.t. the base link.
+        """
+        cfgs = np.asarray(cfgs, dtype=self._dtype)
+        if cfgs.ndim != 2 or cfgs.shape[1] != self.num_dofs:
+            raise ValueError(
+                f"Shape of configurations {cfgs.shape} doesn't match (N, {self.num_dofs})."
+            )
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"Chunk size ({chunk_size}) must be at least 1.")
+        if pose_format != "matrix":
+            return _batch_pose_format(
+                self.forward_kinematics_batch(
+                    cfgs,
+                    num_workers=num_workers,
+                    chunk_size=chunk_size,
+                    use_processes=use_processes,
+                ),
+                pose_format,
+            )
+
+        tree = self.kinematic_tree
+        num_cfgs = len(cfgs)
+        if chunk_size is None:
+            chunk_size = -(-num_cfgs // max(num_workers, 1))
+        chunks = [
+            (start, min(start + chunk_size, num_cfgs))
+            for start in range(0, num_cfgs, max(chunk_size, 1))
+        ]
+
+        out_shape = (num_cfgs, len(tree.link_names), 4, 4)
+        if len(chunks) <= 1:
+            poses = _kinematic_tree_forward_kinematics(tree, cfgs)
+            if tree.num_frames > len(tree.link_names):
+                # remove intermediate frames of joints with multiple DOFs
+                poses = np.ascontiguousarray(poses[:, : len(tree.link_names)])
+            return poses
+
+        if not use_processes:
+            poses = np.empty(out_shape, dtype=self._dtype)
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                futures = [
+                    executor.submit(
+                        _forward_kinematics_chunk,
+                        tree,
+                        cfgs[start:stop],
+                        poses[start:stop],
+                    )
+                    for start, stop in chunks
+                ]
+                for f in futures:
+                    f.result()
+            return poses
+
+        from multiprocessing import shared_memory
+
+        shm_cfgs = shared_memory.SharedMemory(create=True, size=max(cfgs.nbytes, 1))
+        shm_out = shared_memory.SharedMemory(
+            create=True, size=int(np.prod(out_shape)) * self._dtype.itemsize
+        )
+        try:
+            np.ndarray(cfgs.shape, dtype=self._dtype, buffer=shm_cfgs.buf)[:] = cfgs
+            with ProcessPoolExecutor(
+                max_workers=num_workers,
+                initializer=_forward_kinematics_worker_init,
+                initargs=(tree,),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _forward_kinematics_shared_memory_worker,
+                        shm_cfgs.name,
+                        shm_out.name,
+                        cfgs.shape,
+                        out_shape,
+                        self._dtype.str,
+                        start,
+                        stop,
+                    )
+                    for start, stop in chunks
+                ]
+                for f in futures:
+                    f.result()
+            poses = np.ndarray(out_shape, dtype=self._dtype, buffer=shm_out.buf).copy()
+        finally:
+            shm_cfgs.close()
+            shm_cfgs.unlink()
+            shm_out.close()
+            shm_out.unlink()
+
+        return poses
+
+    def forward_kinematics_iter(self, cfgs, chunk_size=10000, links=None, **kwargs):
+        """Compute link poses for a sequence of configurations chunk by chunk.
+        Memory consumption is bounded by the chunk size, not by the number of configurations.
+
+        Args:
+            cfgs ((N, num_dofs) float or iterable): Configurations of the actuated joints. Either an array (e.g., memory-mapped via np.load(fname, mmap_mode="r")) or an iterable of configurations.
+            chunk_size (int, optional): Maximum number of configurations per chunk. Defaults to 10000.
+            links (list[str], optional): Names of the links whose poses are returned. If None all links are used (in the order of robot.links). Defaults to None.
+            **kwargs: Arguments delegated to forward_kinematics_batch, e.g., num_workers or pose_format.
+
+        Yields:
+            (M, num_links, 4, 4) float: Poses of the links w.r.t. the base link for the next M <= chunk_size configurations. The trailing dimensions depend on the pose format.
+        """
+        tree = self.kinematic_tree
+        link_indices = None if links is None else [tree.link_index[l] for l in links]
+
+        for chunk in _iter_chunks(cfgs, chunk_size):
+            poses = self.forward_kinematics_batch(chunk, **kwargs)
+            yield poses if link_indices is None else poses[:, link_indices]
+
+    def forward_kinematics_to_file(
+        self, cfgs, fname, chunk_size=10000, links=None, **kwargs
+    ):
+        """Compute link poses for a sequence of configurations chunk by chunk and write them into a memory-mapped .npy file.
+
+        Args:
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints. Any sized sequence or array, e.g., memory-mapped via np.load(fname, mmap_mode="r").
+            fname (str): Name of the .npy file to be written.
+            chunk_size (int, optional): Maximum number of configurations per chunk. Defaults to 10000.
+            links (list[str], optional): Names of the links whose poses are written. If None all links are used (in the order of robot.links). Defaults to None.
+            **kwargs: Arguments delegated to forward_kinematics_batch, e.g., num_workers or pose_format.
+
+        Returns:
+            np.memmap: (N, num_links, 4, 4) poses of the links w.r.t. the base link. The trailing dimensions depend on the pose format.
+        """
+        num_links = len(self.kinematic_tree.link_names) if links is None else len(links)
+        pose_shape = _POSE_FORMAT_SHAPES.get(kwargs.get("pose_format", "matrix"))
+        if pose_shape is None:
+            raise ValueError(
+                f"Unknown pose format '{kwargs['pose_format']}'. Use one of {list(_POSE_FORMAT_SHAPES)}."
+            )
+        out = np.lib.format.open_memmap(
+            fname,
+            mode="w+",
+            dtype=self._dtype,
+            shape=(len(cfgs), num_links) + pose_shape,
+        )
+
+        start = 0
+        for poses in self.forward_kinematics_iter(
+            cfgs, chunk_size=chunk_size, links=links, **kwargs
+        ):
+            out[start : start + len(poses)] = poses
+            start += len(poses)
+        out.flush()
+
+        return out
+
+    def jacobian_batch(self, link, cfgs):
+        """Compute the geometric Jacobian of a link for a batch of configurations.
+
+        Args:
+            link (str): Name of the link.
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints.
+
+        Raises:
+            ValueError: Raised if the shape of cfgs doesn't match (N, num_dofs).
+
+        Returns:
+            (N, 6, num_dofs) float: Jacobians w.r.t. the base link. The first three rows relate joint velocities to the linear velocity of the link origin, the last three to its angular velocity.
+        """
+        cfgs = np.asarray(cfgs, dtype=self._dtype)
+        if cfgs.ndim != 2 or cfgs.shape[1] != self.num_dofs:
+            raise ValueError(
+                f"Shape of configurations {cfgs.shape} doesn't match (N, {self.num_dofs})."
+            )
+
+        tree = self.kinematic_tree
+        link_poses = _kinematic_tree_forward_kinematics(tree, cfgs)
+        return _kinematic_tree_jacobian(tree, link_poses, tree.link_index[link])
+
+    def jacobian(self, link, cfg=None):
+        """Compute the geometric Jacobian of a link.
+
+        Args:
+            link (str): Name of the link.
+            cfg ((num_dofs) float, optional): Configuration of the actuated joints. None means the current configuration. Defaults to None.
+
+        Returns:
+            (6, num_dofs) float: Jacobian w.r.t. the base link. The first three rows relate joint velocities to the linear velocity of the link origin, the last three to its angular velocity.
+        """
+        if cfg is None:
+            tree = self.kinematic_tree
+            return _kinematic_tree_jacobian(
+                tree, self._current_link_poses()[np.newaxis], tree.link_index[link]
+            )[0]
+        return self.jacobian_batch(link, np.asarray(cfg)[np.newaxis])[0]
+
+    def mass_properties_batch(self, cfgs):
+        """Compute the total mass, center of mass, and composite inertia of the robot for a batch of configurations.
+        Links without <inertial> element are considered massless.
+
+        Args:
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints.
+
+        Raises:
+            ValueError: Raised if the shape of cfgs doesn't match (N, num_dofs).
+
+        Returns:
+            float: Total mass.
+            (N, 3) float: Centers of mass w.r.t. the base link.
+            (N, 3, 3) float: Composite inertia tensors about the centers of mass, expressed in the base link frame.
+        """
+        cfgs = np.asarray(cfgs, dtype=self._dtype)
+        if cfgs.ndim != 2 or cfgs.shape[1] != self.num_dofs:
+            raise ValueError(
+                f"Shape of configurations {cfgs.shape} doesn't match (N, {self.num_dofs})."
+            )
+
+        tree = self.kinematic_tree
+        link_poses = _kinematic_tree_forward_kinematics(tree, cfgs)
+        return _kinematic_tree_mass_properties(tree, link_poses)
+
+    def center_of_mass_jacobian_batch(self, cfgs):
+        """Compute the Jacobian of the center of mass of the robot for a batch of configurations.
+
+        Args:
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints.
+
+        Raises:
+            ValueError: Raised if the shape of cfgs doesn't match (N, num_dofs).
+
+        Returns:
+            (N, 3, num_dofs) float: Jacobians relating joint velocities to the linear velocity of the center of mass w.r.t. the base link.
+        """
+        cfgs = np.asarray(cfgs, dtype=self._dtype)
+        if cfgs.ndim != 2 or cfgs.shape[1] != self.num_dofs:
+            raise ValueError(
+                f"Shape of configurations {cfgs.shape} doesn't match (N, {self.num_dofs})."
+            )
+
+        tree = self.kinematic_tree
+        link_poses = _kinematic_tree_forward_kinematics(tree, cfgs)
+        return _kinematic_tree_center_of_mass_jacobian(tree, link_poses)
+
+    def inverse_dynamics_batch(
+        self, cfgs, velocities=None, accelerations=None, gravity=(0.0, 0.0, -9.81)
+    ):
+        """Compute the joint forces and torques that realize given motions using the recursive Newton-Euler algorithm.
+        Links without <inertial> element are considered massless; <dynamics> damping and friction are included. Root links are fixed.
+
+        Args:
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints.
+            velocities ((N, num_dofs) float, optional): Velocities of the actuated joints. None means zero. Defaults to None.
+            accelerations ((N, num_dofs) float, optional): Accelerations of the actuated joints. None means zero. Defaults to None.
+            gravity ((3,) float, optional): Gravitational acceleration w.r.t. the base link. Defaults to (0.0, 0.0, -9.81).
+
+        Raises:
+            ValueError: Raised if the shape of cfgs, velocities, or accelerations doesn't match (N, num_dofs).
+
+        Returns:
+            (N, num_dofs) float: Forces (prismatic DOFs) and torques (revolute DOFs) of the actuated joints.
+        """
+        cfgs = np.asarray(cfgs, dtype=self._dtype)
+        if cfgs.ndim != 2 or cfgs.shape[1] != self.num_dofs:
+            raise ValueError(
+                f"Shape of configurations {cfgs.shape} doesn't match (N, {self.num_dofs})."
+            )
+        rates = []
+        for r in [velocities, accelerations]:
+            r = np.zeros_like(cfgs) if r is None else np.asarray(r, dtype=self._dtype)
+            if r.shape != cfgs.shape:
+                raise ValueError(
+                    f"Shape of velocities/accelerations {r.shape} doesn't match {cfgs.shape}."
+                )
+            rates.append(r)
+
+        tree = self.kinematic_tree
+        link_poses = _kinematic_tree_forward_kinematics(tree, cfgs)
+        forces = _kinematic_tree_inverse_dynamics(
+            tree,
+            link_poses,
+            _kinematic_tree_value_rates(tree, rates[0]),
+            _kinematic_tree_value_rates(tree, rates[1]),
+            gravity,
+        )
+
+        # forces of mimic joints act on the DOFs they follow
+        return forces @ _kinematic_tree_value_matrix(tree)
+
+    def gravity_compensation_batch(self, cfgs, gravity=(0.0, 0.0, -9.81)):
+        """Compute the joint forces and torques that hold the robot at rest against gravity.
+
+        Args:
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints.
+            gravity ((3,) float, optional): Gravitational acceleration w.r.t. the base link. Defaults to (0.0, 0.0, -9.81).
+
+        Raises:
+            ValueError: Raised if the shape of cfgs doesn't match (N, num_dofs).
+
+        Returns:
+            (N, num_dofs) float: Forces (prismatic DOFs) and torques (revolute DOFs) of the actuated joints.
+        """
+        return self.inverse_dynamics_batch(cfgs, gravity=gravity)
+
+    def mass_matrix_batch(self, cfgs):
+        """Compute the joint space inertia matrix for a batch of configurations using the composite rigid body algorithm.
+        Links without <inertial> element are considered massless. Root links are fixed.
+
+        Args:
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints.
+
+        Raises:
+            ValueError: Raised if the shape of cfgs doesn't match (N, num_dofs).
+
+        Returns:
+            (N, num_dofs, num_dofs) float: Symmetric inertia matrices.
+        """
+        cfgs = np.asarray(cfgs, dtype=self._dtype)
+        if cfgs.ndim != 2 or cfgs.shape[1] != self.num_dofs:
+            raise ValueError(
+                f"Shape of configurations {cfgs.shape} doesn't match (N, {self.num_dofs})."
+            )
+
+        tree = self.kinematic_tree
+        link_poses = _kinematic_tree_forward_kinematics(tree, cfgs)
+        return _kinematic_tree_mass_matrix(tree, link_poses)
+
+    def forward_dynamics_batch(
+        self, cfgs, velocities, torques, gravity=(0.0, 0.0, -9.81)
+    ):
+        """Compute the joint accelerations resulting from joint forces and torques for a batch of states.
+        Solves M(q) qdd = tau - h(q, qd) with the inertia matrix M from the composite rigid body algorithm and the bias forces h (Coriolis, centrifugal, gravity, damping, and friction) from the recursive Newton-Euler algorithm.
+
+        Args:
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints.
+            velocities ((N, num_dofs) float): Velocities of the actuated joints.
+            torques ((N, num_dofs) float): Forces (prismatic DOFs) and torques (revolute DOFs) of the actuated joints.
+            gravity ((3,) float, optional): Gravitational acceleration w.r.t. the base link. Defaults to (0.0, 0.0, -9.81).
+
+        Raises:
+            ValueError: Raised if the shape of cfgs, velocities, or torques doesn't match (N, num_dofs).
+            numpy.linalg.LinAlgError: Raised if an inertia matrix is singular, e.g., since a DOF moves no mass.
+
+        Returns:
+            (N, num_dofs) float: Accelerations of the actuated joints.
+        """
+        cfgs = np.asarray(cfgs, dtype=self._dtype)
+        if cfgs.ndim != 2 or cfgs.shape[1] != self.num_dofs:
+            raise ValueError(
+                f"Shape of configurations {cfgs.shape} doesn't match (N, {self.num_dofs})."
+            )
+        velocities = np.asarray(velocities, dtype=self._dtype)
+        torques = np.asarray(torques, dtype=self._dtype)
+        if velocities.shape != cfgs.shape or torques.shape != cfgs.shape:
+            raise ValueError(
+                f"Shape of velocities {velocities.shape} or torques {torques.shape} doesn't match {cfgs.shape}."
+            )
 
-        Raises:
-            ValueError: If filename does not exist.
+        tree = self.kinematic_tree
+        link_poses = _kinematic_tree_forward_kinematics(tree, cfgs)
+        bias = _kinematic_tree_inverse_dynamics(
+            tree,
+            link_poses,
+            _kinematic_tree_value_rates(tree, velocities),
+            np.zeros((len(cfgs), len(tree.value_source)), dtype=self._dtype),
+            gravity,
+        ) @ _kinematic_tree_value_matrix(tree)
+        mass_matrix = _kinematic_tree_mass_matrix(tree, link_poses)
+        return np.linalg.solve(mass_matrix, (torques - bias)[..., np.newaxis])[..., 0]
+
+    def collision_spheres(self, num_spheres=8, num_samples=1000, cache_dir=None):
+        """Approximate the collision geometry of each link by spheres.
+        Spheres are fitted to the vertices of and points sampled on the surface of the collision geometry (primitives and meshes) such that all of them are covered.
+        Results are cached per instance and optionally on disk.
+
+        Args:
+            num_spheres (int, optional): Maximum number of spheres per link. Defaults to 8.
+            num_samples (int, optional): Number of surface samples per link. Defaults to 1000.
+            cache_dir (str, optional): Directory in which approximations are stored and looked up. The key depends on the collision geometry, referenced mesh files, and parameters. Defaults to None.
 
         Returns:
-            yourdfpy.URDF: URDF model.
+            CollisionSpheres: Spheres of all links.
         """
-        if isinstance(fname_or_file, six.string_types):
-            if not os.path.isfile(fname_or_file):
-                raise ValueError("{} is not a file".format(fname_or_file))
+        key = self._geometry_cache_key(True, "spheres", num_spheres, num_samples)
+        if key in self._collision_spheres:
+            return self._collision_spheres[key]
+
+        fname = None if cache_dir is None else os.path.join(cache_dir, f"{key}.npz")
+        if fname is not None and os.path.isfile(fname):
+            with np.load(fname) as data:
+                centers, radii, links = data["centers"], data["radii"], data["links"]
+        else:
+            centers, radii, links = [np.zeros((0, 3))], [np.zeros(0)], [np.zeros(0)]
+            rng = np.random.default_rng(0)
+            for i, l in enumerate(self.robot.links):
+                mesh = self._link_mesh(l, collision_geometry=True)
+                if mesh is None:
+                    continue
+                points, _ = _sample_surface(mesh, num_samples, rng)
+                c, r = _fit_spheres(np.vstack([points, mesh.vertices]), num_spheres)
+                centers.append(c)
+                radii.append(r)
+                links.append(np.full(len(r), i))
+            centers = np.concatenate(centers)
+            radii = np.concatenate(radii)
+            links = np.concatenate(links).astype(np.int64)
+
+            if fname is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                np.savez(fname, centers=centers, radii=radii, links=links)
+
+        # links connected by fixed joints form rigid groups
+        group = list(range(len(self.robot.links)))
+
+        def find(i):
+            while group[i] != i:
+                i = group[i]
+            return i
+
+        tree = self.kinematic_tree
+        for j in self.robot.joints:
+            if j.type == "fixed" and j.parent in tree.link_index:
+                group[find(tree.link_index[j.child])] = find(tree.link_index[j.parent])
+        group = np.array([find(i) for i in range(len(group))], dtype=np.int64)
 
-            if not "mesh_dir" in kwargs:
-                kwargs["mesh_dir"] = os.path.dirname(fname_or_file)
+        adjacent = np.eye(len(group), dtype=bool)
+        for j in self.robot.joints:
+            if j.parent in tree.link_index and j.child in tree.link_index:
+                a, b = group[tree.link_index[j.parent]], group[tree.link_index[j.child]]
+                adjacent[a, b] = adjacent[b, a] = True
+
+        first, second = np.triu_indices(len(radii), k=1)
+        keep = ~adjacent[group[links[first]], group[links[second]]]
+
+        spheres = CollisionSpheres(
+            centers=centers.astype(self._dtype),
+            radii=radii.astype(self._dtype),
+            links=links,
+            pairs=np.stack([first[keep], second[keep]], axis=-1),
+        )
+        self._collision_spheres[key] = spheres
+        return spheres
 
-        try:
-            parser = etree.XMLParser(remove_blank_text=True)
-            tree = etree.parse(fname_or_file, parser=parser)
-            xml_root = tree.getroot()
-        except Exception as e:
-            _logger.error(e)
-            _logger.error("Using different parsing approach.")
+    def self_collision_batch(
+        self, cfgs, margin=0.0, num_spheres=8, num_samples=1000, cache_dir=None
+    ):
+        """Check configurations for self-collisions using a sphere approximation of the collision geometry.
+        See collision_spheres for details on the approximation and which pairs of links are checked.
 
-            events = ("start", "end", "start-ns", "end-ns")
-            xml = etree.iterparse(fname_or_file, recover=True, events=events)
+        Args:
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints.
+            margin (float, optional): Sphere pairs closer than this distance are considered in collision. Defaults to 0.0.
+            num_spheres (int, optional): Maximum number of spheres per link. Defaults to 8.
+            num_samples (int, optional): Number of surface samples per link. Defaults to 1000.
+            cache_dir (str, optional): Directory in which sphere approximations are cached. Defaults to None.
 
-            # Iterate through all XML elements
-            for action, elem in xml:
-                # Skip comments and processing instructions,
-                # because they do not have names
-                if not (
-                    isinstance(elem, etree._Comment)
-                    or isinstance(elem, etree._ProcessingInstruction)
-                ):
-                    # Remove a namespace URI in the element's name
-                    # elem.tag = etree.QName(elem).localname
-                    if action == "end" and ":" in elem.tag:
-                        elem.getparent().remove(elem)
+        Raises:
+            ValueError: Raised if the shape of cfgs doesn't match (N, num_dofs).
 
-            xml_root = xml.root
+        Returns:
+            (N) bool: Whether a configuration is in self-collision.
+            (N, num_pairs) float: Signed distances between the sphere pairs of collision_spheres().pairs, negative if they penetrate.
+        """
+        cfgs = np.asarray(cfgs, dtype=self._dtype)
+        if cfgs.ndim != 2 or cfgs.shape[1] != self.num_dofs:
+            raise ValueError(
+                f"Shape of configurations {cfgs.shape} doesn't match (N, {self.num_dofs})."
+            )
 
-        # Remove comments
-        etree.strip_tags(xml_root, etree.Comment)
-        etree.cleanup_namespaces(xml_root)
+        spheres = self.collision_spheres(
+            num_spheres=num_spheres, num_samples=num_samples, cache_dir=cache_dir
+        )
+        link_poses = _kinematic_tree_forward_kinematics(self.kinematic_tree, cfgs)
+        poses = link_poses[:, spheres.links]
+        centers = (
+            np.einsum("nsij,sj->nsi", poses[..., :3, :3], spheres.centers)
+            + poses[..., :3, 3]
+        )
 
-        return URDF(robot=URDF._parse_robot(xml_element=xml_root), **kwargs)
+        first, second = spheres.pairs[:, 0], spheres.pairs[:, 1]
+        distances = (
+            np.linalg.norm(centers[:, first] - centers[:, second], axis=-1)
+            - spheres.radii[first]
+            - spheres.radii[second]
+        )
+        return np.any(distances < margin, axis=-1), distances
 
-    def contains(self, key, value, element=None) -> bool:
-        """Checks recursively whether the URDF tree contains the provided key-value pair.
+    def _box_corners(self, collision_geometry):
+        """Corners of the oriented bounding boxes of all links, computed once per geometry type.
 
         Args:
-            key (str): A key.
-            value (str): A value.
-            element (etree.Element, optional): The XML element from which to start the recursive search. None means URDF root. Defaults to None.
+            collision_geometry (bool): Whether to use the collision or visual geometry.
 
         Returns:
-            bool: Whether the key-value pair was found.
+            (num_links, 8, 3) float: Corners in link coordinates, NaN for links without geometry.
         """
-        if element is None:
-            element = self.robot
-
-        result = False
-        for field in element.__dataclass_fields__:
-            field_value = getattr(element, field)
-            if is_dataclass(field_value):
-                result = result or self.contains(
-                    key=key, value=value, element=field_value
+        if collision_geometry not in self._link_box_corners:
+            corners = np.full((len(self.robot.links), 8, 3), np.nan)
+            for i, l in enumerate(self.robot.links):
+                mesh = self._link_mesh(l, collision_geometry=collision_geometry)
+                if mesh is None:
+                    continue
+                to_origin, extents = trimesh.bounds.oriented_bounds(mesh)
+                box = trimesh.creation.box(
+                    extents=extents, transform=np.linalg.inv(to_origin)
                 )
-            elif (
-                isinstance(field_value, list)
-                and len(field_value) > 0
-                and is_dataclass(field_value[0])
-            ):
-                for field_value_element in field_value:
-                    result = result or self.contains(
-                        key=key, value=value, element=field_value_element
-                    )
-            else:
-                if key == field and value == field_value:
-                    result = True
-        return result
+                corners[i] = box.vertices
+            self._link_box_corners[collision_geometry] = corners.astype(self._dtype)
+        return self._link_box_corners[collision_geometry]
 
-    def _determine_base_link(self):
-        """Get the base link of the URDF tree by extracting all links without parents.
-        In case multiple links could be root, choose the first.
+    def bounds_batch(self, cfgs, collision_geometry=False):
+        """Compute axis-aligned bounding boxes of the robot and all its links for a batch of configurations.
+        Only the corners of the oriented bounding boxes of the links are transformed, hence the boxes enclose but might be larger than the ones of the posed meshes.
 
-        Returns:
-            str: Name of the base link.
-        """
-        link_names = [l.name for l in self.robot.links]
+        Args:
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints.
+            collision_geometry (bool, optional): Whether to use the collision or visual geometry. Defaults to False.
 
-        for j in self.robot.joints:
-            link_names.remove(j.child)
+        Raises:
+            ValueError: Raised if the shape of cfgs doesn't match (N, num_dofs).
 
-        if len(link_names) == 0:
-            # raise Error?
-            return None
+        Returns:
+            (N, 2, 3) float: Minimum and maximum corner of the bounding box of the robot w.r.t. the base link.
+            (N, num_links, 2, 3) float: Minimum and maximum corners of the bounding boxes of all links (in the order of robot.links), NaN for links without geometry.
+        """
+        cfgs = np.asarray(cfgs, dtype=self._dtype)
+        if cfgs.ndim != 2 or cfgs.shape[1] != self.num_dofs:
+            raise ValueError(
+                f"Shape of configurations {cfgs.shape} doesn't match (N, {self.num_dofs})."
+            )
 
-        return link_names[0]
+        corners = self._box_corners(collision_geometry)
+        has_geometry = ~np.isnan(corners[:, 0, 0])
+        link_poses = _kinematic_tree_forward_kinematics(self.kinematic_tree, cfgs)
+        link_poses = link_poses[:, : len(corners)]
+        corners = (
+            np.einsum("nlij,lcj->nlci", link_poses[..., :3, :3], corners)
+            + link_poses[..., np.newaxis, :3, 3]
+        )
 
-    def _forward_kinematics_joint(self, joint, q=None):
-        origin = np.eye(4) if joint.origin is None else joint.origin
+        link_bounds = np.stack([corners.min(axis=2), corners.max(axis=2)], axis=2)
+        if not np.any(has_geometry):
+            return np.full((len(cfgs), 2, 3), np.nan, dtype=self._dtype), link_bounds
 
-        if joint.mimic is not None:
-            if joint.mimic.joint in self.actuated_joint_names:
-                mimic_joint_index = self.actuated_joint_names.index(joint.mimic.joint)
-                q = (
-                    self._cfg[mimic_joint_index] * joint.mimic.multiplier
-                    + joint.mimic.offset
-                )
-            else:
-                _logger.warning(
-                    f"Joint '{joint.name}' is supposed to mimic '{joint.mimic.joint}'. But this joint is not actuated - will assume (0.0 + offset)."
-                )
-                q = 0.0 + joint.mimic.offset
+        bounds = np.stack(
+            [
+                link_bounds[:, has_geometry, 0].min(axis=1),
+                link_bounds[:, has_geometry, 1].max(axis=1),
+            ],
+            axis=1,
+        )
+        return bounds, link_bounds
 
-        if joint.type in ["revolute", "prismatic", "continuous"]:
-            if q is None:
-                # Use internal cfg vector for forward kinematics
-                q = self.cfg[
-                    self.actuated_dof_indices[
-                        self.actuated_joint_names.index(joint.name)
-                    ]
-                ]
+    def surface_samples(self, num_points=2048, collision_geometry=False, seed=0):
+        """Sample points uniformly on the surface of the robot geometry.
+        The samples are drawn once per set of parameters and cached; the number of points per link is proportional to its surface area.
 
-            if joint.type == "prismatic":
-                matrix = origin @ tra.translation_matrix(q * joint.axis)
-            else:
-                if isinstance(q, float):
-                    matrix = origin @ tra.rotation_matrix(q, joint.axis)
-                else:
-                    matrix = origin @ tra.rotation_matrix(float(q.item()), joint.axis)
-                
-        else:
-            # this includes: floating, planar, fixed
-            matrix = origin
+        Args:
+            num_points (int, optional): Total number of points. Defaults to 2048.
+            collision_geometry (bool, optional): Whether to use the collision or visual geometry. Defaults to False.
+            seed (int, optional): Seed for sampling. Defaults to 0.
 
-        return matrix, q
+        Returns:
+            (num_points, 3) float: Points in the coordinates of the links they belong to.
+            (num_points, 3) float: Surface normals in link coordinates.
+            (num_points) int: Link indices (in the order of robot.links).
+        """
+        key = (num_points, collision_geometry, seed)
+        if key not in self._surface_samples:
+            meshes = [
+                (i, self._link_mesh(l, collision_geometry=collision_geometry))
+                for i, l in enumerate(self.robot.links)
+            ]
+            meshes = [(i, m) for i, m in meshes if m is not None]
+
+            points, normals, labels = [np.zeros((0, 3))], [np.zeros((0, 3))], []
+            if len(meshes) > 0:
+                rng = np.random.default_rng(seed)
+                areas = np.array([m.area for _, m in meshes])
+                counts = rng.multinomial(num_points, areas / areas.sum())
+                for (i, m), count in zip(meshes, counts):
+                    p, n = _sample_surface(m, count, rng)
+                    points.append(p)
+                    normals.append(n)
+                    labels.append(np.full(count, i))
+
+            self._surface_samples[key] = (
+                np.concatenate(points).astype(self._dtype),
+                np.concatenate(normals).astype(self._dtype),
+                np.concatenate(labels + [np.zeros(0)]).astype(np.int64),
+            )
+        return self._surface_samples[key]
 
-    def update_cfg(self, configuration):
-        """Update joint configuration of URDF; does forward kinematics.
+    def point_cloud_batch(
+        self,
+        cfgs,
+        num_points=2048,
+        collision_geometry=False,
+        return_normals=False,
+        return_labels=False,
+        seed=0,
+    ):
+        """Compute point clouds of the robot surface for a batch of configurations.
+        The points are cached surface samples (see surface_samples) transformed by the link poses, i.e., the same surface points are used for all configurations.
 
         Args:
-            configuration (dict, list[float], tuple[float] or np.ndarray): A mapping from joints or joint names to configuration values, or a list containing a value for each actuated joint.
+            cfgs ((N, num_dofs) float): Configurations of the actuated joints.
+            num_points (int, optional): Number of points per point cloud. Defaults to 2048.
+            collision_geometry (bool, optional): Whether to use the collision or visual geometry. Defaults to False.
+            return_normals (bool, optional): Whether to also return surface normals. Defaults to False.
+            return_labels (bool, optional): Whether to also return the link index of each point. Defaults to False.
+            seed (int, optional): Seed for sampling. Defaults to 0.
 
         Raises:
-            ValueError: Raised if dimensionality of configuration does not match number of actuated joints of URDF model.
-            TypeError: Raised if configuration is neither a dict, list, tuple or np.ndarray.
+            ValueError: Raised if the shape of cfgs doesn't match (N, num_dofs).
+
+        Returns:
+            (N, num_points, 3) float: Points w.r.t. the base link.
+            (N, num_points, 3) float: Surface normals w.r.t. the base link. Only if return_normals is True.
+            (num_points) int: Link indices (in the order of robot.links). Only if return_labels is True.
         """
-        joint_cfg = []
+        cfgs = np.asarray(cfgs, dtype=self._dtype)
+        if cfgs.ndim != 2 or cfgs.shape[1] != self.num_dofs:
+            raise ValueError(
+                f"Shape of configurations {cfgs.shape} doesn't match (N, {self.num_dofs})."
+            )
 
-        if isinstance(configuration, dict):
-            for joint in configuration:
-                if isinstance(joint, six.string_types):
-                    joint_cfg.append((self._joint_map[joint], configuration[joint]))
-                elif isinstance(joint, Joint):
-                    # TODO: Joint is not hashable; so this branch will not succeed
-                    joint_cfg.append((joint, configuration[joint]))
-        elif isinstance(configuration, (list, tuple, np.ndarray)):
-            if len(configuration) == len(self.robot.joints):
-                for joint, value in zip(self.robot.joints, configuration):
-                    joint_cfg.append((joint, value))
-            elif len(configuration) == self.num_actuated_joints:
-                for joint, value in zip(self._actuated_joints, configuration):
-                    joint_cfg.append((joint, value))
-            else:
-                raise ValueError(
-                    f"Dimensionality of configuration ({len(configuration)}) doesn't match number of all ({len(self.robot.joints)}) or actuated joints ({self.num_actuated_joints})."
-                )
-        else:
-            raise TypeError("Invalid type for configuration")
+        points, normals, labels = self.surface_samples(
+            num_points=num_points, collision_geometry=collision_geometry, seed=seed
+        )
+        link_poses = _kinematic_tree_forward_kinematics(self.kinematic_tree, cfgs)
+        poses = link_poses[:, labels]
 
-        # append all mimic joints in the update
-        for j, q in joint_cfg + [
-            (j, 0.0) for j in self.robot.joints if j.mimic is not None
-        ]:
-            matrix, joint_q = self._forward_kinematics_joint(j, q=q)
-
-            # update internal configuration vector - only consider actuated joints
-            if j.name in self.actuated_joint_names:
-                self._cfg[
-                    self.actuated_dof_indices[self.actuated_joint_names.index(j.name)]
-                ] = joint_q
-
-            if self._scene is not None:
-                self._scene.graph.update(
-                    frame_from=j.parent, frame_to=j.child, matrix=matrix
-                )
-            if self._scene_collision is not None:
-                self._scene_collision.graph.update(
-                    frame_from=j.parent, frame_to=j.child, matrix=matrix
-                )
+        result = [
+            np.einsum("npij,pj->npi", poses[..., :3, :3], points) + poses[..., :3, 3]
+        ]
+        if return_normals:
+            result.append(np.einsum("npij,pj->npi", poses[..., :3, :3], normals))
+        if return_labels:
+            result.append(labels)
+        return result[0] if len(result) == 1 else tuple(result)
 
-    def get_transform(self, frame_to, frame_from=None, collision_geometry=False):
-        """Get the transform from one frame to another.
+    def inverse_kinematics(
+        self,
+        target_link,
+        target_poses,
+        init_cfgs=None,
+        num_restarts=1,
+        max_iterations=100,
+        damping=5e-2,
+        max_step=1.0,
+        orientation_weight=1.0,
+        position_tolerance=1e-4,
+        orientation_tolerance=1e-3,
+        seed=None,
+    ):
+        """Solve inverse kinematics for a batch of target poses with damped least squares.
+        All targets and restarts are solved simultaneously. Joint limits are enforced by clipping after each step, mimic joints are taken into account by the Jacobian.
 
         Args:
-            frame_to (str): Node name.
-            frame_from (str, optional): Node name. If None it will be set to self.base_frame. Defaults to None.
-            collision_geometry (bool, optional): Whether to use the collision geometry scene graph (instead of the visual geometry). Defaults to False.
+            target_link (str): Name of the link that should reach the targets.
+            target_poses ((T, 4, 4) float): Target poses of the link w.r.t. the base link. A single (4, 4) pose is also accepted.
+            init_cfgs ((T, num_dofs) float or (num_dofs) float, optional): Initial configurations for the first restart. None means the current configuration. Defaults to None.
+            num_restarts (int, optional): Number of starts per target. All but the first start are sampled like sample_cfgs, i.e., within the joint limits and from [-pi, pi) for unlimited rotational DOFs; unlimited translational DOFs keep their initial value. All starts of a target stop once one of them converged, starts that stop improving are abandoned early. Defaults to 1.
+            max_iterations (int, optional): Maximum number of iterations. Defaults to 100.
+            damping (float, optional): Damping factor of the least squares step. Defaults to 5e-2.
+            max_step (float, optional): Maximum change of any DOF per iteration; larger steps are scaled down. Defaults to 1.0.
+            orientation_weight (float, optional): Weight of the orientation error relative to the position error. Zero solves for the position only. Defaults to 1.0.
+            position_tolerance (float, optional): Position error (in meters) below which a solution is considered converged. Defaults to 1e-4.
+            orientation_tolerance (float, optional): Orientation error (in radians) below which a solution is considered converged. Ignored if orientation_weight is zero. Defaults to 1e-3.
+            seed (int, optional): Seed for sampling restarts. Defaults to None.
 
         Raises:
-            ValueError: Raised if scene graph wasn't constructed during intialization.
+            ValueError: Raised if the shape of target_poses or init_cfgs doesn't match.
 
         Returns:
-            (4, 4) float: Homogeneous transformation matrix
+            (T, num_dofs) float: Best solution for each target.
+            (T, 2) float: Remaining position (in meters) and orientation (in radians) error for each target.
+            (T) bool: Whether the solution for each target converged.
         """
-        if collision_geometry:
-            if self._scene_collision is None:
-                raise ValueError(
-                    "No collision scene available. Use build_collision_scene_graph=True during loading."
-                )
-            else:
-                return self._scene_collision.graph.get(
-                    frame_to=frame_to, frame_from=frame_from
-                )[0]
-        else:
-            if self._scene is None:
-                raise ValueError(
-                    "No scene available. Use build_scene_graph=True during loading."
-                )
-            else:
-                return self._scene.graph.get(frame_to=frame_to, frame_from=frame_from)[
-                    0
-                ]
+        target_poses = np.asarray(target_poses, dtype=self._dtype)
+        single = target_poses.ndim == 2
+        if single:
+            target_poses = target_poses[np.newaxis]
+        if target_poses.ndim != 3 or target_poses.shape[1:] != (4, 4):
+            raise ValueError(
+                f"Shape of target poses {target_poses.shape} doesn't match (T, 4, 4)."
+            )
+        num_targets = len(target_poses)
+
+        if init_cfgs is None:
+            init_cfgs = self._cfg
+        init_cfgs = np.broadcast_to(
+            np.asarray(init_cfgs, dtype=self._dtype), (num_targets, self.num_dofs)
+        )
+
+        # restarts are sampled like sample_cfgs, except for unlimited translational DOFs
+        lower, upper = self._lower_limits, self._upper_limits
+        sampled = self._sample_lower < self._sample_upper
+        cfgs = np.repeat(init_cfgs[:, np.newaxis], num_restarts, axis=1)
+        cfgs[:, 1:] = np.where(
+            sampled,
+            self.sample_cfgs(num_targets * (num_restarts - 1), seed=seed).reshape(
+                num_targets, num_restarts - 1, self.num_dofs
+            ),
+            cfgs[:, 1:],
+        )
+        cfgs = np.clip(cfgs.reshape(-1, self.num_dofs), lower, upper)
+        targets = np.repeat(target_poses, num_restarts, axis=0)
+
+        tree = self.kinematic_tree
+        link = tree.link_index[target_link]
+        weights = np.array([1.0] * 3 + [orientation_weight] * 3, dtype=self._dtype)
+        regularization = damping**2 * np.eye(6, dtype=self._dtype)
+
+        errors = np.empty((len(cfgs), 2), dtype=self._dtype)
+        converged = np.zeros(len(cfgs), dtype=bool)
+        solved = np.zeros(num_targets, dtype=bool)
+        best_cost = np.full(len(cfgs), np.inf, dtype=self._dtype)
+        stalled = np.zeros(len(cfgs), dtype=np.int64)
+        active = np.arange(len(cfgs))
+        for iteration in range(max_iterations + 1):
+            link_poses = _kinematic_tree_forward_kinematics(tree, cfgs[active])
+            error = np.concatenate(
+                [
+                    targets[active, :3, 3] - link_poses[:, link, :3, 3],
+                    _batch_orientation_error(targets[active], link_poses[:, link]),
+                ],
+                axis=-1,
+            )
+            errors[active, 0] = np.linalg.norm(error[:, :3], axis=-1)
+            errors[active, 1] = np.linalg.norm(error[:, 3:], axis=-1)
+
+            done = errors[active, 0] < position_tolerance
+            if orientation_weight != 0.0:
+                done &= errors[active, 1] < orientation_tolerance
+            converged[active[done]] = True
+            solved[active[done] // num_restarts] = True
+
+            # stop all restarts of solved targets and restarts that stopped improving
+            cost = errors[active, 0] + orientation_weight * errors[active, 1]
+            improved = cost < (1.0 - 1e-3) * best_cost[active]
+            best_cost[active[improved]] = cost[improved]
+            stalled[active] = np.where(improved, 0, stalled[active] + 1)
+            keep = (
+                ~done
+                & ~solved[active // num_restarts]
+                & (stalled[active] < _IK_PATIENCE)
+            )
+            active = active[keep]
+            link_poses = link_poses[keep]
+            if len(active) == 0 or iteration == max_iterations:
+                break
+
+            jacobian = weights[:, np.newaxis] * _kinematic_tree_jacobian(
+                tree, link_poses, link
+            )
+            error = weights * error[keep]
+            step = np.linalg.solve(
+                jacobian @ jacobian.transpose(0, 2, 1) + regularization,
+                error[..., np.newaxis],
+            )
+            step = (jacobian.transpose(0, 2, 1) @ step)[..., 0]
+            step *= np.minimum(
+                1.0,
+                max_step / np.maximum(np.abs(step).max(axis=-1, keepdims=True), 1e-12),
+            )
+            cfgs[active] = np.clip(cfgs[active] + step, lower, upper)
+
+        # pick the best restart per target, converged ones first
+        cost = errors[:, 0] + orientation_weight * errors[:, 1]
+        cost = np.where(converged, cost, cost + cost.max() + 1.0)
+        cost = cost.reshape(num_targets, num_restarts)
+        best = np.arange(num_targets) * num_restarts + np.argmin(cost, axis=1)
+
+        solutions, residuals, converged = cfgs[best], errors[best], converged[best]
+        if single:
+            return solutions[0], residuals[0], converged[0]
+        return solutions, residuals, converged
 
     def _link_mesh(self, link, collision_geometry=True):
-        geometries = link.collisions if collision_geometry else link.visuals
+        """Merge the geometry of a link into a single mesh.
 
-        if len(geometries) == 0:
-            return None
+        Args:
+            link (Link): Link.
+            collision_geometry (bool, optional): Whether to use the collision or visual geometry. Defaults to True.
+
+        Returns:
+            trimesh.Trimesh: Mesh in link coordinates, None if the link has no geometry.
+        """
+        geometries = link.collisions if collision_geometry else link.visuals
 
         meshes = []
         for g in geometries:
-            for m in g.geometry.meshes:
-                m = m.copy()
-                pose = g.origin
-                if g.geometry.mesh is not None:
-                    if g.geometry.mesh.scale is not None:
-                        S = np.eye(4)
-                        S[:3, :3] = np.diag(g.geometry.mesh.scale)
-                        pose = pose.dot(S)
-                m.apply_transform(pose)
-                meshes.append(m)
+            if g.geometry is None:
+                continue
+            new_s = self._geometry2trimeshscene(
+                geometry=g.geometry,
+                load_file=True,
+                force_mesh=True,
+                skip_materials=True,
+            )
+            if new_s is None:
+                continue
+
+            origin = g.origin if g.origin is not None else np.eye(4)
+            for name in new_s.graph.nodes_geometry:
+                T, geom_name = new_s.graph.get(name)
+                geom = new_s.geometry[geom_name]
+                if isinstance(geom, trimesh.Trimesh) and len(geom.faces) > 0:
+                    m = trimesh.Trimesh(
+                        vertices=geom.vertices, faces=geom.faces, process=False
+                    )
+                    meshes.append(m.apply_transform(origin @ T))
+
         if len(meshes) == 0:
             return None
-        self._collision_mesh = meshes[0] + meshes[1:]
-        return self._collision_mesh
+        return trimesh.util.concatenate(meshes)
+
+    def _geometry_cache_key(self, collision_geometry, *args):
+        """Hash the geometry of all links and the files it references.
+
+        Args:
+            collision_geometry (bool): Whether to use the collision or visual geometry.
+            *args: Additional values that determine the cached result.
+
+        Returns:
+            str: Hexadecimal digest.
+        """
+        h = hashlib.sha1(repr(args).encode())
+        for l in self.robot.links:
+            geometries = l.collisions if collision_geometry else l.visuals
+            h.update(f"{l.name}{geometries}".encode())
+            for g in geometries:
+                if g.geometry is not None and g.geometry.mesh is not None:
+                    fname = self._filename_handler(fname=g.geometry.mesh.filename)
+                    if os.path.isfile(fname):
+                        stat = os.stat(fname)
+                        h.update(f"{fname}{stat.st_mtime_ns}{stat.st_size}".encode())
+        return h.hexdigest()
+
+    def _load_mesh_file(self, fname, force_mesh, skip_materials, mesh_files=None):
+        """Load a mesh file as a scene, using the process-wide MESH_CACHE or the mesh cache directory.
+
+        Args:
+            fname (str): Name of an existing mesh file.
+            force_mesh (bool): Whether to load the file as a single mesh.
+            skip_materials (bool): Whether to skip loading materials.
+            mesh_files (dict, optional): Files loaded in advance by _load_mesh_files or preload. Defaults to None.
+
+        Returns:
+            trimesh.Scene: Scene with the geometry of the file.
+        """
+        entry = (
+            None
+            if mesh_files is None
+            else mesh_files.get((fname, force_mesh, skip_materials))
+        )
+        if entry is not None:
+            # files passed to preload() are still being loaded in the background
+            if isinstance(entry[0], Future):
+                entry[0] = entry[0].result()
+
+            # the last reference gets the loaded scene, all others a copy
+            entry[1] -= 1
+            return entry[0] if entry[1] == 0 else _copy_scene(entry[0])
+
+        return _load_cached_mesh_file(
+            fname, force_mesh, skip_materials, cache_dir=self._mesh_cache_dir
+        )
+
+    def _mesh_file_keys(self, use_collision_geometry, force_mesh, links=None):
+        """Resolve the mesh files referenced by links.
+
+        Args:
+            use_collision_geometry (bool): Whether to use the collision or visual geometry.
+            force_mesh (bool): Whether files are loaded as single meshes.
+            links (list[str], optional): Names of the links. None means all links. Defaults to None.
+
+        Returns:
+            list[tuple]: (file name, force_mesh, skip_materials) for every reference to an existing file, in link order.
+        """
+        keys = []
+        for l in self.robot.links:
+            if links is not None and l.name not in links:
+                continue
+            for g in l.collisions if use_collision_geometry else l.visuals:
+                if g.geometry is None or g.geometry.mesh is None:
+                    continue
+                fname = self._filename_handler(fname=g.geometry.mesh.filename)
+                if os.path.isfile(fname):
+                    keys.append((fname, force_mesh, use_collision_geometry))
+        return keys
+
+    def _load_mesh_files(self, keys, num_workers, use_processes=False):
+        """Load mesh files concurrently.
+
+        Args:
+            keys (list[tuple]): (file name, force_mesh, skip_materials) for every reference to a file; duplicates are loaded once.
+            num_workers (int): Number of threads or processes.
+            use_processes (bool, optional): Whether to use a process pool instead of a thread pool. Defaults to False.
+
+        Returns:
+            dict: Mapping from key to a list of the loaded scene and the number of references.
+        """
+        mesh_files = {}
+        pending = []
+        for key in keys:
+            if key in mesh_files:
+                mesh_files[key][1] += 1
+                continue
+
+            cache_key = (
+                MeshCache.key(*key)
+                if MESH_CACHE.max_bytes > 0 and self._mesh_cache_dir is None
+                else None
+            )
+            scene = None if cache_key is None else MESH_CACHE.get(cache_key)
+            if scene is None:
+                pending.append((key, cache_key))
+            mesh_files[key] = [scene, 1]
+
+        if len(pending) == 0:
+            return mesh_files
+
+        executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with executor(max_workers=num_workers) as ex:
+            futures = [
+                ex.submit(_read_mesh_file, *key, self._mesh_cache_dir)
+                for key, _ in pending
+            ]
+            for (key, cache_key), f in zip(pending, futures):
+                mesh_files[key][0] = f.result()
+                if cache_key is not None:
+                    MESH_CACHE.put(cache_key, mesh_files[key][0])
 
-    def _geometry2trimeshscene(self, geometry, load_file, force_mesh, skip_materials):
+        return mesh_files
+
+    def _geometry2trimeshscene(
+        self, geometry, load_file, force_mesh, skip_materials, mesh_files=None
+    ):
         new_s = None
         if geometry.box is not None:
             new_s = trimesh.primitives.Box(extents=geometry.box.size).scene()
@@ -1210,35 +4166,12 @@ class URDF:
             if os.path.isfile(new_filename):
                 _logger.debug(f"Loading {geometry.mesh.filename} as {new_filename}")
 
-                if force_mesh:
-                    new_g = trimesh.load(
-                        new_filename,
-                        ignore_broken=True,
-                        force="mesh",
-                        skip_materials=skip_materials,
-                    )
-
-                    # add original filename
-                    if "file_path" not in new_g.metadata:
-                        new_g.metadata["file_path"] = os.path.abspath(new_filename)
-                        new_g.metadata["file_name"] = os.path.basename(new_filename)
-
-                    new_s = trimesh.Scene()
-                    new_s.add_geometry(new_g)
-                else:
-                    new_s = trimesh.load(
-                        new_filename,
-                        ignore_broken=True,
-                        force="scene",
-                        skip_materials=skip_materials,
-                    )
-
-                    if "file_path" in new_s.metadata:
-                        for i, (_, geom) in enumerate(new_s.geometry.items()):
-                            if "file_path" not in geom.metadata:
-                                geom.metadata["file_path"] = new_s.metadata["file_path"]
-                                geom.metadata["file_name"] = new_s.metadata["file_name"]
-                                geom.metadata["file_element"] = i
+                new_s = self._load_mesh_file(
+                    new_filename,
+                    force_mesh=force_mesh,
+                    skip_materials=skip_materials,
+                    mesh_files=mesh_files,
+                )
 
                 # scale mesh appropriately
                 if geometry.mesh.scale is not None:
@@ -1263,22 +4196,31 @@ class URDF:
         force_mesh,
         force_single_geometry,
         skip_materials,
+        mesh_files=None,
+        geom_names=None,
+        reserved_names=None,
     ):
         if force_single_geometry:
             tmp_scene = trimesh.Scene(base_frame=link_name)
 
+        if geom_names is None:
+            geom_names = [v.name for v in geometries]
+
         first_geom_name = None
+        first_geom = True
 
-        for v in geometries:
+        for v, v_name in zip(geometries, geom_names):
             if v.geometry is not None:
-                if first_geom_name is None:
-                    first_geom_name = v.name
+                if first_geom:
+                    first_geom_name = v_name
+                    first_geom = False
 
                 new_s = self._geometry2trimeshscene(
                     geometry=v.geometry,
                     load_file=load_geometry,
                     force_mesh=force_mesh,
                     skip_materials=skip_materials,
+                    mesh_files=mesh_files,
                 )
                 if new_s is not None:
                     origin = v.origin if v.origin is not None else np.eye(4)
@@ -1297,15 +4239,24 @@ class URDF:
                                 transform=origin @ T,
                             )
                     else:
-                        for name in new_s.graph.nodes_geometry:
+                        count = 0
+                        for i, name in enumerate(new_s.graph.nodes_geometry):
                             T, geom_name = new_s.graph.get(name)
                             geom = new_s.geometry[geom_name]
 
+                            new_geom_name = v_name if i == 0 else v.name
+                            if i > 0 and reserved_names is not None:
+                                # skip names of other elements
+                                count += 1
+                                while f"{v_name}_{count}" in reserved_names:
+                                    count += 1
+                                new_geom_name = f"{v_name}_{count}"
+
                             if isinstance(v, Visual):
                                 apply_visual_color(geom, v, self._material_map)
                             s.add_geometry(
                                 geometry=geom,
-                                geom_name=v.name,
+                                geom_name=new_geom_name,
                                 parent_node_name=link_name,
                                 transform=origin @ T,
                             )
@@ -1318,14 +4269,72 @@ class URDF:
                 transform=np.eye(4),
             )
 
+    def _reserve_geometry_names(self, geometries, force_single_geometry, taken):
+        """Determine the scene names of geometries before they are loaded.
+
+        Names follow trimesh's rules assuming one geometry per element: the element
+        name, the mesh file name, or geometry_<count>, made unique. They match the
+        names of an eager load only if every mesh file holds a single geometry.
+        Further geometries of a file are named <name>_<count> when the file is loaded,
+        skipping reserved names, see _add_geometries_to_scene.
+
+        Args:
+            geometries (list[Visual] or list[Collision]): Elements of a link.
+            force_single_geometry (bool): Whether the elements are merged into a single geometry.
+            taken (set[str]): Names reserved so far, updated in place.
+
+        Returns:
+            list[str]: One name per element, None for elements without a name of their own.
+        """
+        names = [None] * len(geometries)
+        indices = []
+        for i, v in enumerate(geometries):
+            if v.geometry is None:
+                continue
+            if v.geometry.mesh is not None:
+                fname = self._filename_handler(fname=v.geometry.mesh.filename)
+                if not os.path.isfile(fname):
+                    continue
+                names[i] = v.name or os.path.basename(fname)
+            else:
+                names[i] = v.name
+            indices.append(i)
+
+        if force_single_geometry and len(indices) > 0:
+            first = next(i for i, v in enumerate(geometries) if v.geometry is not None)
+            name = geometries[first].name
+            if name is None and len(indices) == 1:
+                name = names[indices[0]]
+            names = [None] * len(geometries)
+            names[first] = name
+            indices = [first]
+
+        for i in indices:
+            name = names[i] or f"geometry_{len(taken)}"
+            if name in taken:
+                count = 1
+                while f"{name}_{count}" in taken:
+                    count += 1
+                name = f"{name}_{count}"
+            names[i] = name
+            taken.add(name)
+
+        return names
+
     def _create_scene(
         self,
         use_collision_geometry=False,
         load_geometry=True,
         force_mesh=False,
         force_single_geometry_per_link=False,
+        mesh_files=None,
+        lazy_links=(),
+        lazy_geometry_names=None,
+        reserved_geometry_names=None,
     ):
         s = trimesh.scene.Scene(base_frame=self._base_link)
+        if reserved_geometry_names is None:
+            reserved_geometry_names = set()
 
         for j in self.robot.joints:
             matrix, _ = self._forward_kinematics_joint(j)
@@ -1340,6 +4349,19 @@ class URDF:
                 s.graph.update(frame_from=s.graph.base_frame, frame_to=l.name)
 
             meshes = l.collisions if use_collision_geometry else l.visuals
+
+            geom_names = None
+            if len(lazy_links) > 0:
+                # names do not depend on the order in which lazy links are loaded
+                geom_names = self._reserve_geometry_names(
+                    meshes,
+                    force_single_geometry=force_single_geometry_per_link,
+                    taken=reserved_geometry_names,
+                )
+            if l.name in lazy_links:
+                lazy_geometry_names[l.name] = geom_names
+                continue
+
             self._add_geometries_to_scene(
                 s,
                 geometries=meshes,
@@ -1348,6 +4370,9 @@ class URDF:
                 force_mesh=force_mesh,
                 force_single_geometry=force_single_geometry_per_link,
                 skip_materials=use_collision_geometry,
+                mesh_files=mesh_files,
+                geom_names=geom_names,
+                reserved_names=None if geom_names is None else reserved_geometry_names,
             )
 
         return s
@@ -1413,7 +4438,7 @@ class URDF:
 
             result.append(
                 (
-                    self._scene.graph.get(root_link.name)[0],
+                    self.get_transform(root_link.name),
                     URDF(robot=new_robot, **kwargs),
                 )
             )
@@ -0,0 +1,50 @@
+import os
+import trimesh
+
+from yourdfpy import URDF
+from yourdfpy.bake import main
+
+__author__ = "Clemens Eppner"
+__copyright__ = "Clemens Eppner"
+__license__ = "MIT"
+
+
+def test_main(tmp_path):
+    """CLI Tests"""
+    package_dir = tmp_path / "robot_description"
+    os.makedirs(package_dir / "meshes")
+    os.makedirs(package_dir / "urdf")
+    trimesh.creation.box().export(str(package_dir / "meshes" / "box.stl"))
+    trimesh.creation.icosphere().export(str(package_dir / "meshes" / "sphere.stl"))
+    (package_dir / "urdf" / "robot.urdf").write_text("""
+        <robot name="robot">
+            <link name="link">
+                <visual>
+                    <geometry>
+                        <mesh filename="../meshes/box.stl" />
+                    </geometry>
+                </visual>
+                <collision>
+                    <geometry>
+                        <mesh filename="../meshes/sphere.stl" />
+                    </geometry>
+                </collision>
+            </link>
+        </robot>
+        """)
+
+    cache_dir = str(tmp_path / "cache")
+    main([str(package_dir), "--collision", "-o", cache_dir])
+    assert len(os.listdir(cache_dir)) == 2
+
+    # the baked arrays are memory-mapped instead of decoding the files again
+    urdf_model = URDF.load(
+        str(package_dir / "urdf" / "robot.urdf"),
+        build_collision_scene_graph=True,
+        load_collision_meshes=True,
+        mesh_cache_dir=cache_dir,
+    )
+    assert len(os.listdir(cache_dir)) == 2
+    assert len(urdf_model.collision_scene.geometry) == 1
+    geometry = list(urdf_model.scene.geometry.values())
+    assert len(geometry) == 1 and not geometry[0].vertices.flags.writeable
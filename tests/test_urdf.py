@@ -1,6 +1,10 @@
 import pytest
 import os
 import io
+import concurrent.futures
+import numpy as np
+import trimesh
+import trimesh.transformations as tra
 
 from yourdfpy import urdf
 
@@ -156,3 +160,1218 @@ def test_geometric_primitives():
         )
         assert urdf_model.link_map["link_0"].visuals[2].geometry.cylinder.radius == 11
         assert urdf_model.link_map["link_0"].visuals[2].geometry.cylinder.length == 4
+
+
+def test_forward_kinematics_batch():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, load_meshes=False)
+
+    rng = np.random.default_rng(0)
+    cfgs = rng.uniform(-1.0, 1.0, size=(5, urdf_model.num_dofs))
+
+    poses = urdf_model.forward_kinematics_batch(cfgs)
+    assert poses.shape == (5, len(urdf_model.robot.links), 4, 4)
+
+    for cfg, cfg_poses in zip(cfgs, poses):
+        urdf_model.update_cfg(cfg)
+        for link, pose in zip(urdf_model.robot.links, cfg_poses):
+            assert np.allclose(urdf_model.get_transform(link.name), pose)
+
+
+def test_forward_kinematics_batch_wrong_shape():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, load_meshes=False)
+
+    with pytest.raises(ValueError):
+        urdf_model.forward_kinematics_batch(np.zeros((3, urdf_model.num_dofs + 1)))
+
+
+def test_kinematic_tree():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, build_scene_graph=False, load_meshes=False)
+
+    tree = urdf_model.kinematic_tree
+    assert tree.link_names == [l.name for l in urdf_model.robot.links]
+    assert len(tree.joint_names) == len(urdf_model.robot.joints)
+
+    # parent link of each joint is placed by a preceding joint or a root link
+    placed = set()
+    for parent, child in zip(tree.parent, tree.child):
+        assert parent in placed or parent not in tree.child
+        placed.add(child)
+
+    # subtrees are contiguous
+    hand = tree.joint_names.index("panda_hand_joint")
+    assert set(tree.joint_names[hand : tree.subtree_end[hand]]) == {
+        "panda_hand_joint",
+        "panda_finger_joint1",
+        "panda_finger_joint2",
+    }
+
+
+def test_get_transform_without_scene_graph():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, load_meshes=False)
+    urdf_model_no_scene = urdf.URDF.load(
+        urdf_fname, build_scene_graph=False, load_meshes=False
+    )
+    assert urdf_model_no_scene.scene is None
+
+    cfg = np.linspace(-1.0, 1.0, urdf_model.num_dofs)
+    urdf_model.update_cfg(cfg)
+    urdf_model_no_scene.update_cfg(cfg)
+
+    for frame_to, frame_from in [
+        ("panda_hand", None),
+        ("panda_rightfinger", "panda_link3"),
+        ("panda_link0", "tool_link"),
+    ]:
+        expected = urdf_model.scene.graph.get(frame_to=frame_to, frame_from=frame_from)[
+            0
+        ]
+        assert np.allclose(urdf_model.get_transform(frame_to, frame_from), expected)
+        assert np.allclose(
+            urdf_model_no_scene.get_transform(frame_to, frame_from), expected
+        )
+
+
+def test_update_cfg_incremental():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, load_meshes=False)
+
+    cfg = np.linspace(-1.0, 1.0, urdf_model.num_dofs)
+    urdf_model.update_cfg(cfg)
+
+    updated_edges = []
+    graph_update = urdf_model.scene.graph.update
+
+    def record_update(frame_from, frame_to, **kwargs):
+        updated_edges.append((frame_from, frame_to))
+        graph_update(frame_from=frame_from, frame_to=frame_to, **kwargs)
+
+    urdf_model.scene.graph.update = record_update
+
+    # unchanged joints are skipped
+    urdf_model.update_cfg({"panda_joint1": cfg[0], "panda_finger_joint1": 0.03})
+    assert updated_edges == [
+        ("panda_hand", "panda_leftfinger"),
+        ("panda_hand", "panda_rightfinger"),
+    ]
+    assert (
+        urdf_model.cfg[urdf_model.actuated_joint_names.index("panda_finger_joint1")]
+        == 0.03
+    )
+
+    # only the subtree below the changed joint is recomputed
+    urdf_model.get_transform("panda_hand")
+    urdf_model.update_cfg({"panda_joint7": 0.5})
+    dirty_joints = [
+        name
+        for name, dirty in zip(
+            urdf_model.kinematic_tree.joint_names, urdf_model._dirty_joints
+        )
+        if dirty
+    ]
+    assert set(dirty_joints) == {
+        "panda_joint7",
+        "panda_joint8",
+        "panda_hand_joint",
+        "panda_finger_joint1",
+        "panda_finger_joint2",
+        "tool_joint",
+    }
+
+    expected = urdf_model.forward_kinematics_batch(urdf_model.cfg[np.newaxis])[0]
+    for link, pose in zip(urdf_model.robot.links, expected):
+        assert np.allclose(urdf_model.get_transform(link.name), pose)
+        assert np.allclose(urdf_model.scene.graph.get(link.name)[0], pose)
+
+
+def test_jacobian():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, build_scene_graph=False, load_meshes=False)
+    link_index = urdf_model.kinematic_tree.link_index
+
+    rng = np.random.default_rng(1)
+    cfgs = rng.uniform(-1.0, 1.0, size=(3, urdf_model.num_dofs))
+    eps = 1e-6
+
+    for link in ["panda_hand", "panda_rightfinger", "panda_link0"]:
+        jacobians = urdf_model.jacobian_batch(link, cfgs)
+        assert jacobians.shape == (3, 6, urdf_model.num_dofs)
+
+        # compare against finite differences
+        for cfg, jacobian in zip(cfgs, jacobians):
+            pose = urdf_model.forward_kinematics_batch(cfg[np.newaxis])[
+                0, link_index[link]
+            ]
+            for i in range(urdf_model.num_dofs):
+                cfg_eps = cfg.copy()
+                cfg_eps[i] += eps
+                pose_eps = urdf_model.forward_kinematics_batch(cfg_eps[np.newaxis])[
+                    0, link_index[link]
+                ]
+                linear = (pose_eps[:3, 3] - pose[:3, 3]) / eps
+                skew = (pose_eps[:3, :3] - pose[:3, :3]) @ pose[:3, :3].T / eps
+                angular = np.array([skew[2, 1], skew[0, 2], skew[1, 0]])
+                assert np.allclose(jacobian[:3, i], linear, atol=1e-5)
+                assert np.allclose(jacobian[3:, i], angular, atol=1e-5)
+
+    urdf_model.update_cfg(cfgs[0])
+    assert np.allclose(
+        urdf_model.jacobian("panda_rightfinger"),
+        urdf_model.jacobian("panda_rightfinger", cfgs[0]),
+    )
+
+
+def test_update_cfg_array():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, load_meshes=False)
+    urdf_model_dict = urdf.URDF.load(urdf_fname, load_meshes=False)
+
+    cfg = np.linspace(-1.0, 1.0, urdf_model.num_dofs)
+    urdf_model.update_cfg_array(cfg)
+    urdf_model_dict.update_cfg(
+        {name: value for name, value in zip(urdf_model.actuated_joint_names, cfg)}
+    )
+
+    assert np.array_equal(urdf_model.cfg, urdf_model_dict.cfg)
+    for link in urdf_model.link_map:
+        assert np.allclose(
+            urdf_model.get_transform(link), urdf_model_dict.get_transform(link)
+        )
+        assert np.allclose(
+            urdf_model.scene.graph.get(link)[0], urdf_model_dict.get_transform(link)
+        )
+
+    with pytest.raises(ValueError):
+        urdf_model.update_cfg_array(np.zeros(urdf_model.num_dofs + 1))
+
+    # transforms are updated in place over consecutive configurations, also if only
+    # some of the revolute or prismatic joints move
+    cfgs = urdf_model.sample_cfgs(5, seed=0)
+    cfgs[2:, ::2] = cfgs[1, ::2]
+    cfgs[3:, -1] = cfgs[2, -1]
+    poses = urdf_model.forward_kinematics_batch(cfgs)
+    for cfg, expected in zip(cfgs, poses):
+        urdf_model.update_cfg_array(cfg)
+        for i, link in enumerate(urdf_model.link_map):
+            assert np.allclose(urdf_model.get_transform(link), expected[i])
+
+    # returned names are a copy
+    urdf_model.actuated_joint_names.clear()
+    assert len(urdf_model.actuated_joint_names) == urdf_model.num_actuated_joints
+
+
+def _create_floating_planar_urdf(**kwargs):
+    urdf_str = """
+    <robot name="floating_planar_test">
+        <link name="world" />
+        <link name="base" />
+        <link name="slider" />
+        <link name="arm" />
+        <joint name="base_joint" type="floating">
+            <parent link="world" />
+            <child link="base" />
+            <origin xyz="0 0 0.5" rpy="0 0 0.3" />
+        </joint>
+        <joint name="slider_joint" type="planar">
+            <parent link="base" />
+            <child link="slider" />
+            <origin xyz="0.1 0 0" rpy="0.2 0 0" />
+            <axis xyz="1 0 0" />
+        </joint>
+        <joint name="arm_joint" type="revolute">
+            <parent link="slider" />
+            <child link="arm" />
+            <origin xyz="0 0 0.2" />
+            <axis xyz="0 1 0" />
+            <limit lower="-1" upper="1" effort="1" velocity="1" />
+        </joint>
+    </robot>
+    """
+    with io.StringIO(urdf_str) as f:
+        return urdf.URDF.load(f, **kwargs)
+
+
+def test_floating_and_planar_joints():
+    urdf_model = _create_floating_planar_urdf()
+    assert urdf_model.num_dofs == 9
+    assert urdf_model.actuated_dof_indices == [
+        [0, 1, 2, 3, 4, 5],
+        [6, 7],
+        [8],
+    ]
+    assert len(urdf_model.center_cfg) == urdf_model.num_dofs
+
+    cfg = np.array([0.1, -0.2, 0.3, 0.4, -0.5, 0.6, 0.7, -0.8, 0.9])
+    base = urdf.tra.compose_matrix(
+        translate=[0, 0, 0.5], angles=[0, 0, 0.3]
+    ) @ urdf.tra.compose_matrix(translate=cfg[:3], angles=cfg[3:6])
+    # plane perpendicular to the x-axis
+    slider = (
+        base
+        @ urdf.tra.compose_matrix(translate=[0.1, 0, 0], angles=[0.2, 0, 0])
+        @ urdf.tra.translation_matrix(
+            np.array([0, 0, -1.0]) * cfg[6] + np.array([0, 1.0, 0]) * cfg[7]
+        )
+    )
+    arm = (
+        slider
+        @ urdf.tra.translation_matrix([0, 0, 0.2])
+        @ urdf.tra.rotation_matrix(cfg[8], [0, 1, 0])
+    )
+
+    poses = urdf_model.forward_kinematics_batch(cfg[np.newaxis])[0]
+    assert poses.shape == (4, 4, 4)
+    assert np.allclose(poses[1], base)
+    assert np.allclose(poses[2], slider)
+    assert np.allclose(poses[3], arm)
+
+    urdf_model.update_cfg(cfg)
+    for link, pose in zip(["base", "slider", "arm"], [base, slider, arm]):
+        assert np.allclose(urdf_model.get_transform(link), pose)
+        assert np.allclose(urdf_model.scene.graph.get(link)[0], pose)
+
+    # Jacobian columns of the floating joint's translation are the axes of its origin
+    jacobian = urdf_model.jacobian("arm", cfg)
+    assert jacobian.shape == (6, 9)
+    assert np.allclose(jacobian[:3, :3], urdf.tra.euler_matrix(0, 0, 0.3)[:3, :3])
+    assert np.allclose(jacobian[3:, :3], 0.0)
+
+
+def test_update_cfg_ambiguous_dofs():
+    # as many joints as DOFs: a planar and a fixed joint
+    urdf_str = """
+    <robot name="planar_fixed_test">
+        <link name="base" />
+        <link name="slider" />
+        <link name="tool" />
+        <joint name="slider_joint" type="planar">
+            <parent link="base" />
+            <child link="slider" />
+            <axis xyz="0 0 1" />
+        </joint>
+        <joint name="tool_joint" type="fixed">
+            <parent link="slider" />
+            <child link="tool" />
+            <origin xyz="0 0 0.1" />
+        </joint>
+    </robot>
+    """
+    with io.StringIO(urdf_str) as f:
+        urdf_model = urdf.URDF.load(f)
+    assert urdf_model.num_dofs == len(urdf_model.robot.joints) == 2
+
+    urdf_model.update_cfg([1.0, 2.0])
+    assert np.allclose(urdf_model.cfg, [1.0, 2.0])
+    assert np.allclose(
+        urdf_model.get_transform("tool"),
+        urdf_model.forward_kinematics_batch([[1.0, 2.0]])[0, 2],
+    )
+
+    # per-joint values are still accepted
+    urdf_model.update_cfg([[3.0, 4.0], 0.0])
+    assert np.allclose(urdf_model.cfg, [3.0, 4.0])
+
+
+def test_get_transform_cache():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, build_scene_graph=False, load_meshes=False)
+
+    cfg = np.linspace(-1.0, 1.0, urdf_model.num_dofs)
+    version = urdf_model.cfg_version
+    urdf_model.update_cfg(cfg)
+    assert urdf_model.cfg_version == version + 1
+
+    transform = urdf_model.get_transform("panda_hand", "panda_link2")
+    assert ("panda_hand", "panda_link2") in urdf_model._transform_cache
+
+    # returned matrices are copies of the cached ones
+    transform[:] = 0.0
+    assert np.allclose(
+        urdf_model.get_transform("panda_hand", "panda_link2"),
+        np.linalg.inv(urdf_model.get_transform("panda_link2"))
+        @ urdf_model.get_transform("panda_hand"),
+    )
+
+    # setting the same configuration doesn't invalidate the cache
+    urdf_model.update_cfg(cfg)
+    assert urdf_model.cfg_version == version + 1
+    assert ("panda_hand", "panda_link2") in urdf_model._transform_cache
+
+    urdf_model.update_cfg({"panda_joint3": 0.0})
+    assert urdf_model.cfg_version == version + 2
+    urdf_model.get_transform("panda_hand")
+    assert list(urdf_model._transform_cache) == [("panda_hand", None)]
+
+
+def test_link_poses():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, build_scene_graph=False, load_meshes=False)
+    urdf_model.update_cfg(np.linspace(-1.0, 1.0, urdf_model.num_dofs))
+
+    poses, rows = urdf_model.link_poses()
+    assert poses.shape == (len(urdf_model.robot.links), 4, 4)
+    for link in urdf_model.robot.links:
+        assert np.allclose(poses[rows[link.name]], urdf_model.get_transform(link.name))
+
+    poses, rows = urdf_model.link_poses(
+        frame_from="panda_link3", links=["tool_link", "panda_link0"]
+    )
+    assert poses.shape == (2, 4, 4)
+    assert rows == {"tool_link": 0, "panda_link0": 1}
+    for link in ["tool_link", "panda_link0"]:
+        assert np.allclose(
+            poses[rows[link]], urdf_model.get_transform(link, "panda_link3")
+        )
+
+
+def test_mimic_chain():
+    urdf_str = """
+    <robot name="mimic_chain_test">
+        <link name="link_0" />
+        <link name="link_1" />
+        <link name="link_2" />
+        <link name="link_3" />
+        <joint name="joint_1" type="revolute">
+            <parent link="link_0" />
+            <child link="link_1" />
+            <axis xyz="0 0 1" />
+            <limit lower="-1" upper="1" effort="1" velocity="1" />
+        </joint>
+        <joint name="joint_2" type="revolute">
+            <parent link="link_0" />
+            <child link="link_2" />
+            <axis xyz="0 0 1" />
+            <limit lower="-1" upper="1" effort="1" velocity="1" />
+            <mimic joint="joint_1" multiplier="2.0" offset="0.1" />
+        </joint>
+        <joint name="joint_3" type="prismatic">
+            <parent link="link_0" />
+            <child link="link_3" />
+            <axis xyz="1 0 0" />
+            <limit lower="-1" upper="1" effort="1" velocity="1" />
+            <mimic joint="joint_2" multiplier="-0.5" offset="0.2" />
+        </joint>
+    </robot>
+    """
+    with io.StringIO(urdf_str) as f:
+        urdf_model = urdf.URDF.load(f)
+
+    assert urdf_model.mimic_joint_names == ["joint_2", "joint_3"]
+    matrix, offset = urdf_model.mimic_map
+    assert np.allclose(matrix, [[1.0], [2.0], [-1.0]])
+    assert np.allclose(offset, [0.0, 0.1, 0.15])
+
+    cfgs = np.array([[0.0], [0.3]])
+    poses = urdf_model.forward_kinematics_batch(cfgs)
+    for cfg, cfg_poses in zip(cfgs, poses):
+        assert np.allclose(
+            cfg_poses[2], urdf.tra.rotation_matrix(2.0 * cfg[0] + 0.1, [0, 0, 1])
+        )
+        assert np.allclose(
+            cfg_poses[3], urdf.tra.translation_matrix([0.15 - cfg[0], 0, 0])
+        )
+
+    urdf_model.update_cfg(cfgs[1])
+    assert np.allclose(urdf_model.get_transform("link_3"), poses[1, 3])
+    assert np.allclose(urdf_model.scene.graph.get("link_3")[0], poses[1, 3])
+
+
+def test_center_cfg_mimic_joint():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, load_meshes=False)
+
+    center_cfg = urdf_model.center_cfg
+    assert len(center_cfg) == urdf_model.num_dofs
+    assert center_cfg[-1] == 0.02
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_forward_kinematics_batch_parallel(use_processes):
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, build_scene_graph=False, load_meshes=False)
+
+    rng = np.random.default_rng(2)
+    cfgs = rng.uniform(-1.0, 1.0, size=(103, urdf_model.num_dofs))
+
+    expected = urdf_model.forward_kinematics_batch(cfgs)
+    poses = urdf_model.forward_kinematics_batch(
+        cfgs, num_workers=2, chunk_size=10, use_processes=use_processes
+    )
+    assert np.array_equal(poses, expected)
+
+    with pytest.raises(ValueError):
+        urdf_model.forward_kinematics_batch(cfgs, num_workers=2, chunk_size=0)
+
+
+def test_float32_kinematics():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, build_scene_graph=False, load_meshes=False)
+    urdf_model_32 = urdf.URDF.load(
+        urdf_fname, build_scene_graph=False, load_meshes=False, dtype=np.float32
+    )
+    assert urdf_model_32.dtype == np.float32
+    assert urdf_model_32.kinematic_tree.origins.dtype == np.float32
+
+    rng = np.random.default_rng(3)
+    cfgs = rng.uniform(-1.0, 1.0, size=(10, urdf_model.num_dofs))
+
+    poses = urdf_model_32.forward_kinematics_batch(cfgs)
+    assert poses.dtype == np.float32
+    assert np.allclose(poses, urdf_model.forward_kinematics_batch(cfgs), atol=1e-5)
+
+    jacobians = urdf_model_32.jacobian_batch("panda_hand", cfgs)
+    assert jacobians.dtype == np.float32
+    assert np.allclose(
+        jacobians, urdf_model.jacobian_batch("panda_hand", cfgs), atol=1e-5
+    )
+
+    urdf_model_32.update_cfg(cfgs[0])
+    assert urdf_model_32.get_transform("panda_hand").dtype == np.float32
+
+
+def test_forward_kinematics_streaming(tmp_path):
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, build_scene_graph=False, load_meshes=False)
+
+    rng = np.random.default_rng(4)
+    cfgs = rng.uniform(-1.0, 1.0, size=(25, urdf_model.num_dofs))
+    expected = urdf_model.forward_kinematics_batch(cfgs)
+
+    cfgs_fname = str(tmp_path / "cfgs.npy")
+    np.save(cfgs_fname, cfgs)
+    cfgs_mmap = np.load(cfgs_fname, mmap_mode="r")
+
+    chunks = list(urdf_model.forward_kinematics_iter(cfgs_mmap, chunk_size=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert np.allclose(np.concatenate(chunks), expected)
+
+    # iterables of configurations and subsets of links
+    links = ["panda_hand", "panda_link3"]
+    link_indices = [urdf_model.kinematic_tree.link_index[l] for l in links]
+    chunks = list(
+        urdf_model.forward_kinematics_iter(iter(cfgs), chunk_size=7, links=links)
+    )
+    assert np.allclose(np.concatenate(chunks), expected[:, link_indices])
+
+    poses_fname = str(tmp_path / "poses.npy")
+    urdf_model.forward_kinematics_to_file(
+        cfgs_mmap, poses_fname, chunk_size=8, links=links
+    )
+    assert np.allclose(np.load(poses_fname), expected[:, link_indices])
+
+
+def test_pose_formats():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, build_scene_graph=False, load_meshes=False)
+
+    rng = np.random.default_rng(5)
+    cfgs = rng.uniform(-3.0, 3.0, size=(50, urdf_model.num_dofs))
+    matrices = urdf_model.forward_kinematics_batch(cfgs)
+
+    pos_quat = urdf_model.forward_kinematics_batch(cfgs, pose_format="pos_quat")
+    assert pos_quat.shape == matrices.shape[:2] + (7,)
+    assert np.allclose(pos_quat[..., :3], matrices[..., :3, 3])
+    for pose, matrix in zip(pos_quat.reshape(-1, 7), matrices.reshape(-1, 4, 4)):
+        assert np.allclose(tra.quaternion_matrix(pose[3:])[:3, :3], matrix[:3, :3])
+
+    dual_quat = urdf_model.forward_kinematics_batch(cfgs, pose_format="dual_quat")
+    assert np.allclose(dual_quat[..., :4], pos_quat[..., 3:])
+    # translation = 2 * dual * conj(real)
+    w_r, v_r = dual_quat[..., :1], -dual_quat[..., 1:4]
+    w_d, v_d = dual_quat[..., 4:5], dual_quat[..., 5:]
+    translation = 2.0 * (w_d * v_r + w_r * v_d + np.cross(v_d, v_r))
+    assert np.allclose(translation, matrices[..., :3, 3])
+
+    urdf_model.update_cfg(cfgs[0])
+    poses, _ = urdf_model.link_poses(pose_format="pos_quat")
+    assert np.allclose(poses, pos_quat[0])
+
+    with pytest.raises(ValueError):
+        urdf_model.forward_kinematics_batch(cfgs, pose_format="euler")
+
+
+def test_inverse_kinematics():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, build_scene_graph=False, load_meshes=False)
+
+    # reachable targets from random configurations within the limits
+    rng = np.random.default_rng(6)
+    lower = np.array([j.limit.lower for j in urdf_model.actuated_joints])
+    upper = np.array([j.limit.upper for j in urdf_model.actuated_joints])
+    cfgs = rng.uniform(lower, upper, size=(20, urdf_model.num_dofs))
+    link = urdf_model.kinematic_tree.link_index["panda_hand"]
+    targets = urdf_model.forward_kinematics_batch(cfgs)[:, link]
+
+    solutions, residuals, converged = urdf_model.inverse_kinematics(
+        "panda_hand", targets, num_restarts=8, max_iterations=200, seed=0
+    )
+    assert solutions.shape == cfgs.shape
+    assert residuals.shape == (20, 2)
+    assert converged.mean() > 0.9
+    assert np.all(solutions >= lower - 1e-9) and np.all(solutions <= upper + 1e-9)
+
+    poses = urdf_model.forward_kinematics_batch(solutions)[:, link]
+    assert np.allclose(
+        poses[converged][:, :3, 3], targets[converged][:, :3, 3], atol=1e-4
+    )
+    assert np.allclose(poses[converged], targets[converged], atol=1e-3)
+
+    # orientation errors of exactly 180 degrees
+    target = np.diag([1.0, -1.0, -1.0, 1.0]) @ targets[0]
+    with np.errstate(divide="raise", invalid="raise"):
+        urdf_model.inverse_kinematics(
+            "panda_hand", target, init_cfgs=cfgs[0], max_iterations=10
+        )
+
+
+def test_inverse_kinematics_restarts_continuous_joints():
+    urdf_str = """
+    <robot name="continuous_test">
+        <link name="base" />
+        <link name="arm" />
+        <joint name="arm_joint" type="continuous">
+            <parent link="base" />
+            <child link="arm" />
+            <origin xyz="1 0 0" />
+            <axis xyz="0 0 1" />
+        </joint>
+        <link name="tip" />
+        <joint name="tip_joint" type="fixed">
+            <parent link="arm" />
+            <child link="tip" />
+            <origin xyz="1 0 0" />
+        </joint>
+    </robot>
+    """
+    with io.StringIO(urdf_str) as f:
+        urdf_model = urdf.URDF.load(f, build_scene_graph=False, load_meshes=False)
+
+    # the gradient vanishes at the initial configuration, only restarts can succeed
+    target = tra.translation_matrix([0.0, 0.0, 0.0])
+    _, _, converged = urdf_model.inverse_kinematics(
+        "tip", target, init_cfgs=[0.0], orientation_weight=0.0, num_restarts=1
+    )
+    assert not converged
+    solution, _, converged = urdf_model.inverse_kinematics(
+        "tip", target, init_cfgs=[0.0], orientation_weight=0.0, num_restarts=4, seed=0
+    )
+    assert converged
+    assert np.isclose(np.abs(solution[0]), np.pi, atol=1e-3)
+
+
+def _create_inertial_urdf(**kwargs):
+    urdf_str = """
+    <robot name="inertial_test">
+        <link name="world" />
+        <link name="upper_arm">
+            <inertial>
+                <origin xyz="0.1 0 0.05" rpy="0.3 0 0.1" />
+                <mass value="1.5" />
+                <inertia ixx="0.02" ixy="0.001" ixz="0.002" iyy="0.03" iyz="0.003" izz="0.04" />
+            </inertial>
+        </link>
+        <link name="forearm">
+            <inertial>
+                <origin xyz="0.2 0.01 0" />
+                <mass value="1.0" />
+                <inertia ixx="0.01" ixy="0" ixz="0" iyy="0.02" iyz="0" izz="0.02" />
+            </inertial>
+        </link>
+        <link name="hand">
+            <inertial>
+                <origin xyz="0 0 0.03" rpy="0 0.5 0" />
+                <mass value="0.5" />
+                <inertia ixx="0.002" ixy="0" ixz="0" iyy="0.003" iyz="0" izz="0.001" />
+            </inertial>
+        </link>
+        <joint name="shoulder" type="revolute">
+            <parent link="world" />
+            <child link="upper_arm" />
+            <origin xyz="0 0 0.3" />
+            <axis xyz="0 0 1" />
+            <limit lower="-3" upper="3" effort="10" velocity="2" />
+        </joint>
+        <joint name="elbow" type="revolute">
+            <parent link="upper_arm" />
+            <child link="forearm" />
+            <origin xyz="0.4 0 0" rpy="0.1 0 0" />
+            <axis xyz="0 1 0" />
+            <limit lower="-2" upper="2" effort="5" velocity="2" />
+            <dynamics damping="0.1" friction="0.05" />
+        </joint>
+        <joint name="wrist" type="prismatic">
+            <parent link="forearm" />
+            <child link="hand" />
+            <origin xyz="0.3 0 0" />
+            <axis xyz="1 0 0" />
+            <limit lower="0" upper="0.1" effort="20" velocity="0.5" />
+        </joint>
+    </robot>
+    """
+    with io.StringIO(urdf_str) as f:
+        return urdf.URDF.load(f, **kwargs)
+
+
+def test_mass_properties():
+    urdf_model = _create_inertial_urdf(build_scene_graph=False, load_meshes=False)
+
+    rng = np.random.default_rng(7)
+    cfgs = rng.uniform(-1.0, 1.0, size=(5, urdf_model.num_dofs))
+    total_mass, com, inertia = urdf_model.mass_properties_batch(cfgs)
+    assert total_mass == pytest.approx(3.0)
+    assert com.shape == (5, 3) and inertia.shape == (5, 3, 3)
+
+    for cfg, c, i in zip(cfgs, com, inertia):
+        urdf_model.update_cfg(cfg)
+        expected_com = np.zeros(3)
+        expected_inertia = np.zeros((3, 3))
+        for link in urdf_model.robot.links:
+            if link.inertial is None:
+                continue
+            pose = urdf_model.get_transform(link.name) @ link.inertial.origin
+            expected_com += link.inertial.mass * pose[:3, 3] / total_mass
+        for link in urdf_model.robot.links:
+            if link.inertial is None:
+                continue
+            pose = urdf_model.get_transform(link.name) @ link.inertial.origin
+            d = pose[:3, 3] - expected_com
+            expected_inertia += pose[:3, :3] @ link.inertial.inertia @ pose[:3, :3].T
+            expected_inertia += link.inertial.mass * (
+                np.dot(d, d) * np.eye(3) - np.outer(d, d)
+            )
+        assert np.allclose(c, expected_com)
+        assert np.allclose(i, expected_inertia)
+
+    # compare against finite differences
+    jacobian = urdf_model.center_of_mass_jacobian_batch(cfgs)
+    eps = 1e-6
+    for k in range(urdf_model.num_dofs):
+        delta = np.zeros(urdf_model.num_dofs)
+        delta[k] = eps
+        com_plus = urdf_model.mass_properties_batch(cfgs + delta)[1]
+        com_minus = urdf_model.mass_properties_batch(cfgs - delta)[1]
+        assert np.allclose(
+            jacobian[:, :, k], (com_plus - com_minus) / (2 * eps), atol=1e-6
+        )
+
+
+def _mass_matrix_reference(urdf_model, cfg):
+    # M = sum of m * Jv^T Jv + Jw^T I Jw over all links
+    tree = urdf_model.kinematic_tree
+    link_poses = urdf._kinematic_tree_forward_kinematics(tree, cfg[np.newaxis])
+    mass_matrix = np.zeros((urdf_model.num_dofs, urdf_model.num_dofs))
+    for link in range(len(tree.link_names)):
+        pose = link_poses[0, link]
+        com = pose[:3, :3] @ tree.coms[link] + pose[:3, 3]
+        jacobian = urdf._kinematic_tree_jacobian(
+            tree, link_poses, link, points=com[np.newaxis]
+        )[0]
+        inertia = pose[:3, :3] @ tree.inertias[link] @ pose[:3, :3].T
+        mass_matrix += tree.masses[link] * jacobian[:3].T @ jacobian[:3]
+        mass_matrix += jacobian[3:].T @ inertia @ jacobian[3:]
+    return mass_matrix
+
+
+def test_inverse_dynamics():
+    urdf_model = _create_inertial_urdf(build_scene_graph=False, load_meshes=False)
+
+    rng = np.random.default_rng(8)
+    cfgs = rng.uniform(-1.0, 1.0, size=(4, urdf_model.num_dofs))
+    velocities = rng.uniform(-1.0, 1.0, size=cfgs.shape)
+    accelerations = rng.uniform(-1.0, 1.0, size=cfgs.shape)
+
+    # gravity torques are the gradient of the potential energy
+    total_mass, _, _ = urdf_model.mass_properties_batch(cfgs)
+    com_jacobian = urdf_model.center_of_mass_jacobian_batch(cfgs)
+    gravity_torques = urdf_model.gravity_compensation_batch(cfgs)
+    assert np.allclose(gravity_torques, total_mass * 9.81 * com_jacobian[:, 2])
+
+    # compare against the Euler-Lagrange equations
+    torques = urdf_model.inverse_dynamics_batch(cfgs, velocities, accelerations)
+    eps = 1e-6
+    for cfg, qd, qdd, g, tau in zip(
+        cfgs, velocities, accelerations, gravity_torques, torques
+    ):
+        mass_matrix = _mass_matrix_reference(urdf_model, cfg)
+        mass_matrix_dot = (
+            _mass_matrix_reference(urdf_model, cfg + eps * qd)
+            - _mass_matrix_reference(urdf_model, cfg - eps * qd)
+        ) / (2 * eps)
+        kinetic_energy_gradient = np.zeros(urdf_model.num_dofs)
+        for k in range(urdf_model.num_dofs):
+            delta = np.zeros(urdf_model.num_dofs)
+            delta[k] = eps
+            kinetic_energy_gradient[k] = (
+                0.5
+                * qd
+                @ (
+                    _mass_matrix_reference(urdf_model, cfg + delta)
+                    - _mass_matrix_reference(urdf_model, cfg - delta)
+                )
+                @ qd
+                / (2 * eps)
+            )
+        expected = (
+            mass_matrix @ qdd + mass_matrix_dot @ qd - kinetic_energy_gradient + g
+        )
+        expected[1] += 0.1 * qd[1] + 0.05 * np.sign(qd[1])
+        assert np.allclose(tau, expected, atol=1e-6)
+
+
+def test_mass_matrix_and_forward_dynamics():
+    urdf_model = _create_inertial_urdf(build_scene_graph=False, load_meshes=False)
+
+    rng = np.random.default_rng(9)
+    cfgs = rng.uniform(-1.0, 1.0, size=(4, urdf_model.num_dofs))
+    velocities = rng.uniform(-1.0, 1.0, size=cfgs.shape)
+    accelerations = rng.uniform(-1.0, 1.0, size=cfgs.shape)
+
+    mass_matrices = urdf_model.mass_matrix_batch(cfgs)
+    for cfg, mass_matrix in zip(cfgs, mass_matrices):
+        assert np.allclose(mass_matrix, _mass_matrix_reference(urdf_model, cfg))
+
+    torques = urdf_model.inverse_dynamics_batch(cfgs, velocities, accelerations)
+    assert np.allclose(
+        urdf_model.forward_dynamics_batch(cfgs, velocities, torques), accelerations
+    )
+
+    # a second branch at the upper arm, entries between branches are zero
+    robot = urdf_model.robot
+    robot.links.append(
+        urdf.Link(
+            name="thumb",
+            inertial=urdf.Inertial(
+                origin=tra.translation_matrix([0, 0.05, 0]),
+                mass=0.2,
+                inertia=np.diag([0.001, 0.002, 0.003]),
+            ),
+        )
+    )
+    robot.joints.append(
+        urdf.Joint(
+            name="thumb_joint",
+            type="revolute",
+            parent="upper_arm",
+            child="thumb",
+            origin=tra.translation_matrix([0.1, 0, 0]),
+            axis=np.array([1.0, 0, 0]),
+            limit=urdf.Limit(lower=-1.0, upper=1.0, effort=1.0, velocity=1.0),
+        )
+    )
+    urdf_model = urdf.URDF(robot=robot, build_scene_graph=False, load_meshes=False)
+    cfgs = rng.uniform(-1.0, 1.0, size=(4, urdf_model.num_dofs))
+    mass_matrices = urdf_model.mass_matrix_batch(cfgs)
+    for cfg, mass_matrix in zip(cfgs, mass_matrices):
+        assert np.allclose(mass_matrix, _mass_matrix_reference(urdf_model, cfg))
+    thumb = urdf_model.actuated_joint_names.index("thumb_joint")
+    wrist = urdf_model.actuated_joint_names.index("wrist")
+    assert np.all(mass_matrices[:, thumb, wrist] == 0.0)
+
+
+def test_limit_utilities():
+    urdf_model = _create_floating_planar_urdf(build_scene_graph=False)
+    assert np.allclose(urdf_model.lower_limits[8], -1.0)
+    assert np.allclose(urdf_model.upper_limits[8], 1.0)
+    assert np.all(np.isinf(urdf_model.lower_limits[:8]))
+    assert np.allclose(urdf_model.velocity_limits[8], 1.0)
+
+    samples = urdf_model.sample_cfgs(100, seed=0)
+    assert samples.shape == (100, urdf_model.num_dofs)
+    assert np.array_equal(samples, urdf_model.sample_cfgs(100, seed=0))
+    assert not np.any(urdf_model.limit_violations(samples))
+    assert np.all(samples[:, :3] == 0.0) and np.all(np.abs(samples[:, 3:6]) <= np.pi)
+
+    cfgs = np.zeros((2, urdf_model.num_dofs))
+    cfgs[0, 8] = 1.5
+    cfgs[1, 8] = -3.0
+    violations = urdf_model.limit_violations(cfgs)
+    assert violations[:, 8].all() and violations.sum() == 2
+    assert np.allclose(urdf_model.clip_cfgs(cfgs)[:, 8], [1.0, -1.0])
+
+    velocities = np.zeros_like(cfgs)
+    velocities[1, 8] = -2.0
+    violations = urdf_model.limit_violations(np.zeros_like(cfgs), velocities=velocities)
+    assert violations.tolist() == [[False] * 9, [False] * 8 + [True]]
+
+
+def test_clip_cfgs_wraps_continuous_joints():
+    urdf_fname = os.path.join(DIR_MODELS, "franka", "franka.urdf")
+    urdf_model = urdf.URDF.load(urdf_fname, build_scene_graph=False, load_meshes=False)
+    urdf_model.robot.joints[0].type = "continuous"
+    urdf_model._update_actuated_joints()
+
+    cfgs = np.tile(urdf_model.center_cfg, (3, 1))
+    cfgs[:, 0] = [4.0, -4.0, np.pi]
+    clipped = urdf_model.clip_cfgs(cfgs)
+    assert np.allclose(clipped[:, 0], [4.0 - 2 * np.pi, 2 * np.pi - 4.0, -np.pi])
+    assert not np.any(urdf_model.limit_violations(clipped))
+
+
+def _create_collision_urdf(**kwargs):
+    urdf_str = """
+    <robot name="collision_test">
+        <link name="base">
+            <collision>
+                <geometry>
+                    <box size="0.4 0.4 0.2" />
+                </geometry>
+            </collision>
+        </link>
+        <link name="arm">
+            <collision>
+                <origin xyz="0 0 0.2" />
+                <geometry>
+                    <cylinder radius="0.05" length="0.4" />
+                </geometry>
+            </collision>
+        </link>
+        <link name="forearm">
+            <collision>
+                <origin xyz="0 0 0.2" />
+                <geometry>
+                    <box size="0.06 0.06 0.4" />
+                </geometry>
+            </collision>
+            <collision>
+                <origin xyz="0 0 0.45" />
+                <geometry>
+                    <sphere radius="0.06" />
+                </geometry>
+            </collision>
+        </link>
+        <joint name="shoulder" type="revolute">
+            <parent link="base" />
+            <child link="arm" />
+            <origin xyz="0 0 0.2" />
+            <axis xyz="0 1 0" />
+            <limit lower="-2" upper="2" effort="10" velocity="2" />
+        </joint>
+        <joint name="elbow" type="revolute">
+            <parent link="arm" />
+            <child link="forearm" />
+            <origin xyz="0 0 0.4" />
+            <axis xyz="0 1 0" />
+            <limit lower="-3.1" upper="3.1" effort="10" velocity="2" />
+        </joint>
+    </robot>
+    """
+    with io.StringIO(urdf_str) as f:
+        return urdf.URDF.load(f, **kwargs)
+
+
+def test_self_collision_spheres(tmp_path):
+    urdf_model = _create_collision_urdf(build_scene_graph=False)
+
+    spheres = urdf_model.collision_spheres(num_spheres=6, cache_dir=str(tmp_path))
+    assert len(spheres.radii) <= 3 * 6
+    assert set(spheres.links) == {0, 1, 2}
+    # only base and forearm are neither adjacent nor rigidly attached
+    assert set(map(tuple, np.sort(spheres.links[spheres.pairs], axis=1))) == {(0, 2)}
+
+    cfgs = np.array([[0.0, 0.0], [0.0, 3.1], [1.0, 1.0]])
+    collisions, distances = urdf_model.self_collision_batch(
+        cfgs, num_spheres=6, cache_dir=str(tmp_path)
+    )
+    assert collisions.tolist() == [False, True, False]
+    assert distances.shape == (3, len(spheres.pairs))
+
+    # the approximation is cached on disk
+    assert len(os.listdir(tmp_path)) == 1
+    cached = _create_collision_urdf(build_scene_graph=False).collision_spheres(
+        num_spheres=6, cache_dir=str(tmp_path)
+    )
+    assert np.array_equal(cached.centers, spheres.centers)
+    assert np.array_equal(cached.pairs, spheres.pairs)
+
+
+def test_bounds_batch():
+    urdf_model = _create_collision_urdf(build_collision_scene_graph=True)
+
+    cfgs = np.array([[0.0, 0.0], [0.5, -1.0]])
+    bounds, link_bounds = urdf_model.bounds_batch(cfgs, collision_geometry=True)
+    assert bounds.shape == (2, 2, 3)
+    assert link_bounds.shape == (2, 3, 2, 3)
+
+    # oriented bounding boxes of boxes are tight
+    assert np.allclose(link_bounds[:, 0], [[-0.2, -0.2, -0.1], [0.2, 0.2, 0.1]])
+    assert np.allclose(bounds[0, 0], [-0.2, -0.2, -0.1])
+    for cfg, b in zip(cfgs, bounds):
+        urdf_model.update_cfg(cfg)
+        assert np.all(b[0] <= urdf_model.collision_scene.bounds[0] + 1e-9)
+        assert np.all(b[1] >= urdf_model.collision_scene.bounds[1] - 1e-9)
+
+    bounds, link_bounds = urdf_model.bounds_batch(
+        np.zeros((0, 2)), collision_geometry=True
+    )
+    assert bounds.shape == (0, 2, 3)
+    assert link_bounds.shape == (0, 3, 2, 3)
+
+
+def test_point_cloud_batch():
+    urdf_model = _create_collision_urdf(build_scene_graph=False)
+
+    cfgs = np.array([[0.0, 0.0], [0.5, -1.0], [-1.0, 2.0]])
+    points, normals, labels = urdf_model.point_cloud_batch(
+        cfgs,
+        num_points=500,
+        collision_geometry=True,
+        return_normals=True,
+        return_labels=True,
+    )
+    assert points.shape == (3, 500, 3) and normals.shape == (3, 500, 3)
+    assert labels.shape == (500,) and set(labels) == {0, 1, 2}
+    assert np.allclose(np.linalg.norm(normals, axis=-1), 1.0)
+
+    # points of the base box lie on its surface for all configurations
+    base = points[:, labels == 0]
+    assert np.allclose(np.max(np.abs(base) / [0.2, 0.2, 0.1], axis=-1), 1.0)
+
+    # samples are cached and transformed by the link poses
+    link_poses = urdf_model.forward_kinematics_batch(cfgs)
+    samples, _, _ = urdf_model.surface_samples(num_points=500, collision_geometry=True)
+    forearm = labels == 2
+    expected = (
+        np.einsum("nij,pj->npi", link_poses[:, 2, :3, :3], samples[forearm])
+        + link_poses[:, np.newaxis, 2, :3, 3]
+    )
+    assert np.allclose(points[:, forearm], expected)
+
+
+def _create_mesh_urdf_str(tmp_path):
+    mesh_fnames = []
+    for i in range(2):
+        mesh_fnames.append(str(tmp_path / f"link_{i}.stl"))
+        trimesh.creation.box(extents=[0.1 * (i + 1)] * 3).export(mesh_fnames[-1])
+    urdf_str = f"""
+    <robot name="mesh_test">
+        <link name="link_0">
+            <visual>
+                <geometry>
+                    <mesh filename="{mesh_fnames[0]}" />
+                </geometry>
+            </visual>
+            <collision>
+                <geometry>
+                    <mesh filename="{mesh_fnames[0]}" />
+                </geometry>
+            </collision>
+        </link>
+        <link name="link_1">
+            <visual>
+                <geometry>
+                    <mesh filename="{mesh_fnames[1]}" />
+                </geometry>
+            </visual>
+            <visual>
+                <origin xyz="0 0 0.5" />
+                <geometry>
+                    <mesh filename="{mesh_fnames[0]}" />
+                </geometry>
+            </visual>
+        </link>
+        <joint name="joint" type="prismatic">
+            <parent link="link_0" />
+            <child link="link_1" />
+            <axis xyz="0 0 1" />
+            <limit lower="0" upper="1" effort="1" velocity="1" />
+        </joint>
+    </robot>
+    """
+    return urdf_str, mesh_fnames
+
+
+def test_mesh_cache(tmp_path, monkeypatch):
+    urdf_str, mesh_fnames = _create_mesh_urdf_str(tmp_path)
+    monkeypatch.setattr(urdf, "MESH_CACHE", urdf.MeshCache())
+
+    def load_scene():
+        with io.StringIO(urdf_str) as f:
+            return urdf.URDF.load(f).scene
+
+    scene_0 = load_scene()
+    stat = os.stat(mesh_fnames[0])
+
+    # same size and modification time, but different content: served from the cache
+    trimesh.creation.box(extents=[0.3] * 3).export(mesh_fnames[0])
+    os.utime(mesh_fnames[0], ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    scene_1 = load_scene()
+    assert len(urdf.MESH_CACHE) == 2
+    assert np.allclose(scene_0.bounds, scene_1.bounds)
+
+    # geometry names survive a cache hit
+    assert list(scene_0.geometry) == ["link_0.stl", "link_1.stl", "link_0.stl_1"]
+    assert list(scene_1.geometry) == list(scene_0.geometry)
+
+    # cached geometry is copied
+    geometry_0 = scene_0.geometry["link_0.stl"]
+    geometry_1 = scene_1.geometry["link_0.stl"]
+    assert geometry_0 is not geometry_1
+    assert not np.shares_memory(geometry_0.vertices, geometry_1.vertices)
+
+    # modified files are reloaded
+    os.utime(mesh_fnames[0], ns=(0, 0))
+    assert np.allclose(load_scene().geometry["link_0.stl"].extents, 0.3)
+
+    # least recently used entries are evicted
+    urdf.MESH_CACHE.max_bytes = urdf.MESH_CACHE.num_bytes - 1
+    assert len(urdf.MESH_CACHE) == 2
+    urdf.MESH_CACHE.max_bytes = 0
+    assert len(urdf.MESH_CACHE) == 0 and urdf.MESH_CACHE.num_bytes == 0
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_parallel_mesh_loading(tmp_path, monkeypatch, use_processes):
+    urdf_str, _ = _create_mesh_urdf_str(tmp_path)
+    monkeypatch.setattr(urdf, "MESH_CACHE", urdf.MeshCache(max_bytes=0))
+
+    def load_urdf(**kwargs):
+        with io.StringIO(urdf_str) as f:
+            return urdf.URDF.load(
+                f,
+                build_collision_scene_graph=True,
+                load_collision_meshes=True,
+                **kwargs,
+            )
+
+    expected = load_urdf()
+    urdf_model = load_urdf(num_workers=4, use_processes=use_processes)
+
+    for scene, expected_scene in [
+        (urdf_model.scene, expected.scene),
+        (urdf_model.collision_scene, expected.collision_scene),
+    ]:
+        assert list(scene.geometry) == list(expected_scene.geometry)
+        assert scene.graph.nodes_geometry == expected_scene.graph.nodes_geometry
+        assert np.allclose(scene.bounds, expected_scene.bounds)
+
+    # a file referenced multiple times is loaded once but attached as separate copies
+    geometries = list(urdf_model.scene.geometry.values())
+    assert len(geometries) == 3
+    assert len({id(g) for g in geometries}) == 3
+
+
+def test_lazy_mesh_loading(tmp_path, monkeypatch):
+    urdf_str, mesh_fnames = _create_mesh_urdf_str(tmp_path)
+    monkeypatch.setattr(urdf, "MESH_CACHE", urdf.MeshCache(max_bytes=0))
+
+    with io.StringIO(urdf_str) as f:
+        urdf_model = urdf.URDF.load(f, lazy_load_meshes=True)
+
+    # transformation queries do not load meshes
+    urdf_model.update_cfg([0.3])
+    assert np.allclose(urdf_model.get_transform("link_1")[2, 3], 0.3)
+
+    # files are read on first access, names do not depend on the access order
+    trimesh.creation.box(extents=[0.3] * 3).export(mesh_fnames[1])
+    geometry = urdf_model.link_geometry("link_1")
+    assert sorted(geometry) == ["link_0.stl_1", "link_1.stl"]
+    assert np.allclose(geometry["link_1.stl"].extents, 0.3)
+
+    futures = urdf_model.preload(links=["link_0"])
+    concurrent.futures.wait(futures)
+    assert len(futures) == 1
+    assert isinstance(futures[0].result(), trimesh.Scene)
+
+    with io.StringIO(urdf_str) as f:
+        expected = urdf.URDF.load(f)
+    expected.update_cfg([0.3])
+
+    geometries = list(urdf_model.scene.geometry.values())
+    assert len({id(g) for g in geometries}) == 3
+    assert urdf_model.scene.geometry.keys() == expected.scene.geometry.keys()
+    assert np.allclose(urdf_model.scene.bounds, expected.scene.bounds)
+    assert urdf_model.preload() == []
+
+
+def test_lazy_mesh_loading_multi_geometry_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(urdf, "MESH_CACHE", urdf.MeshCache(max_bytes=0))
+    scene = trimesh.Scene()
+    scene.add_geometry(trimesh.creation.box(extents=[0.1] * 3))
+    scene.add_geometry(
+        trimesh.creation.icosphere(radius=0.1),
+        transform=tra.translation_matrix([0.0, 0.0, 0.3]),
+    )
+    mesh_fname = str(tmp_path / "multi.glb")
+    scene.export(mesh_fname)
+    urdf_str = f"""
+    <robot name="multi_geometry_test">
+        <link name="link_0">
+            <visual>
+                <geometry>
+                    <mesh filename="{mesh_fname}" />
+                </geometry>
+            </visual>
+            <visual name="named">
+                <geometry>
+                    <box size="1 1 1" />
+                </geometry>
+            </visual>
+        </link>
+        <link name="link_1">
+            <visual>
+                <geometry>
+                    <mesh filename="{mesh_fname}" />
+                </geometry>
+            </visual>
+            <visual>
+                <geometry>
+                    <sphere radius="0.1" />
+                </geometry>
+            </visual>
+        </link>
+        <joint name="joint" type="fixed">
+            <parent link="link_0" />
+            <child link="link_1" />
+            <origin xyz="1 0 0" />
+        </joint>
+    </robot>
+    """
+
+    with io.StringIO(urdf_str) as f:
+        expected = urdf.URDF.load(f)
+
+    # names do not depend on the access order, even if files hold several geometries
+    names = []
+    for links in [["link_0", "link_1"], ["link_1", "link_0"]]:
+        with io.StringIO(urdf_str) as f:
+            urdf_model = urdf.URDF.load(f, lazy_load_meshes=True)
+        names.append({link: sorted(urdf_model.link_geometry(link)) for link in links})
+        assert sorted(urdf_model.scene.graph.nodes_geometry) == sorted(
+            urdf_model.scene.geometry
+        )
+        assert len(urdf_model.scene.geometry) == len(expected.scene.geometry)
+        assert np.allclose(urdf_model.scene.bounds, expected.scene.bounds)
+    assert names[0] == names[1]
+    assert names[0]["link_0"][0] == "multi.glb" and "named" in names[0]["link_0"]
+
+
+def test_mesh_cache_dir(tmp_path):
+    urdf_str, mesh_fnames = _create_mesh_urdf_str(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+
+    def load_urdf(**kwargs):
+        with io.StringIO(urdf_str) as f:
+            return urdf.URDF.load(f, mesh_cache_dir=cache_dir, **kwargs)
+
+    expected = load_urdf()
+    assert len(os.listdir(cache_dir)) == 2
+
+    # decoded arrays are memory-mapped instead of parsing the files again
+    urdf_model = load_urdf(num_workers=2)
+    assert list(urdf_model.scene.geometry) == list(expected.scene.geometry)
+    assert np.allclose(urdf_model.scene.bounds, expected.scene.bounds)
+    assert any(
+        not g.vertices.flags.writeable for g in urdf_model.scene.geometry.values()
+    )
+
+    # entries are keyed by content, not by file name or modification time
+    os.utime(mesh_fnames[0], ns=(0, 0))
+    load_urdf()
+    assert len(os.listdir(cache_dir)) == 2
+    trimesh.creation.box(extents=[0.3] * 3).export(mesh_fnames[0])
+    urdf_model = load_urdf()
+    assert len(os.listdir(cache_dir)) == 3
+    assert np.allclose(urdf_model.link_geometry("link_0")["link_0.stl"].extents, 0.3)